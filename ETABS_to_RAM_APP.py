@@ -10,22 +10,37 @@ from tkinter import (
     filedialog,
     font,
     StringVar,
+    BooleanVar,
     Listbox,
     Canvas,
     Toplevel,
     Frame,
     Text,
     Scrollbar,
+    messagebox,
 )
 from tkinter import ttk
+from functools import partial
 import json
+import queue
+import threading
 from pathlib import Path
 from PIL import ImageTk, Image
 from datetime import datetime
 from utils.ETABS_utils import *
 from utils.RAM_utils import *
 from utils.misc_utils import *
-
+from utils.cache_utils import *
+from utils.worker_utils import *
+from utils.api_providers import ETABS_api, RAM_api
+from utils.metrics_utils import metrics_recorder
+from utils.combination_utils import combine_forces, sum_combination
+from utils.pipeline_utils import (
+    get_levels_positions,
+    levels_group,
+    extract_levels_max_axial,
+)
+from utils.validation_utils import get_path_from_config
 
 small_italic_font = "Arial 7 italic"
 arrow_image_path = resource_path(R"images\arrow_medium.png")
@@ -33,6 +48,7 @@ arrow_image_path = resource_path(R"images\arrow_medium.png")
 blue_button_color_code = "#1F51FF"
 white_color_code = "#FFFFFF"
 red_button_color_code = "#D04848"
+worker_poll_interval_ms = 100
 
 
 ETABS_analysis_types_dict = {
@@ -62,12 +78,38 @@ class ETABS_to_RAM_APP:
         self.ETABS_results = None
         self.ETABSObject = None
         self.SapModel = None
+        self.ETABS_load_case_lists = {}  # analysis type enum -> load cases
+        self.ETABS_frame_columns = []
+        self.ETABS_forces = None  # column name x load case max compression
+        self.calibration_residuals = None
+        self.story_index = {}  # level -> cols_df row positions
+        self.results_cache = ResultsCache()
+        # "FrameForce" or "DatabaseTables", see max_axial_backends
+        self.ETABS_force_backend = (
+            get_path_from_config("ETABS force backend", "config.json") or "FrameForce"
+        )
+        self.cache_key = None
+        # time every ETABS/RAM API call; runs are written to default_metrics_dir
+        ETABS_api.metrics = RAM_api.metrics = metrics_recorder
+        self.metrics_run = None
 
         self.RAM_model_path = None
         self.RAM_load_layers = []
+        self.RAM_layer_registry = None
         self.concept = None
         self.root = root
 
+        # ETABS and RAM API calls run on their own worker threads; they report
+        # back through events, which poll_worker_events handles on the GUI thread
+        self.events = queue.Queue()
+        self.ETABS_worker = BackgroundWorker(self.events, name="ETABS")
+        self.RAM_worker = BackgroundWorker(self.events, name="RAM")
+        self.running_jobs = 0
+        self.startup_results = {}  # "ETABS"/"RAM" -> None or start-up exception
+        self.shut_down_pending = 0
+        self.closing = False
+        self.closed = False
+
         self.root.title("ETABS to RAM Concept Column Load Transfer")
         self.root.geometry("800x600")
         self.root.protocol("WM_DELETE_WINDOW", self.on_close)
@@ -102,12 +144,30 @@ class ETABS_to_RAM_APP:
         scrollbar.grid(row=0, column=1, sticky="ns", pady=(10, 10))
         self.log["yscrollcommand"] = scrollbar.set
 
+        # progress of the running background job
+        progress_frame = ttk.Frame(logging_frame)
+        progress_frame.grid(row=1, column=0, columnspan=2, sticky="ew")
+        self.progress_bar = ttk.Progressbar(
+            progress_frame, orient="horizontal", mode="determinate", length=200
+        )
+        self.progress_bar.grid(row=0, column=0, padx=(0, 10))
+        self.progress_label = ttk.Label(progress_frame, text="Idle")
+        self.progress_label.grid(row=0, column=1, sticky="w")
+        self.cancel_button = Button(
+            progress_frame,
+            text="Cancel",
+            command=self.cancel_job,
+            state="disabled",
+        )
+        self.cancel_button.grid(row=0, column=2, padx=(10, 0))
+        progress_frame.grid_columnconfigure(1, weight=1)
+
         # add credits
         ttk.Label(
             logging_frame,
             text="Developed by Austin Paxton. Contact via LinkedIn: https://www.linkedin.com/in/austin-paxton-98b496165/",
             font=small_italic_font,
-        ).grid(row=1, column=0)
+        ).grid(row=2, column=0)
 
         # Configure the logging frame's column to expand, filling the space
         logging_frame.grid_columnconfigure(0, weight=1)
@@ -147,7 +207,7 @@ class ETABS_to_RAM_APP:
         ttk.Label(
             f1,
             font=small_italic_font,
-            text="Note: Data Extraction may take a while if model unlocked. Program may appear unresponsive while analysis runs.",
+            text="Note: Data Extraction may take a while if model unlocked. Progress is shown below the log.",
         ).grid(row=3, column=0, columnspan=3, sticky="ew", padx=(10, 0))
 
         #######################   f2 Widgets   #######################
@@ -162,17 +222,20 @@ class ETABS_to_RAM_APP:
 
         ttk.Label(
             self.ETABS_frame,
-            text="Select Level:",
+            text="Select Levels:",
             font=font.nametofont("TkDefaultFont"),
         ).grid(row=1, column=0, padx=(10, 0), sticky="w")
         self.levelvar = StringVar(self.ETABS_frame, value=self.ETABS_levels)
-        self.combo_box_levels = ttk.Combobox(
-            self.ETABS_frame, textvariable=self.levelvar
+        self.levels_box = Listbox(
+            self.ETABS_frame,
+            listvariable=self.levelvar,
+            selectmode="extended",
+            height=5,
+            exportselection=0,
         )
-        self.combo_box_levels.grid(
-            row=1, column=1, padx=(0, 10)
+        self.levels_box.grid(
+            row=1, column=1, padx=(0, 10), pady=(0, 5)
         )  # grid after to avoid chaining and assigning .grid() return of None
-        self.combo_box_levels["state"] = "readonly"  # make read only
 
         # add analysis combo box
         ttk.Label(
@@ -254,6 +317,18 @@ class ETABS_to_RAM_APP:
             text="Add Custom Loading Layer:",
             font=font.nametofont("TkDefaultFont"),
         ).grid(row=2, column=0, sticky="w")
+        self.new_layer_entry = ttk.Entry(self.RAM_frame)
+        self.new_layer_entry.grid(row=2, column=1, padx=(0, 10))
+        Button(self.RAM_frame, text="Add", command=self.add_RAM_loading_layer).grid(
+            row=3, column=1, padx=(0, 10), pady=5, sticky="e"
+        )
+
+        self.sync_loads_var = BooleanVar(self.RAM_frame, value=False)
+        ttk.Checkbutton(
+            self.RAM_frame,
+            text="Sync (replace all loads on layer)",
+            variable=self.sync_loads_var,
+        ).grid(row=3, column=0, sticky="w")
 
         ttk.Separator(self.RAM_frame, orient="horizontal").grid(
             row=4, column=0, columnspan=2, sticky="ew"
@@ -288,6 +363,8 @@ class ETABS_to_RAM_APP:
         ### styling ####
         # Colorize alternating lines of the listbox
 
+        self.root.after(worker_poll_interval_ms, self.poll_worker_events)
+
     def select_ETABS_model_path(self):
         ETABS_model_path = filedialog.askopenfilename(
             filetypes=[("EDB files", "*.EDB")]
@@ -316,57 +393,190 @@ class ETABS_to_RAM_APP:
         """
         selection = self.analysis_combo_box.get()
         self.writeToLog(f"User changed Analysis type to: {selection}")
-        self.ETABS_load_cases = find_load_cases_by_type(
-            self.SapModel, load_case_type=ETABS_analysis_types_dict[selection]
+        load_case_type = ETABS_analysis_types_dict[selection]
+        if load_case_type in self.ETABS_load_case_lists:
+            self.show_load_cases(load_case_type)
+        else:
+            self.run_job(
+                self.find_load_cases_job, load_case_type, on_done=self.show_load_cases
+            )
+
+    def find_load_cases_job(self, reporter, load_case_type):
+        reporter.start("Finding load cases")
+        self.ensure_ETABS_results(reporter)
+        self.ETABS_load_case_lists[load_case_type] = find_load_cases_by_type(
+            self.SapModel, load_case_type=load_case_type
         )
+        self.save_to_results_cache()
+        return load_case_type
+
+    def show_load_cases(self, load_case_type):
+        self.ETABS_load_cases = self.ETABS_load_case_lists[load_case_type]
         self.refresh_list_box(self.l_box, self.load_case_var, self.ETABS_load_cases)
         self.writeToLog(f"Updated Load Case options")
 
     def pull_model_data(self):
+        """
+        Starts ETABS and RAM Concept at the same time on their own workers. The
+        Load Transfer Hub opens once both are ready.
+        """
         self.pull_data_button["state"] = "disabled"
+        # quick checks of the API paths, prompting for any that are missing;
+        # the APIs themselves are loaded on the workers
+        if not ETABS_api.resolve_paths(master=self.root) or not RAM_api.resolve_paths(
+            master=self.root
+        ):
+            self.writeToLog("ETABS and RAM Concept API paths are required")
+            self.check_enable_data_button(self.pull_data_button)
+            return
+        self.startup_results = {}
+        self.start_metrics_run("Pull model data")
+        self.run_job(
+            self.pull_ETABS_data_job,
+            on_done=partial(self.on_model_data_pulled, "ETABS"),
+            on_error=partial(self.on_model_data_pulled, "ETABS"),
+        )
+        self.run_job(
+            self.pull_RAM_data_job,
+            on_done=partial(self.on_model_data_pulled, "RAM"),
+            on_error=partial(self.on_model_data_pulled, "RAM"),
+            worker=self.RAM_worker,
+        )
+
+    def pull_ETABS_data_job(self, reporter):
+        """
+        Runs on the ETABS worker thread, so only sets attributes; widgets are
+        updated by on_model_data_pulled
+        """
         ###### ETABS data extraction/object creation ######
+        steps = 3
+        reporter.start("Reading ETABS model")
+        with metrics_recorder.stage("ETABS results cache lookup"):
+            self.cache_key = fingerprint_model_file(self.ETABS_model_path)
+            cached = self.results_cache.load(self.cache_key)
+        if cached is not None:
+            self.writeToLog(
+                "ETABS model unchanged since last run; loaded data from results cache"
+            )
+            self.cols_df = build_frames_df(cached["frames_df"], lean=True)
+            self.ETABS_load_case_lists = cached["load_cases"]
+            self.ETABS_forces = cached["forces"]
+        else:
+            if self.SapModel is None:
+                self.start_ETABS()
+            reporter.update(1, steps, "Reading ETABS frame elements")
+            linear_static = ETABS_analysis_types_dict["Linear Static"]
+            with metrics_recorder.stage("ETABS frame extraction"):
+                self.ETABS_load_case_lists = {
+                    linear_static: find_load_cases_by_type(self.SapModel)
+                }
+                self.cols_df = find_columns(
+                    get_all_frame_elements(self.SapModel, lean=True)
+                )
+            self.writeToLog("Accessed ETABS frame elements successfully")
+            self.ETABS_forces = pd.DataFrame(index=self.cols_df["MyNames"].astype(str))
+        self.ETABS_frame_columns = list(self.cols_df.columns)
+        with metrics_recorder.stage("ETABS story index"):
+            self.story_index = build_story_index(self.cols_df)
+            self.ETABS_levels = find_levels(self.cols_df)
+
+        if cached is None:
+            reporter.update(2, steps, "Running ETABS analysis")
+            self.analyze_ETABS_model()
+            self.save_to_results_cache()
+        reporter.update(steps, steps, "ETABS data ready")
+
+    def pull_RAM_data_job(self, reporter):
+        ###### RAM data extraction/object creation ######
+        steps = 2
+        reporter.start("Starting RAM Concept")
+        if self.concept:  # retry after a failed start-up
+            self.concept.shut_down()
+            self.concept = None
+        self.writeToLog(f"Begin RAM Initialization and object creation")
+        with metrics_recorder.stage("RAM start-up"):
+            self.concept, self.model, self.cad_manager = start_concept_and_open_model(
+                self.RAM_model_path
+            )
+        reporter.update(1, steps, "Reading RAM loading layers")
+        self.writeToLog(f"Initialization Successfull")
+        set_units_to_US(self.model)
+        self.writeToLog("Set RAM units to [lb, in]")
+        with metrics_recorder.stage("RAM loading layers"):
+            self.RAM_layer_registry = LoadingLayerRegistry(self.cad_manager)
+            self.RAM_load_layers = self.RAM_layer_registry.names()
+        self.writeToLog(
+            f"Detected the following RAM loading layers: {self.RAM_load_layers}"
+        )
+        reporter.update(steps, steps, "RAM Concept data ready")
+
+    def on_model_data_pulled(self, source, result):
+        """
+        Called once per application when its start-up job finishes; result is
+        the exception if it failed
+        """
+        self.startup_results[source] = result
+        if isinstance(result, Exception):
+            self.writeToLog(f"{source} start-up failed, see error above")
+        if len(self.startup_results) < 2:
+            return
+        self.finish_metrics_run()
+        if any(isinstance(r, Exception) for r in self.startup_results.values()):
+            self.check_enable_data_button(self.pull_data_button)
+            return
+
+        self.ETABS_load_cases = self.ETABS_load_case_lists[
+            ETABS_analysis_types_dict["Linear Static"]
+        ]
+        # stylze list box entries
+        self.refresh_list_box(self.l_box, self.load_case_var, self.ETABS_load_cases)
+        # populate level list and RAM layer combo box
+        self.refresh_list_box(self.levels_box, self.levelvar, self.ETABS_levels)
+        self.combo_box_load_layer["values"] = self.RAM_load_layers
 
+        self.notebook.tab(1, state="normal")
+
+    @metrics_recorder.timed("ETABS start-up")
+    def start_ETABS(self):
         self.SapModel, self.ETABSObject = initalize_SapModel()
         self.writeToLog(f"Attempting to open ETABS model at: {self.ETABS_model_path}")
         open_ETABS_file(self.SapModel, self.ETABS_model_path)
         self.writeToLog(f"Successfully opened ETABS file")
-        self.ETABS_load_cases = find_load_cases_by_type(self.SapModel)
-        self.load_case_var.set(self.ETABS_load_cases)
-
-        # stylze list box entries
-        self.refresh_list_box(self.l_box, self.load_case_var, self.ETABS_load_cases)
-        self.cols_df = find_columns(get_all_frame_elements(self.SapModel))
-        self.writeToLog("Accessed ETABS frame elements successfully")
-        # populate combo box w levels
-        self.ETABS_levels = find_levels(self.cols_df)
-        self.combo_box_levels["values"] = self.ETABS_levels
 
+    @metrics_recorder.timed("ETABS analysis")
+    def analyze_ETABS_model(self):
         lb_in_F = 1
         set_units(self.SapModel, unit_enum=lb_in_F)
         self.writeToLog("Set ETABS units to [lb, in]")
         self.writeToLog("Begining ETABS Analysis. This may take a while.")
-        self.writeToLog("Program may appear unresponsive")
 
-        self.ETABS_results = run_ETABS_analysis(self.SapModel, self.cols_df)
+        self.ETABS_results = run_ETABS_analysis(
+            self.SapModel, self.cols_df, log=self.writeToLog
+        )
         self.writeToLog(f"ETABS analysis complete")
 
         self.ETABS_setup = get_ETABS_results_setup(self.ETABS_results)
 
-        ###### RAM data extraction/object creation ######
-        self.writeToLog(f"Begin RAM Initialization and object creation")
-        self.concept, self.model, self.cad_manager = start_concept_and_open_model(
-            self.RAM_model_path
-        )
-        self.writeToLog(f"Initialization Successfull")
-        set_units_to_US(self.model)
-        self.writeToLog("Set RAM units to [lb, in]")
-        self.RAM_load_layers = get_all_loading_layers(self.cad_manager)
-        self.writeToLog(
-            f"Detected the following RAM loading layers: {self.RAM_load_layers}"
+    def ensure_ETABS_results(self, reporter):
+        """
+        Starts ETABS on demand when data was loaded from the results cache but
+        something not yet cached is requested
+        """
+        if self.SapModel is None:
+            self.writeToLog("Requested data is not cached; starting ETABS")
+            reporter.update(0, 2, "Starting ETABS")
+            self.start_ETABS()
+            reporter.update(1, 2, "Running ETABS analysis")
+            self.analyze_ETABS_model()
+
+    @metrics_recorder.timed("ETABS results cache save")
+    def save_to_results_cache(self):
+        self.results_cache.save(
+            self.cache_key,
+            self.cols_df[self.ETABS_frame_columns],
+            self.ETABS_load_case_lists,
+            self.ETABS_forces,
         )
-        self.combo_box_load_layer["values"] = self.RAM_load_layers
-
-        self.notebook.tab(1, state="normal")
 
     def launch_calibrate_window(self):
         self.calibrate_win = Toplevel()
@@ -408,6 +618,14 @@ class ETABS_to_RAM_APP:
             fg=white_color_code,
         ).grid(row=5, column=0, columnspan=3, padx=10, pady=(0, 10), sticky="ew")
 
+        Button(
+            self.calibrate_win,
+            text="Auto Calibrate Selected Level",
+            command=self.auto_calibrate_ETABS_to_RAM,
+            bg=red_button_color_code,
+            fg=white_color_code,
+        ).grid(row=6, column=0, columnspan=3, padx=10, pady=(0, 10), sticky="ew")
+
     def calibrate_ETABS_to_RAM(self):
 
         ETABS_pt1 = [
@@ -425,17 +643,61 @@ class ETABS_to_RAM_APP:
         rotation_matrix, delta_translation = calibrate(
             ETABS_pt1, ETABS_pt2, RAM_pt1, RAM_pt2
         )
+        self.apply_calibration(rotation_matrix, delta_translation)
 
-        self.cols_df[["RAM_X", "RAM_Y"]] = self.cols_df.apply(
-            lambda row: pd.Series(
-                convert_point_to_new_coord_system(
-                    row["Point1X"],
-                    row["Point1Y"],
-                    rotation_matrix,
-                    delta_translation,
-                )
+    def auto_calibrate_ETABS_to_RAM(self):
+        """
+        Calibrates by matching the selected level's ETABS columns to the RAM
+        columns and point supports, no point pairs needed
+        """
+        selected_levels = self.get_selected_levels()
+        if not selected_levels:
+            self.writeToLog("Select an ETABS level before auto calibrating")
+            return
+        user_level_selection = selected_levels[0]
+        level_df = select_story(self.cols_df, self.story_index, user_level_selection)
+        if len(level_df) < 2:
+            self.writeToLog(
+                f"{user_level_selection} needs at least 2 ETABS columns to auto calibrate; "
+                "use point pairs instead"
+            )
+            return
+        self.run_job(
+            self.auto_calibrate_job,
+            level_df[["Point1X", "Point1Y"]].to_numpy(),
+            on_done=partial(
+                self.on_auto_calibrated, user_level_selection, level_df["MyNames"]
             ),
-            axis=1,
+            worker=self.RAM_worker,
+        )
+
+    def auto_calibrate_job(self, reporter, ETABS_pts):
+        """
+        Runs on the RAM worker thread, which owns the RAM API objects
+        """
+        RAM_pts = get_column_and_support_locations(self.cad_manager)
+        if len(np.unique(RAM_pts, axis=0)) < 2:
+            raise ValueError("RAM model needs at least 2 distinct columns or supports")
+        return auto_calibrate(ETABS_pts, RAM_pts)
+
+    def on_auto_calibrated(self, user_level_selection, column_names, result):
+        rotation_matrix, delta_translation, residuals = result
+        self.calibration_residuals = pd.Series(
+            residuals, index=column_names, name="residual_in"
+        )
+        self.writeToLog(
+            f"Auto calibration residuals for {len(residuals)} {user_level_selection} columns; "
+            f"median: {np.median(residuals):.2f}in, max: {residuals.max():.2f}in"
+        )
+        worst = self.calibration_residuals.nlargest(5)
+        self.writeToLog(f"Largest residuals [in]: {worst.round(2).to_dict()}")
+        self.apply_calibration(rotation_matrix, delta_translation)
+
+    def apply_calibration(self, rotation_matrix, delta_translation):
+        self.cols_df[["RAM_X", "RAM_Y"]] = transform_points(
+            self.cols_df[["Point1X", "Point1Y"]].to_numpy(),
+            rotation_matrix,
+            delta_translation,
         )
         self.writeToLog(f"Rotation calibration matrix: {rotation_matrix}")
         self.writeToLog(
@@ -446,63 +708,272 @@ class ETABS_to_RAM_APP:
 
     def transfer_loads(self):
         # get user inputs
-        user_level_selection = self.combo_box_levels.get()
+        user_level_selection = self.get_selected_levels()
         self.writeToLog(f"User Level Selection: {user_level_selection}")
         user_ETABS_lc_selection = self.get_selected_load_cases()
         self.writeToLog(f"User ETABS Load Case Selection: {user_ETABS_lc_selection}")
-        user_RAM_layer_selection = self.load_layers_var.get()
-        self.writeToLog(f"RAM load layer: {user_RAM_layer_selection}")
-
-        df_keys = []
-        # add axial loads to cols df and save keys in df_keys
-        for i, lc in enumerate(user_ETABS_lc_selection):
-            change_ETABS_output_case(self.ETABS_setup, lc)
-            P_max = find_max_axial(
-                self.ETABS_results,
-                self.cols_df[self.cols_df["StoryName"] == user_level_selection][
-                    "MyNames"
-                ].to_list(),
+        if not user_level_selection or not user_ETABS_lc_selection:
+            self.writeToLog("Select at least one level and one load case")
+            return
+        if len(user_level_selection) == 1:
+            user_RAM_layer_selection = self.load_layers_var.get()
+            self.writeToLog(f"RAM load layer: {user_RAM_layer_selection}")
+            self.start_transfer(
+                {user_level_selection[0]: user_RAM_layer_selection},
+                user_ETABS_lc_selection,
+            )
+        else:
+            self.launch_layer_mapping_window(
+                user_level_selection, user_ETABS_lc_selection
+            )
+
+    def launch_layer_mapping_window(self, levels, load_cases):
+        """
+        Lets the user pick a RAM loading layer for each selected level
+        """
+        self.layer_mapping_win = Toplevel()
+        self.layer_mapping_win.title("Map Levels to RAM Loading Layers")
+        ttk.Label(self.layer_mapping_win, text="ETABS Level").grid(row=0, column=0)
+        ttk.Label(self.layer_mapping_win, text="RAM Loading Layer").grid(
+            row=0, column=1
+        )
+        level_layer_boxes = {}
+        for i, level in enumerate(levels):
+            ttk.Label(self.layer_mapping_win, text=level).grid(
+                row=i + 1, column=0, padx=(10, 0), sticky="w"
+            )
+            combo_box = ttk.Combobox(self.layer_mapping_win, state="readonly")
+            combo_box["values"] = self.RAM_load_layers
+            combo_box.set(self.load_layers_var.get())
+            combo_box.grid(row=i + 1, column=1, padx=(0, 10), pady=2)
+            level_layer_boxes[level] = combo_box
+
+        def on_transfer():
+            level_layers = {
+                level: combo_box.get() for level, combo_box in level_layer_boxes.items()
+            }
+            if not all(level_layers.values()):
+                self.writeToLog("Select a RAM loading layer for every level")
+                return
+            self.writeToLog(f"RAM load layers: {level_layers}")
+            self.layer_mapping_win.destroy()
+            self.start_transfer(level_layers, load_cases)
+
+        Button(
+            self.layer_mapping_win,
+            text="Transfer Loads",
+            command=on_transfer,
+            bg=blue_button_color_code,
+            fg=white_color_code,
+        ).grid(
+            row=len(levels) + 1,
+            column=0,
+            columnspan=2,
+            padx=10,
+            pady=10,
+            sticky="ew",
+        )
+
+    def start_transfer(self, level_layers: dict, load_cases: list):
+        """
+        Transfers the loads of every level in level_layers ({level: RAM layer}).
+        Forces are extracted on the ETABS worker, then written on the RAM worker.
+        """
+        if self.sync_loads_var.get() and not messagebox.askokcancel(
+            "Sync loads",
+            "Sync removes every other load on the selected RAM layers, including "
+            "loads entered by hand. Loads at unchanged locations are kept.",
+        ):
+            return
+        self.transfer_loads_button["state"] = "disabled"
+        self.start_metrics_run("Transfer loads")
+        self.run_job(
+            self.extract_levels_loads_job,
+            list(level_layers),
+            load_cases,
+            on_done=partial(
+                self.on_levels_loads_extracted,
+                level_layers,
+                self.sync_loads_var.get(),
+            ),
+            on_error=self.on_transfer_finished,
+        )
+
+    def on_levels_loads_extracted(self, level_layers, sync_loads, result):
+        if result is None:
+            self.on_transfer_finished(result)
+            return
+        self.run_job(
+            self.write_RAM_loads_job,
+            level_layers,
+            result,
+            sync_loads,
+            on_done=self.on_transfer_finished,
+            on_error=self.on_transfer_finished,
+            worker=self.RAM_worker,
+        )
+
+    def on_transfer_finished(self, result):
+        self.transfer_loads_button["state"] = "normal"
+        self.finish_metrics_run()
+
+    def extract_levels_loads_job(self, reporter, levels, user_ETABS_lc_selection):
+        """
+        Returns {level: (level_df, key of the column to transfer)} or None if
+        ETABS has no results for the selection
+        """
+        reporter.start(f"Extracting loads for {len(levels)} level(s)")
+        # rows of ETABS_forces are aligned with cols_df, so the story index
+        # selects from both without scanning either table
+        positions = get_levels_positions(self.story_index, levels)
+        missing = [
+            lc
+            for lc in user_ETABS_lc_selection
+            if lc not in self.ETABS_forces.columns
+            or self.ETABS_forces[lc].iloc[positions].isna().any()
+        ]
+        if missing:
+            # only query ETABS for cases not already in the results cache; all
+            # levels and cases are extracted together in a single sweep
+            self.ensure_ETABS_results(reporter)
+            frames = self.cols_df["MyNames"].iloc[positions].to_list()
+            with metrics_recorder.stage("ETABS force sweep"), levels_group(
+                self.SapModel, levels, frames
+            ) as group_name:
+                if group_name is None:
+                    self.writeToLog(
+                        f"Could not create ETABS group for {levels}; querying forces frame by frame"
+                    )
+                extracted = extract_levels_max_axial(
+                    self.SapModel,
+                    self.cols_df,
+                    self.ETABS_forces,
+                    positions,
+                    missing,
+                    group_name=group_name,
+                    backend=self.ETABS_force_backend,
+                    reporter=reporter,
+                )
+            if extracted is False:
+                self.writeToLog(f"ETABS returned no results for load cases: {missing}")
+                return None
+            self.writeToLog(
+                f"ETABS LOAD CASES: {extracted} Queried ETABS for max axial force lb"
             )
+            self.save_to_results_cache()
+        else:
             self.writeToLog(
-                f"ETABS LOAD CASE: {lc} Queried ETABS for max axial force lb"
+                f"ETABS LOAD CASES: {user_ETABS_lc_selection} Loaded max axial force lb from results cache"
             )
-            # add key to df_keys and then map the loads to this key in df
-            df_keys.append(f"P_max_{lc}")
-            self.cols_df[df_keys[i]] = self.cols_df["MyNames"].map(P_max)
-
-        # handle case where user selects multiple keys
-        # add summed loads to df under combined key
-        if len(df_keys) > 1:
-            user_ETABS_lc_selection.insert(0, "P_max")
-            combined_key = "_".join(user_ETABS_lc_selection)
-            self.cols_df[combined_key] = self.cols_df[df_keys].sum(axis=1)
-            df_keys.append(
-                combined_key
-            )  # add to df_keys since last key is outputed to RAM
+
+        levels_loads = {}
+        # the GUI writes the unit sum of the selected cases to one layer per
+        # level; factored combinations per layer come from job files
+        combinations = sum_combination(user_ETABS_lc_selection)
+        (load_key,) = combinations
+        with metrics_recorder.stage("Level load tables"):
+            # the loads of all levels in one matrix multiply, split by level
+            # below as positions lists the levels' rows one level after another
+            loads = combine_forces(self.ETABS_forces.iloc[positions], combinations)[
+                load_key
+            ].to_numpy()
+            start = 0
+            for level in levels:
+                level_df = select_story(self.cols_df, self.story_index, level)
+                level_df[load_key] = loads[start : start + len(level_df)]
+                start += len(level_df)
+                levels_loads[level] = (level_df, load_key)
+        if len(user_ETABS_lc_selection) > 1:
             self.writeToLog(
-                f"Summed load for following keys: {df_keys[:-1]} and added to internal df as {combined_key}"
+                f"Summed load for following keys: {user_ETABS_lc_selection} as {load_key}"
             )
+        return levels_loads
+
+    def write_RAM_loads_job(self, reporter, level_layers, levels_loads, sync_loads):
+        # last chance to cancel before the RAM model is modified
+        reporter.start("Writing loads to RAM Concept")
+        for level, RAM_layer in level_layers.items():
+            level_df, load_key = levels_loads[level]
+            with metrics_recorder.stage("RAM load write"):
+                if sync_loads:
+                    sync_counts = sync_axial_loads_to_loading_layer(
+                        self.cad_manager,
+                        RAM_layer,
+                        level_df["RAM_X"].to_list(),
+                        level_df["RAM_Y"].to_list(),
+                        level_df[load_key].to_list(),
+                        registry=self.RAM_layer_registry,
+                    )
+                else:
+                    add_axial_loads_to_loading_layer(
+                        self.cad_manager,
+                        RAM_layer,
+                        level_df["RAM_X"].to_list(),
+                        level_df["RAM_Y"].to_list(),
+                        level_df[load_key].to_list(),
+                        registry=self.RAM_layer_registry,
+                    )
+            if sync_loads:
+                self.writeToLog(
+                    f"{level} ETABS LOAD CASE: {load_key} Synced RAM loading layer {RAM_layer}: {sync_counts}"
+                )
+            else:
+                self.writeToLog(
+                    f"{level} ETABS LOAD CASE: {load_key} Successfully added loads to RAM loading layer {RAM_layer}"
+                )
 
-        # filter columns_df for specific story and add to RAM layer
-        add_axial_loads_to_loading_layer(
-            self.cad_manager,
-            user_RAM_layer_selection,
-            self.cols_df[self.cols_df["StoryName"] == user_level_selection][
-                "RAM_X"
-            ].to_list(),
-            self.cols_df[self.cols_df["StoryName"] == user_level_selection][
-                "RAM_Y"
-            ].to_list(),
-            self.cols_df[self.cols_df["StoryName"] == user_level_selection][
-                df_keys[-1]
-            ].to_list(),
+        with metrics_recorder.stage("RAM save"):
+            self.model.save_file(self.RAM_model_path)
+        self.writeToLog("Successfully saved updated RAM Model")
+        reporter.update(1, 1, "Loads transferred")
+
+    def add_RAM_loading_layer(self):
+        new_layer_name = self.new_layer_entry.get().strip()
+        if not new_layer_name or self.RAM_layer_registry is None:
+            return
+        self.run_job(
+            self.add_RAM_loading_layer_job,
+            new_layer_name,
+            on_done=partial(self.on_RAM_loading_layer_added, new_layer_name),
+            worker=self.RAM_worker,
         )
-        self.writeToLog(
-            f"ETABS LOAD CASE: {df_keys[-1]} Successfully added loads to RAM loading layer"
+
+    def add_RAM_loading_layer_job(self, reporter, new_layer_name):
+        """
+        Runs on the RAM worker thread, so it queues behind a running transfer
+        instead of racing it for the cad_manager and layer registry
+        """
+        add_force_loading_layer(
+            self.cad_manager, new_layer_name, registry=self.RAM_layer_registry
         )
+        return self.RAM_layer_registry.names()
 
-        self.model.save_file(self.RAM_model_path)
-        self.writeToLog("Successfully saved updated RAM Model")
+    def on_RAM_loading_layer_added(self, new_layer_name, RAM_load_layers):
+        self.RAM_load_layers = RAM_load_layers
+        self.combo_box_load_layer["values"] = self.RAM_load_layers
+        self.combo_box_load_layer.set(new_layer_name)
+        self.writeToLog(f"Added RAM loading layer: {new_layer_name}")
+
+    def start_metrics_run(self, name):
+        if self.metrics_run is not None:
+            self.finish_metrics_run()
+        self.metrics_run = metrics_recorder.start_run(name)
+
+    def finish_metrics_run(self):
+        """
+        Writes the stage and API call summary of the current run to the log and
+        its metrics to JSON
+        """
+        if self.metrics_run is None:
+            return
+        run = metrics_recorder.finish_run(self.metrics_run)
+        self.metrics_run = None
+        for line in run.summary_lines():
+            self.writeToLog(line)
+        try:
+            self.writeToLog(f"Run metrics written to {run.write()}")
+        except OSError as e:
+            self.writeToLog(f"Could not write run metrics: {e}")
 
     def check_enable_data_button(self, button):
         if self.ETABS_model_path is not None and self.RAM_model_path is not None:
@@ -513,12 +984,76 @@ class ETABS_to_RAM_APP:
         for i in range(0, len(new_contents), 2):
             list_box.itemconfigure(i, background="#f0f0ff")
 
+    def get_selected_levels(self):
+        return [self.levels_box.get(i) for i in self.levels_box.curselection()]
+
     def get_selected_load_cases(self):
         selected_indices = self.l_box.curselection()
         selected_load_cases = [self.l_box.get(i) for i in selected_indices]
         return selected_load_cases
 
+    def run_job(self, func, *args, on_done=None, on_error=None, worker=None):
+        """
+        Runs func(reporter, *args) on worker (the ETABS worker by default)
+        """
+        worker = worker or self.ETABS_worker
+        self.running_jobs += 1
+        self.cancel_button["state"] = "normal"
+        worker.submit(func, *args, on_done=on_done, on_error=on_error)
+
+    def cancel_job(self):
+        self.writeToLog("Cancelling after the current batch")
+        self.ETABS_worker.cancel()
+        self.RAM_worker.cancel()
+
+    def poll_worker_events(self):
+        """
+        Handles events posted by the worker thread, then reschedules itself
+        """
+        while True:
+            try:
+                event = self.events.get_nowait()
+            except queue.Empty:
+                break
+            kind = event[0]
+            if kind == "log":
+                self.writeToLog(*event[1:])
+            elif kind == "progress":
+                self.show_progress(*event[1:])
+            else:
+                self.finish_job(*event)
+        if not self.closed:
+            self.root.after(worker_poll_interval_ms, self.poll_worker_events)
+
+    def finish_job(self, kind, callback, result, trace=None):
+        self.running_jobs -= 1
+        if self.running_jobs == 0:
+            self.cancel_button["state"] = "disabled"
+            self.progress_bar["value"] = 0
+            self.progress_label.config(text="Idle")
+        if kind == "error":
+            self.writeToLog(f"Error: {result}")
+            if trace:
+                # stdout is invisible in the windowed build
+                self.writeToLog(trace.rstrip())
+        elif kind == "cancelled":
+            self.writeToLog("Cancelled")
+        if callback is not None:
+            callback(result)
+
+    def show_progress(self, done, total, label, rate, eta):
+        self.progress_bar["maximum"] = max(total, 1)
+        self.progress_bar["value"] = done
+        text = f"{label}: {done}/{total}" if total else label
+        if eta is not None and done < total:
+            text += f" ({rate:.1f}/s, about {eta:.0f}s left)"
+        self.progress_label.config(text=text)
+
     def writeToLog(self, msg, verbose=True):
+        if threading.current_thread() is not threading.main_thread():
+            # widgets may only be touched from the GUI thread
+            self.events.put(("log", msg, verbose))
+            return
         msg = timestamp(msg)
         if verbose:
             print(msg)
@@ -530,11 +1065,48 @@ class ETABS_to_RAM_APP:
         self.log.see("end")  # Auto-scroll to the bottom
 
     def on_close(self):
+        """
+        Cancels the running jobs and shuts ETABS and RAM Concept down on the
+        worker threads that started them before closing the window
+        """
+        if self.closing:
+            return
+        self.closing = True
+        self.cancel_job()
+        self.shut_down_pending = 2
+        self.run_job(
+            self.shut_down_ETABS_job,
+            on_done=self.on_shut_down,
+            on_error=self.on_shut_down,
+        )
+        self.run_job(
+            self.shut_down_RAM_job,
+            on_done=self.on_shut_down,
+            on_error=self.on_shut_down,
+            worker=self.RAM_worker,
+        )
+
+    def shut_down_ETABS_job(self, reporter):
         if self.ETABSObject or self.SapModel:
             exit_ETABS(self.ETABSObject)
             clean_up_ETABS(self.ETABSObject, self.SapModel)
+            # ETABS saves the model on exit, so move the cache entry to its new key
+            if self.cache_key is not None:
+                self.results_cache.rename(
+                    self.cache_key, fingerprint_model_file(self.ETABS_model_path)
+                )
+
+    def shut_down_RAM_job(self, reporter):
         if self.concept:
             self.concept.shut_down()
+
+    def on_shut_down(self, result):
+        self.shut_down_pending -= 1
+        if self.shut_down_pending > 0:
+            return
+        self.ETABS_worker.stop()
+        self.RAM_worker.stop()
+        self.closed = True
         self.root.destroy()
 
 
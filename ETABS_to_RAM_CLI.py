@@ -0,0 +1,221 @@
+"""
+This is the command line entry point of the application. It runs the transfers
+listed in a job file without the GUI and writes a JSON summary of the results.
+
+Usage:
+    python ETABS_to_RAM_CLI.py job.toml [--summary summary.json] [--config config.json]
+    python ETABS_to_RAM_CLI.py --study a.EDB b.EDB --load-cases Dead Live
+        [--workers 2] [--out study.csv] [--config config.json]
+    python ETABS_to_RAM_CLI.py --serve [--port 8765] [--config config.json]
+    python ETABS_to_RAM_CLI.py job.toml --server http://127.0.0.1:8765 --token <token>
+    python ETABS_to_RAM_CLI.py job.toml --record traffic.npz
+    python ETABS_to_RAM_CLI.py [job.toml] --replay traffic.npz
+
+See utils/pipeline_utils.py for the job file format. --study extracts the
+column forces of several ETABS models side by side (see utils/pool_utils.py)
+and writes them to one CSV. --serve starts a local job server that keeps ETABS
+and RAM Concept open between jobs and --server sends the job to it instead of
+running it here (see utils/server_utils.py); --token is the token the server
+printed at start-up (default: the ETABS_RAM_BRIDGE_TOKEN environment variable).
+--record saves the job's ETABS
+and RAM Concept API traffic to a file and --replay runs the job again from it
+without ETABS or RAM Concept (see utils/replay_utils.py); without a job file
+the recorded job is used. The ETABS and RAM Concept API paths are read from
+config.json; run the GUI once to set them up.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+
+from utils.api_providers import ETABS_api, RAM_api
+from utils.metrics_utils import metrics_recorder
+from utils.pipeline_utils import load_job_file, run_job, write_summary
+from utils.replay_utils import (
+    APIRecording,
+    record_api_traffic,
+    replay_api_traffic,
+)
+from utils.pool_utils import default_pool_workers, pool_backends, run_model_study
+from utils.server_utils import (
+    BridgeServer,
+    default_server_port,
+    submit_job,
+    token_env_var,
+    wait_for_job,
+)
+
+
+def log(msg):
+    print(f"{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}   {msg}", flush=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Transfer ETABS column loads to RAM Concept from a job file"
+    )
+    parser.add_argument("job_file", nargs="?", help="job file (.json or .toml)")
+    parser.add_argument(
+        "--summary",
+        help="where to write the JSON summary (default: <job file>_summary.json)",
+    )
+    parser.add_argument(
+        "--config", default="config.json", help="config with the API paths"
+    )
+    parser.add_argument(
+        "--study", nargs="+", metavar="EDB", help="extract forces from these models"
+    )
+    parser.add_argument(
+        "--load-cases", nargs="+", default=[], help="load cases for --study"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=default_pool_workers,
+        help="ETABS processes run at once for --study",
+    )
+    parser.add_argument(
+        "--backend",
+        default="ETABS",
+        choices=list(pool_backends),
+        help="fake runs --study without ETABS",
+    )
+    parser.add_argument(
+        "--out", default="model_study.csv", help="where --study writes its table"
+    )
+    parser.add_argument("--serve", action="store_true", help="run the local job server")
+    parser.add_argument(
+        "--port", type=int, default=default_server_port, help="port for --serve"
+    )
+    parser.add_argument("--server", help="URL of a running job server")
+    parser.add_argument(
+        "--token",
+        default=os.environ.get(token_env_var),
+        help=f"token printed by the job server (default: ${token_env_var})",
+    )
+    parser.add_argument("--record", help="save the job's API traffic to this .npz")
+    parser.add_argument("--replay", help="run the job from a recorded .npz")
+    args = parser.parse_args(argv)
+    if args.study:
+        return run_study(args)
+    if args.replay:
+        return replay_job(args)
+    if args.job_file is None and not args.serve:
+        parser.error("a job file, --study, --serve or --replay is required")
+
+    job_path = Path(args.job_file) if args.job_file else None
+    if args.server and job_path is None:
+        parser.error("--server needs a job file")
+    summary_path = None
+    if job_path is not None:
+        summary_path = args.summary or job_path.with_name(
+            f"{job_path.stem}_summary.json"
+        )
+    if args.server:
+        # the server has its own config, so nothing is resolved here
+        job_id = submit_job(load_job_file(job_path), args.server, args.token)
+        log(f"Queued job {job_id} on {args.server}")
+        record = wait_for_job(job_id, args.server, args.token)
+        if record["status"] == "failed":
+            log(f"Job {job_id} failed: {record['error']}")
+            return 1
+        return finish_job(record["summary"], summary_path)
+
+    # no one is there to answer a prompt, so the paths must already be set up
+    ETABS_api.config_path = RAM_api.config_path = args.config
+    if not ETABS_api.resolve_paths(prompt=False) or not RAM_api.resolve_paths(
+        prompt=False
+    ):
+        log(f"ETABS and RAM Concept API paths are missing from {args.config}")
+        return 2
+
+    if args.serve:
+        bridge = BridgeServer(port=args.port, log=log)
+        try:
+            bridge.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            bridge.shutdown()
+        return 0
+
+    job = load_job_file(job_path)
+    if args.record:
+        with record_api_traffic(args.record, meta={"job": job}):
+            summary = run_job_with_metrics(job, job_path)
+        log(f"API traffic recorded to {args.record}")
+    else:
+        summary = run_job_with_metrics(job, job_path)
+    return finish_job(summary, summary_path)
+
+
+def run_job_with_metrics(job, job_path):
+    ETABS_api.metrics = RAM_api.metrics = metrics_recorder
+    run = metrics_recorder.start_run(f"Job {job_path.name}")
+    try:
+        return run_job(job, log=log)
+    finally:
+        metrics_recorder.finish_run(run)
+        for line in run.summary_lines():
+            log(line)
+        metrics_path = job_path.with_name(f"{job_path.stem}_metrics.json")
+        with open(metrics_path, "w", encoding="utf-8") as f:
+            json.dump(run.to_dict(), f, indent=4)
+        log(f"Run metrics written to {metrics_path}")
+
+
+def replay_job(args):
+    recording = APIRecording.load(args.replay)
+    replay_path = Path(args.replay)
+    if args.job_file:
+        job_path = Path(args.job_file)
+        job = load_job_file(job_path)
+    else:
+        job_path = replay_path
+        job = recording.meta["job"]
+    summary_path = args.summary or job_path.with_name(
+        f"{job_path.stem}_replay_summary.json"
+    )
+    with replay_api_traffic(recording) as replay:
+        summary = run_job_with_metrics(job, job_path)
+    if replay.mismatches:
+        log(f"{len(replay.mismatches)} calls were not recorded with these arguments")
+    return finish_job(summary, summary_path)
+
+
+def finish_job(summary, summary_path):
+    write_summary(summary, summary_path)
+    log(
+        f"{summary['ok']} transfers succeeded, {summary['failed']} failed; "
+        f"summary written to {summary_path}"
+    )
+    return 0 if summary["failed"] == 0 else 1
+
+
+def run_study(args):
+    if not args.load_cases:
+        log("--study needs at least one --load-cases entry")
+        return 2
+    table, failures = run_model_study(
+        args.study,
+        args.load_cases,
+        workers=args.workers,
+        backend=args.backend,
+        log=log,
+        config_path=args.config,
+    )
+    table.to_csv(args.out, index=False)
+    log(
+        f"{len(args.study) - len(failures)} models extracted, {len(failures)} failed; "
+        f"table written to {args.out}"
+    )
+    return 0 if not failures else 1
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()  # worker processes of the frozen .exe
+    sys.exit(main())
@@ -0,0 +1,64 @@
+"""
+This script times the pipeline stages on synthetic models without ETABS or RAM
+Concept (see utils/benchmark_utils.py) and writes the results to JSON.
+
+Usage:
+    python ETABS_to_RAM_benchmark.py [--frames 1000 10000] [--cases 1 10]
+        [--latency 0.0005] [--backend FrameForce] [--repeats 3] [--out results.json]
+        [--compare previous.json]
+"""
+
+import argparse
+import sys
+
+from utils.ETABS_utils import max_axial_backends
+from utils.benchmark_utils import (
+    default_benchmark_cases,
+    default_benchmark_frames,
+    run_benchmark_suite,
+    write_benchmark,
+    load_benchmark,
+    benchmark_table,
+    compare_benchmarks,
+)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Time the ETABS to RAM pipeline on synthetic models"
+    )
+    parser.add_argument(
+        "--frames", nargs="+", type=int, default=default_benchmark_frames
+    )
+    parser.add_argument("--cases", nargs="+", type=int, default=default_benchmark_cases)
+    parser.add_argument("--levels", type=int, default=10)
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="seconds per API call"
+    )
+    parser.add_argument("--backend", default="FrameForce", choices=max_axial_backends)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--out", help="results JSON (default: benchmark_<commit>.json)")
+    parser.add_argument("--compare", help="earlier results JSON to compare against")
+    args = parser.parse_args(argv)
+
+    results = run_benchmark_suite(
+        args.frames,
+        args.cases,
+        levels=args.levels,
+        latency=args.latency,
+        backend=args.backend,
+        repeats=args.repeats,
+    )
+    out = args.out or f"benchmark_{results['commit'] or 'local'}.json"
+    write_benchmark(results, out)
+    print(f"Results written to {out}")
+    if args.compare:
+        table = compare_benchmarks(load_benchmark(args.compare), results)
+    else:
+        table = benchmark_table(results)
+    print(table.to_string(index=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,6 @@
 import pytest
 import clr
+import numpy as np
 import pandas as pd
 from pathlib import Path
 import os
@@ -18,7 +19,7 @@ def SapModel_fixture():
 
 @pytest.fixture(scope="class")
 def frames_df_fixture():
-    path = Path(R"validation_data\frames_df_results.csv")
+    path = Path(__file__).parent.parent / "validation_data" / "frames_df_results.csv"
     return pd.read_csv(path)
 
 
@@ -90,3 +91,166 @@ def results_fixture(SapModel_fixture):
 
 def test_find_max_axial():
     pass
+
+
+def test_reduce_max_axial_by_case():
+    """
+    Flat results for several cases are split into a frame x case table
+    """
+    forces_df = pd.DataFrame(
+        {
+            "Obj": ["1", "1", "2", "2", "1", "2"],
+            "LoadCase": ["Dead", "Dead", "Dead", "Dead", "Live", "Live"],
+            "P": [-10.0, -12.5, -3.0, -7.0, -2.0, -1.5],
+        }
+    )
+    P_max_df = reduce_max_axial_by_case(forces_df)
+    assert P_max_df.loc["1", "Dead"] == 12.5
+    assert P_max_df.loc["2", "Dead"] == 7.0
+    assert P_max_df.loc["1", "Live"] == 2.0
+    assert P_max_df.loc["2", "Live"] == 1.5
+
+
+def test_reduce_force_envelope():
+    """
+    Signed max/min are kept per component over all stations and at the ends
+    """
+    forces_df = pd.DataFrame(
+        {
+            "Obj": ["1", "1", "1", "1", "1", "1"],
+            "LoadCase": ["Dead", "Dead", "Dead", "Wind", "Wind", "Wind"],
+            "ObjSta": [0.0, 72.0, 144.0, 0.0, 72.0, 144.0],
+            "P": [-10.0, -11.0, -12.0, 4.0, 3.0, -2.0],
+            "V2": [1.0, 1.0, 1.0, -5.0, -5.0, -5.0],
+            "V3": [0.0] * 6,
+            "T": [0.0] * 6,
+            "M2": [0.0] * 6,
+            "M3": [20.0, 0.0, -20.0, -50.0, 0.0, 50.0],
+        }
+    )
+    envelope = reduce_force_envelope(forces_df, float32=True)
+    assert envelope["LoadCase"].tolist() == ["Dead", "Wind"]
+    assert envelope["P_min"].tolist() == [-12.0, -2.0]
+    assert envelope["P_max"].tolist() == [-10.0, 4.0]  # uplift under wind
+    assert envelope["M3_bottom_max"].tolist() == [20.0, -50.0]
+    assert envelope["M3_top_min"].tolist() == [-20.0, 50.0]
+    assert envelope["P_max"].dtype == np.float32
+    assert envelope_max_axial(envelope, ["1"], ["Dead"]).loc["1", "Dead"] == 12.0
+
+
+def test_reduce_force_envelope_reversed_column():
+    """
+    A column drawn top-down has its I end, station 0, at the top
+    """
+    forces_df = pd.DataFrame(
+        {
+            "Obj": ["1", "1", "2", "2"],
+            "LoadCase": ["Dead"] * 4,
+            "ObjSta": [0.0, 144.0, 0.0, 144.0],
+            "P": [-10.0, -12.0, -10.0, -12.0],
+            "V2": [0.0] * 4,
+            "V3": [0.0] * 4,
+            "T": [0.0] * 4,
+            "M2": [0.0] * 4,
+            "M3": [20.0, -20.0, 20.0, -20.0],
+        }
+    )
+    cols_df = pd.DataFrame(
+        {"MyNames": [1, 2], "Point1Z": [0.0, 288.0], "Point2Z": [144.0, 144.0]}
+    )
+    assert reversed_columns(cols_df) == ["2"]
+    envelope = reduce_force_envelope(forces_df, reversed_frames=["2"])
+    assert envelope["P_bottom_min"].tolist() == [-10.0, -12.0]
+    assert envelope["P_top_min"].tolist() == [-12.0, -10.0]
+    assert envelope["M3_bottom_max"].tolist() == [20.0, -20.0]
+
+
+def test_reduce_pier_max_axial():
+    pier_forces_df = pd.DataFrame(
+        {
+            "StoryName": ["Level_1"] * 4 + ["Level_2"] * 2,
+            "PierName": ["P1"] * 6,
+            "LoadCase": ["Dead", "Dead", "Live", "Live", "Dead", "Dead"],
+            "Location": ["Top", "Bottom"] * 3,
+            "P": [-90.0, -100.0, -20.0, -25.0, -40.0, -50.0],
+        }
+    )
+    P_max_df = reduce_pier_max_axial(pier_forces_df)
+    assert P_max_df.loc[("Level_1", "P1"), "Dead"] == 100.0
+    assert P_max_df.loc[("Level_1", "P1"), "Live"] == 25.0
+    assert P_max_df.loc[("Level_2", "P1"), "Dead"] == 50.0
+    assert (
+        reduce_pier_max_axial(pier_forces_df, "Top").loc[("Level_2", "P1"), "Dead"]
+        == 40.0
+    )
+
+
+def test_build_frames_df_lean(frames_df_fixture):
+    """
+    Lean table keeps only columns with compact dtypes and the same coordinates
+    """
+    lean_df = build_frames_df(frames_df_fixture, lean=True)
+    full_cols_df = find_columns(frames_df_fixture)
+    assert list(lean_df.columns) == lean_frame_columns
+    assert len(lean_df) == len(full_cols_df)
+    assert lean_df["StoryName"].dtype == "category"
+    assert lean_df["PropName"].dtype == "category"
+    np.testing.assert_array_equal(lean_df["Point1X"], full_cols_df["Point1X"])
+    np.testing.assert_array_equal(
+        lean_df["MyNames"].astype(str), full_cols_df["MyNames"].astype(str)
+    )
+
+
+def test_build_frames_df_float32(frames_df_fixture):
+    lean_df = build_frames_df(frames_df_fixture, lean=True, float32=True)
+    assert lean_df["Point1X"].dtype == np.float32
+
+
+def test_compact_frame_names():
+    assert compact_frame_names(["47", "50", "1595"]).dtype == np.int32
+    # leading zeros or labels must survive, so fall back to categorical
+    assert isinstance(compact_frame_names(["007", "50"]), pd.Categorical)
+    assert isinstance(compact_frame_names(["C1", "C2"]), pd.Categorical)
+
+
+def test_frames_df_memory_report(frames_df_fixture):
+    report = frames_df_memory_report(frames_df_fixture)
+    assert report.loc["Total", "lean_bytes"] < report.loc["Total", "full_bytes"]
+
+
+def test_parse_database_table():
+    """
+    Flat row-major string data is reshaped and numeric fields are typed
+    """
+    fields = ["UniqueName", "OutputCase", "Station", "P"]
+    table_data = ["47", "Dead", "0", "-10.5", "47", "Dead", "126", "-9.5"]
+    table_df = parse_database_table(
+        fields, 2, table_data, numeric_fields=("Station", "P")
+    )
+    assert table_df["UniqueName"].tolist() == ["47", "47"]
+    assert table_df["P"].dtype == np.float64
+    assert table_df["P"].tolist() == [-10.5, -9.5]
+    assert table_df["Station"].tolist() == [0.0, 126.0]
+
+
+def test_build_story_index(frames_df_fixture):
+    """
+    Index positions select the same rows as a boolean scan, sorted by elevation
+    """
+    cols_df = find_columns(frames_df_fixture)
+    story_index = build_story_index(cols_df)
+    assert set(story_index) == set(cols_df["StoryName"])
+    for story, positions in story_index.items():
+        story_df = select_story(cols_df, story_index, story)
+        expected_df = cols_df[cols_df["StoryName"] == story]
+        assert sorted(story_df["MyNames"]) == sorted(expected_df["MyNames"])
+        assert story_df["Point1Z"].is_monotonic_increasing
+
+
+def test_find_levels_sorted_by_elevation(frames_df_fixture):
+    levels = find_levels(find_columns(frames_df_fixture))
+    base_elevations = [
+        frames_df_fixture[frames_df_fixture["StoryName"] == level]["Point1Z"].min()
+        for level in levels
+    ]
+    assert base_elevations == sorted(base_elevations)
@@ -0,0 +1,34 @@
+import pytest
+import threading
+
+from ..utils.api_providers import *
+
+
+class CountingProvider(APIProvider):
+    def __init__(self):
+        super().__init__()
+        self.imports = 0
+
+    def import_module(self):
+        self.imports += 1
+        return threading
+
+
+def test_provider_loads_on_first_use_only():
+    provider = CountingProvider()
+    assert provider.imports == 0
+    assert provider.Event is threading.Event
+    assert provider.Lock is threading.Lock
+    assert provider.imports == 1
+
+
+def test_provider_missing_name_raises():
+    with pytest.raises(AttributeError):
+        CountingProvider().not_an_api_name
+
+
+def test_modules_import_without_apis():
+    from ..utils import ETABS_utils, RAM_utils
+
+    assert ETABS_utils.ETABS_api.module is None
+    assert RAM_utils.RAM_api.module is None
@@ -0,0 +1,26 @@
+import pytest
+import json
+
+from ..utils.benchmark_utils import *
+
+
+def test_benchmark_suite_times_every_stage(tmp_path):
+    results = run_benchmark_suite(
+        [300, 600], [1, 2], levels=3, repeats=1, log=lambda msg: None
+    )
+    assert len(results["runs"]) == 4
+    for run in results["runs"]:
+        assert list(run["stages_s"]) == benchmark_stages
+        assert all(seconds >= 0 for seconds in run["stages_s"].values())
+
+    path = tmp_path / "results.json"
+    write_benchmark(results, path)
+    table = compare_benchmarks(load_benchmark(path), results)
+    assert len(table) == 4 * len(benchmark_stages)
+    assert (table["ratio"] == 1).all()
+
+
+def test_benchmark_database_tables_backend():
+    run = run_pipeline_benchmark(300, 2, levels=3, backend="DatabaseTables", repeats=1)
+    assert run["backend"] == "DatabaseTables"
+    assert run["total_s"] == pytest.approx(sum(run["stages_s"].values()))
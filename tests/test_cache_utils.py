@@ -0,0 +1,74 @@
+import pytest
+import os
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+from ..utils.cache_utils import *
+
+
+@pytest.fixture
+def frames_df_fixture():
+    path = Path(__file__).parent.parent / "validation_data" / "frames_df_results.csv"
+    df = pd.read_csv(path)
+    df["MyNames"] = df["MyNames"].astype(str)
+    return df
+
+
+@pytest.fixture
+def forces_fixture(frames_df_fixture):
+    forces = pd.DataFrame(index=frames_df_fixture["MyNames"])
+    forces["Dead"] = np.arange(len(forces), dtype=float)
+    forces.loc[forces.index[:10], "Live"] = 1.5
+    return forces
+
+
+def test_fingerprint_changes_with_content(tmp_path):
+    model_path = tmp_path / "model.EDB"
+    model_path.write_bytes(b"model state 1")
+    key1 = fingerprint_model_file(model_path)
+    assert fingerprint_model_file(model_path) == key1
+    model_path.write_bytes(b"model state 2")
+    assert fingerprint_model_file(model_path) != key1
+
+
+def test_cache_round_trip(tmp_path, frames_df_fixture, forces_fixture):
+    cache = ResultsCache(tmp_path)
+    load_cases = {1: ["Dead", "Live"], 3: ["Modal"]}
+    cache.save("key", frames_df_fixture, load_cases, forces_fixture)
+
+    cached = cache.load("key")
+    pd.testing.assert_frame_equal(cached["frames_df"], frames_df_fixture)
+    assert cached["load_cases"] == load_cases
+    np.testing.assert_array_equal(cached["forces"].index, forces_fixture.index)
+    np.testing.assert_array_equal(
+        cached["forces"].to_numpy(), forces_fixture.to_numpy()
+    )
+
+
+def test_cache_miss(tmp_path):
+    assert ResultsCache(tmp_path).load("missing") is None
+
+
+def test_cache_rename(tmp_path, frames_df_fixture, forces_fixture):
+    cache = ResultsCache(tmp_path)
+    cache.save("old", frames_df_fixture, {}, forces_fixture)
+    cache.rename("old", "new")
+    assert cache.load("old") is None
+    assert cache.load("new") is not None
+
+
+def test_cache_evicts_least_recently_used(tmp_path, frames_df_fixture, forces_fixture):
+    cache = ResultsCache(tmp_path)
+    for i, key in enumerate(["a", "b"]):
+        cache.save(key, frames_df_fixture, {}, forces_fixture)
+        os.utime(cache.entry_path(key), (i, i))
+    entry_bytes = cache.entry_path("a").stat().st_size
+
+    # reading "a" makes "b" the least recently used entry
+    cache.load("a")
+    cache.max_bytes = 2.5 * entry_bytes
+    cache.save("c", frames_df_fixture, {}, forces_fixture)
+    assert cache.entry_path("a").exists()
+    assert not cache.entry_path("b").exists()
+    assert cache.entry_path("c").exists()
@@ -0,0 +1,59 @@
+import pytest
+import numpy as np
+import pandas as pd
+
+from ..utils.combination_utils import *
+
+
+def test_parse_combination():
+    assert parse_combination("1.2 Dead + 1.6 Live") == {"Dead": 1.2, "Live": 1.6}
+    assert parse_combination("1.2*S Dead+Live-0.5 Wind") == {
+        "S Dead": 1.2,
+        "Live": 1.0,
+        "Wind": -0.5,
+    }
+    assert parse_combination("Dead + 0.5 Dead") == {"Dead": 1.5}
+    assert parse_combination("\"2nd Floor Live\" + 0.5*'EQ-X'") == {
+        "2nd Floor Live": 1.0,
+        "EQ-X": 0.5,
+    }
+    for text in [" + ", "2nd Floor Live", "1.2D", "1.0 'EQ-X"]:
+        with pytest.raises(ValueError):
+            parse_combination(text)
+
+
+def test_negative_factors_are_rejected():
+    """
+    The forces are unsigned compression magnitudes, so subtracting a case
+    would be wrong wherever that case causes tension
+    """
+    forces = pd.DataFrame({"Dead": [10.0], "Wind": [5.0]})
+    for combination in ["0.9 Dead - 1.0 Wind", {"Dead": 0.9, "Wind": -1.0}]:
+        with pytest.raises(ValueError, match="negative factors for \\['Wind'\\]"):
+            combine_forces(forces, {"0.9D-1.0W": combination})
+
+
+def test_combine_forces_in_one_multiply():
+    forces = pd.DataFrame(
+        {"Dead": [10.0, 20.0], "Live": [1.0, 2.0], "Wind": [5.0, -5.0]},
+        index=["1", "2"],
+    )
+    combinations = {
+        "1.2D+1.6L": "1.2 Dead + 1.6 Live",
+        "0.9D+1.0W": {"Dead": 0.9, "Wind": 1.0},
+    }
+    coefficients, load_cases = coefficient_matrix(combinations)
+    assert load_cases == ["Dead", "Live", "Wind"]
+    assert coefficients.shape == (3, 2)
+
+    combined = combine_forces(forces, combinations)
+    assert list(combined.columns) == ["1.2D+1.6L", "0.9D+1.0W"]
+    assert list(combined.index) == ["1", "2"]
+    assert np.allclose(combined["1.2D+1.6L"], [13.6, 27.2])
+    assert np.allclose(combined["0.9D+1.0W"], [14.0, 13.0])
+    assert np.allclose(
+        combine_forces(forces, sum_combination(["Dead", "Live"]))["Dead+Live"],
+        [11.0, 22.0],
+    )
+    with pytest.raises(KeyError):
+        combine_forces(forces, {"snow": "Snow"})
@@ -0,0 +1,101 @@
+import pytest
+import ctypes
+import numpy as np
+
+from ..utils import interop_utils
+from ..utils.interop_utils import *
+
+
+class FakeSystemType:
+    def __init__(self, full_name):
+        self.FullName = full_name
+
+    def GetElementType(self):
+        return self
+
+
+class FakeSystemArray:
+    """
+    Stand-in for a pythonnet System.Array so conversions can run without .NET
+    """
+
+    def __init__(self, values, element_type):
+        self.values = list(values)
+        self.element_type = element_type
+
+    def GetType(self):
+        return FakeSystemType(self.element_type)
+
+    @property
+    def Length(self):
+        return len(self.values)
+
+    def __iter__(self):
+        return iter(self.values)
+
+
+class FakeIntPtr:
+    __overloads__ = {"Int64": int}
+
+
+class FakeString:
+    @staticmethod
+    def Join(separator, values):
+        return separator.join(values)
+
+
+class FakeMarshal:
+    @staticmethod
+    def Copy(source, start_index, destination, length):
+        dtype = numeric_dtypes[source.element_type]
+        buffer = np.array(source.values[start_index:], dtype=dtype)
+        ctypes.memmove(destination, buffer.ctypes.data, length * buffer.itemsize)
+
+
+@pytest.fixture(params=["no_runtime", "fake_runtime"])
+def System_fixture(request, monkeypatch):
+    """
+    Runs each test through the fallback path and the bulk copy path
+    """
+    if request.param == "no_runtime":
+        System = None
+    else:
+        System = (FakeIntPtr, "Int64", FakeString, FakeMarshal)
+    monkeypatch.setattr(interop_utils, "load_System", lambda: System)
+
+
+def test_double_array(System_fixture):
+    values = [0.0, 1.5, -2.25, 3300.0]
+    array = system_array_to_numpy(FakeSystemArray(values, "System.Double"))
+    assert array.dtype == np.float64
+    np.testing.assert_array_equal(array, values)
+
+
+def test_int_array(System_fixture):
+    values = [10, 10, 1, 7]
+    array = system_array_to_numpy(FakeSystemArray(values, "System.Int32"))
+    assert array.dtype == np.int32
+    np.testing.assert_array_equal(array, values)
+
+
+def test_string_array(System_fixture):
+    values = ["47", "Level_2", "24Col8ksi", ""]
+    array = system_array_to_numpy(FakeSystemArray(values, "System.String"))
+    assert array.tolist() == values
+
+
+def test_empty_arrays(System_fixture):
+    assert len(system_array_to_numpy(FakeSystemArray([], "System.Double"))) == 0
+    assert len(system_array_to_numpy(FakeSystemArray([], "System.String"))) == 0
+    assert len(system_array_to_numpy(None)) == 0
+
+
+def test_dtype_override(System_fixture):
+    array = system_array_to_numpy(
+        FakeSystemArray([1.0, 2.0], "System.Double"), dtype=np.float32
+    )
+    assert array.dtype == np.float32
+
+
+def test_python_sequence_passthrough():
+    np.testing.assert_array_equal(system_array_to_numpy([1.0, 2.0]), [1.0, 2.0])
@@ -0,0 +1,104 @@
+import pytest
+import json
+
+from ..utils.metrics_utils import *
+from ..utils.api_providers import ETABS_api, RAM_api
+from ..utils.stand_in_apis import StandInETABSv1, StandInRamConcept, use_stand_in_apis
+from ..utils.ETABS_utils import *
+from ..utils.RAM_utils import *
+
+
+@pytest.fixture
+def recorder():
+    recorder = MetricsRecorder()
+    ETABS_api.metrics = RAM_api.metrics = recorder
+    yield recorder
+    ETABS_api.metrics = RAM_api.metrics = None
+
+
+def test_stages_only_recorded_during_runs():
+    recorder = MetricsRecorder()
+    with recorder.stage("before"):
+        pass
+    run = recorder.start_run("Transfer loads")
+
+    @recorder.timed("decorated")
+    def work(x):
+        return 2 * x
+
+    assert [work(1), work(2)] == [2, 4]
+    with recorder.stage("sweep"):
+        pass
+    recorder.finish_run(run)
+    with recorder.stage("after"):
+        pass
+    assert list(run.stages) == ["decorated", "sweep"]
+    assert run.stages["decorated"][0] == 2
+    assert run.elapsed_s is not None
+
+
+def test_api_calls_counted_through_providers(recorder, tmp_path):
+    run = recorder.start_run("Pull model data")
+    with use_stand_in_apis(StandInETABSv1(frames=100), StandInRamConcept()):
+        SapModel, ETABSObject = initalize_SapModel()
+        open_ETABS_file(SapModel, "tower.EDB")
+        frames_df = get_all_frame_elements(SapModel, lean=True)
+        concept, model, cad_manager = start_concept_and_open_model("podium.cpt")
+        registry = LoadingLayerRegistry(cad_manager)
+        add_axial_loads_to_loading_layer(
+            cad_manager, "Live Loading", [0.0], [0.0], [10.0], registry=registry
+        )
+        load = registry.get("Live Loading").point_loads[0]
+        load.Fz = 20.0
+        assert load.Fz == 20.0
+    recorder.finish_run(run)
+
+    assert run.api_calls["ETABS.FrameObj.GetAllFrames"][0] == 1
+    assert run.api_calls["ETABS.File.OpenFile"][0] == 1
+    assert "RAM.StandInLoadingLayer.add_point_loads" in run.api_calls
+    assert "RAM.StandInPointLoad.Fz=" in run.api_calls
+    assert set(run.api_totals()) == {"ETABS", "RAM"}
+    assert len(frames_df) == 40
+
+    path = run.write(tmp_path)
+    metrics = json.loads(path.read_text())
+    assert metrics["api_calls"]["ETABS.File.OpenFile"]["count"] == 1
+    assert any("ETABS API calls" in line for line in run.summary_lines())
+
+
+def test_providers_hand_out_raw_objects_when_off():
+    with use_stand_in_apis(StandInETABSv1(frames=10)):
+        SapModel, ETABSObject = initalize_SapModel()
+    assert not isinstance(SapModel, InstrumentedAPIObject)
+
+
+def test_instrumented_objects_pass_for_the_wrapped_object(recorder):
+    class Layer:
+        def __init__(self, name):
+            self.name = name
+
+        def add_point_loads(self, x, y, Fz=None):
+            return (x, y, Fz)
+
+    class Layers:
+        def __init__(self):
+            self.items = [Layer("Dead"), Layer("Live")]
+
+        def __len__(self):
+            return len(self.items)
+
+        def __iter__(self):
+            return iter(self.items)
+
+    layers = Layers()
+    proxy = InstrumentedAPIObject(layers, "RAM.Layers", recorder, deep=True)
+    assert len(proxy) == 2
+    assert isinstance(proxy, Layers)
+    assert proxy == layers and proxy == InstrumentedAPIObject(layers, "", recorder)
+    assert hash(proxy) == hash(layers)
+    assert bool(InstrumentedAPIObject(Layer("Dead"), "RAM.Layer", recorder))
+    dead = next(iter(proxy))
+    assert isinstance(dead, Layer) and type(dead) is InstrumentedAPIObject
+    # proxies passed back to the API, also by keyword, arrive unwrapped
+    x, y, Fz = map(unwrap, dead.add_point_loads(proxy, y=proxy, Fz=dead))
+    assert x is layers and y is layers and Fz is layers.items[0]
@@ -1,6 +1,9 @@
 import pytest
 import numpy as np
+import pandas as pd
 from math import sqrt
+from pathlib import Path
+from time import perf_counter
 
 from ..utils.misc_utils import *
 
@@ -84,3 +87,173 @@ def test_convert_point_to_new_coord_system():
         convert_point_to_new_coord_system(*src_pt1, rotation_matrix, delta_translation),
         out_pt1,
     )
+
+
+@pytest.fixture(scope="module")
+def frames_df_fixture():
+    path = Path(__file__).parent.parent / "validation_data" / "frames_df_results.csv"
+    return pd.read_csv(path)
+
+
+def test_transform_points_matches_per_point(frames_df_fixture):
+    """
+    Batch transform gives the same RAM coordinates as the per point function
+    on the validation frames
+    """
+    rotation_matrix, delta_translation = calibrate(
+        [0, 0], [0, 100], [50, 25], [-50, 25]
+    )
+    points = frames_df_fixture[["Point1X", "Point1Y"]].to_numpy()
+    expected = np.array(
+        [
+            convert_point_to_new_coord_system(x, y, rotation_matrix, delta_translation)
+            for x, y in points
+        ]
+    )
+    assert np.allclose(
+        transform_points(points, rotation_matrix, delta_translation), expected
+    )
+
+
+@pytest.mark.parametrize("num_points", [10_000, 1_000_000])
+def test_transform_points_benchmark(num_points):
+    """
+    Times the batch transform against the per point function (timed on a 1,000
+    point sample and scaled up to keep the test fast)
+    """
+    rng = np.random.default_rng(0)
+    points = rng.uniform(-5000, 5000, size=(num_points, 2))
+    rotation_matrix = np.array([[0, -1], [1, 0]])
+    delta_translation = np.array([120.0, -36.0])
+
+    start = perf_counter()
+    transformed = transform_points(points, rotation_matrix, delta_translation)
+    batch_time = perf_counter() - start
+
+    sample_size = 1000
+    start = perf_counter()
+    expected = [
+        convert_point_to_new_coord_system(x, y, rotation_matrix, delta_translation)
+        for x, y in points[:sample_size]
+    ]
+    per_point_time = (perf_counter() - start) * num_points / sample_size
+
+    assert np.allclose(transformed[:sample_size], expected)
+    assert batch_time < per_point_time
+
+
+def test_fit_rigid_transform():
+    rotation_matrix = rotation_matrix_from_angle(np.radians(30))
+    delta_translation = np.array([250.0, -75.0])
+    src_pts = np.random.default_rng(1).uniform(0, 1000, size=(20, 2))
+    out_pts = transform_points(src_pts, rotation_matrix, delta_translation)
+    fit_rotation, fit_translation = fit_rigid_transform(src_pts, out_pts)
+    assert np.allclose(fit_rotation, rotation_matrix)
+    assert np.allclose(fit_translation, delta_translation)
+
+
+def test_auto_calibrate_unmatched_points():
+    """
+    Recovers the transform from shuffled, noisy points where some ETABS columns
+    have no RAM counterpart and RAM has extra supports
+    """
+    rng = np.random.default_rng(2)
+    src_pts = rng.uniform(0, 3000, size=(500, 2))
+    rotation_matrix = rotation_matrix_from_angle(np.radians(100))
+    delta_translation = np.array([-1200.0, 4300.0])
+    out_pts = transform_points(src_pts[:450], rotation_matrix, delta_translation)
+    out_pts += rng.normal(0, 0.05, size=out_pts.shape)
+    out_pts = np.vstack([out_pts, rng.uniform(-4000, 4000, size=(30, 2))])
+    rng.shuffle(out_pts)
+
+    fit_rotation, fit_translation, residuals = auto_calibrate(src_pts, out_pts)
+    assert np.allclose(fit_rotation, rotation_matrix, atol=1e-4)
+    assert np.allclose(fit_translation, delta_translation, atol=0.5)
+    assert residuals.shape == (500,)
+    assert np.median(residuals) < 0.2
+
+
+def test_auto_calibrate_grid_quarter_turn(frames_df_fixture):
+    """
+    Validation frame locations rotated 90 degrees and shifted
+    """
+    src_pts = np.unique(frames_df_fixture[["Point1X", "Point1Y"]].to_numpy(), axis=0)
+    rotation_matrix = np.array([[0, -1], [1, 0]])
+    delta_translation = np.array([500.0, 20.0])
+    out_pts = transform_points(src_pts, rotation_matrix, delta_translation)
+    fit_rotation, fit_translation, residuals = auto_calibrate(src_pts, out_pts)
+    assert np.allclose(fit_rotation, rotation_matrix)
+    assert np.allclose(fit_translation, delta_translation)
+    assert np.allclose(residuals, 0)
+
+
+def test_auto_calibrate_coincident_and_too_few_points():
+    """
+    RAM columns standing on point supports share locations; a level with a
+    single column cannot be calibrated
+    """
+    src_pts = np.random.default_rng(4).uniform(0, 3000, size=(40, 2))
+    rotation_matrix = rotation_matrix_from_angle(np.radians(30))
+    out_pts = transform_points(src_pts, rotation_matrix, [100.0, -50.0])
+    fit_rotation, fit_translation, residuals = auto_calibrate(
+        src_pts, np.vstack([out_pts, out_pts])
+    )
+    assert np.allclose(fit_rotation, rotation_matrix)
+    assert np.allclose(residuals, 0, atol=1e-6)
+    with pytest.raises(ValueError, match="2 distinct source points"):
+        auto_calibrate(src_pts[:1], out_pts)
+    with pytest.raises(ValueError, match="2 distinct target points"):
+        auto_calibrate(src_pts, np.vstack([out_pts[:1], out_pts[:1]]))
+
+
+def test_auto_calibrate_benchmark():
+    """
+    Thousands of points stay fast because matching uses a KD-tree
+    """
+    rng = np.random.default_rng(3)
+    src_pts = rng.uniform(0, 50_000, size=(5000, 2))
+    out_pts = transform_points(
+        src_pts, rotation_matrix_from_angle(np.radians(5)), [100.0, 200.0]
+    )
+    start = perf_counter()
+    fit_rotation, fit_translation, residuals = auto_calibrate(src_pts, out_pts)
+    elapsed = perf_counter() - start
+    assert np.allclose(residuals, 0, atol=1e-6)
+    assert elapsed < 10
+
+
+def test_match_points_by_location():
+    old_pts = [[0, 0], [100, 0], [200, 0], [300, 0]]
+    new_pts = [[100.4, 0.2], [0, 0], [500, 0], [299.5, -0.5]]
+    matched_old, matched_new, unmatched_old, unmatched_new = match_points_by_location(
+        old_pts, new_pts, tolerance=1.0
+    )
+    assert dict(zip(matched_new.tolist(), matched_old.tolist())) == {0: 1, 1: 0, 3: 3}
+    assert unmatched_old.tolist() == [2]
+    assert unmatched_new.tolist() == [2]
+
+
+def test_match_points_by_location_nearest_and_unique():
+    """
+    Each old point is claimed at most once and the nearest candidate wins,
+    including across hash cell borders
+    """
+    old_pts = [[9.9, 0], [10.6, 0]]
+    new_pts = [[10.1, 0], [10.2, 0]]
+    matched_old, matched_new, unmatched_old, unmatched_new = match_points_by_location(
+        old_pts, new_pts, tolerance=1.0
+    )
+    assert dict(zip(matched_new.tolist(), matched_old.tolist())) == {0: 0, 1: 1}
+    assert len(unmatched_old) == len(unmatched_new) == 0
+
+
+def test_distribute_along_segments():
+    points, segment, shares = distribute_along_segments(
+        [[0, 0], [0, 0]], [[100, 0], [0, 10]], spacing=30
+    )
+    # 4 intervals of 25 in along the first wall, 1 along the short one
+    assert segment.tolist() == [0, 0, 0, 0, 0, 1, 1]
+    assert np.allclose(points[:5, 0], [0, 25, 50, 75, 100])
+    assert np.allclose(points[5:], [[0, 0], [0, 10]])
+    assert np.allclose(shares[:5], [0.125, 0.25, 0.25, 0.25, 0.125])
+    assert np.allclose(np.bincount(segment, shares), 1)
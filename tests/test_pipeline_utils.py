@@ -0,0 +1,206 @@
+import pytest
+import json
+import numpy as np
+import pandas as pd
+
+from ..utils import pipeline_utils
+from ..utils.pipeline_utils import *
+from ..utils.stand_in_apis import StandInETABSv1, StandInRamConcept, use_stand_in_apis
+
+
+def test_load_job_file_toml_and_json(tmp_path):
+    toml_job = tmp_path / "job.toml"
+    toml_job.write_text(
+        'ETABS_model = "tower.EDB"\n'
+        'RAM_model = "podium.cpt"\n'
+        "[[transfers]]\n"
+        'level = "Level_2"\n'
+        'RAM_layer = "Other Dead Loading"\n'
+        'load_cases = ["Dead", "S Dead"]\n'
+    )
+    json_job = tmp_path / "job.json"
+    json_job.write_text(json.dumps(load_job_file(toml_job)))
+
+    for job in (load_job_file(toml_job), load_job_file(json_job)):
+        assert job["ETABS_model"] == str(tmp_path / "tower.EDB")
+        assert job["RAM_model"] == str(tmp_path / "podium.cpt")
+        assert job["transfers"][0]["load_cases"] == ["Dead", "S Dead"]
+
+
+class FailingSessions:
+    def __init__(self):
+        self.closed = False
+        self.saved = False
+        self.opened = []
+
+    def open_ETABS_model(self, ETABS_model_path):
+        self.opened.append(ETABS_model_path)
+
+    def ETABS(self, load_cases=None):
+        raise RuntimeError("ETABS not available")
+
+    def max_axial(self, levels, load_cases, reporter=None):
+        self.ETABS()
+
+    def save_RAM_models(self):
+        self.saved = True
+
+    def close(self):
+        self.closed = True
+
+
+def test_run_job_records_failures_and_closes():
+    job = {
+        "ETABS_model": "tower.EDB",
+        "RAM_model": "podium.cpt",
+        "transfers": [
+            {"level": "Level_2", "RAM_layer": "A", "load_cases": ["Dead"]},
+            {"level": "Level_3", "RAM_layer": "B", "load_cases": ["Live"]},
+        ],
+    }
+    sessions = FailingSessions()
+    summary = run_job(job, log=lambda msg: None, sessions=sessions)
+    assert (summary["ok"], summary["failed"]) == (0, 2)
+    assert summary["transfers"][1]["RAM_layer"] == "B"
+    assert "ETABS not available" in summary["transfers"][0]["error"]
+    assert sessions.opened == ["tower.EDB"]
+    assert sessions.saved and sessions.closed
+    json.dumps(summary)
+
+
+def test_extract_levels_max_axial_one_sweep(monkeypatch):
+    cols_df = pd.DataFrame({"MyNames": ["1", "2", "3", "4"]})
+    story_index = {"Level_2": np.array([0, 2]), "Level_3": np.array([1, 3])}
+    forces = pd.DataFrame(index=cols_df["MyNames"])
+    forces["Dead"] = [np.nan, 5.0, np.nan, 6.0]
+    sweeps = []
+
+    def fake_extract_max_axial(SapModel, frames, load_cases, **kwargs):
+        sweeps.append((frames, load_cases))
+        return pd.DataFrame({lc: [float(name) for name in frames] for lc in load_cases})
+
+    monkeypatch.setattr(pipeline_utils, "extract_max_axial", fake_extract_max_axial)
+    positions = get_levels_positions(story_index, ["Level_2", "Level_3"])
+    extracted = extract_levels_max_axial(
+        None, cols_df, forces, positions, ["Dead", "Live"]
+    )
+    assert extracted == ["Dead", "Live"]
+    assert sweeps == [(["1", "3", "2", "4"], ["Dead", "Live"])]
+    assert forces["Live"].to_list() == [1.0, 2.0, 3.0, 4.0]
+
+    # everything is in memory now, so no second sweep
+    assert extract_levels_max_axial(None, cols_df, forces, positions, ["Live"]) == []
+    assert len(sweeps) == 1
+
+
+def test_run_job_writes_combinations_to_their_layers():
+    job = {
+        "ETABS_model": "tower.EDB",
+        "RAM_model": "podium.cpt",
+        "load_combinations": {"1.2D+1.6L": "1.2 Dead + 1.6 Live"},
+        "transfers": [
+            {"level": "Level_5", "RAM_layer": "Live Loading", "load_cases": ["Dead"]},
+            {
+                "level": "Level_5",
+                "combinations": {
+                    "1.2D+1.6L": "Other Dead Loading",
+                    "Dead + 0.5 Live": "Factored Loading",
+                },
+            },
+        ],
+    }
+    with use_stand_in_apis(StandInETABSv1(frames=200, levels=5), StandInRamConcept()):
+        summary = run_job(job, log=lambda msg: None)
+    assert summary["ok"] == 2
+    dead = summary["transfers"][0]["total_load_lb"]
+    combinations = summary["transfers"][1]["combinations"]
+    assert combinations["Dead + 0.5 Live"]["RAM_layer"] == "Factored Loading"
+    assert combinations["1.2D+1.6L"]["total_load_lb"] > 1.2 * dead
+    assert combinations["Dead + 0.5 Live"]["total_load_lb"] > dead
+
+
+def test_run_job_writes_force_envelope(tmp_path):
+    job = {
+        "ETABS_model": "tower.EDB",
+        "RAM_model": "podium.cpt",
+        "envelope": str(tmp_path / "envelope.csv"),
+        "transfers": [
+            {"level": "Level_5", "RAM_layer": "Live Loading", "load_cases": ["Dead"]},
+        ],
+    }
+    with use_stand_in_apis(StandInETABSv1(frames=200, levels=5), StandInRamConcept()):
+        summary = run_job(job, log=lambda msg: None)
+    assert summary["ok"] == 1
+    envelope = pd.read_csv(tmp_path / "envelope.csv")
+    assert set(envelope["LoadCase"]) == {"Dead"}
+    assert summary["max_column_tension_lb"] == 0.0
+    # the transfer's loads are the max compression of the envelope sweep
+    assert np.isclose(
+        summary["transfers"][0]["total_load_lb"], -envelope["P_min"].sum()
+    )
+
+
+def test_run_job_adds_pier_loads():
+    job = {
+        "ETABS_model": "tower.EDB",
+        "RAM_model": "podium.cpt",
+        "transfers": [
+            {"level": "Level_5", "RAM_layer": "Live Loading", "load_cases": ["Dead"]},
+            {
+                "level": "Level_5",
+                "RAM_layer": "Other Dead Loading",
+                "load_cases": ["Dead"],
+                "piers": True,
+                "pier_spacing": 12.0,
+            },
+        ],
+    }
+    ETABS = StandInETABSv1(frames=200, levels=5, piers=2)
+    RAM = StandInRamConcept()
+    with use_stand_in_apis(ETABS, RAM):
+        sessions = ModelSessions(job["ETABS_model"], log=lambda msg: None)
+        summary = run_job(job, log=lambda msg: None, sessions=sessions, close=False)
+        legs, P_max_df = sessions.piers("Level_5", ["Dead"])
+        sessions.close()
+    columns, walls = summary["transfers"]
+    assert summary["ok"] == 2
+    assert "piers" not in columns
+    assert walls["piers"] == 2
+    assert walls["pier_legs"] == 3  # P2 is an L
+    assert walls["pier_points"] > walls["piers"] * 10
+    # the wall point loads add up to the pier forces, each pier counted once
+    assert np.isclose(legs.groupby(level=[0, 1])["Share"].sum(), 1).all()
+    assert np.isclose(
+        walls["total_load_lb"] - columns["total_load_lb"],
+        P_max_df["Dead"].groupby(level=[0, 1]).first().sum(),
+    )
+    assert ETABS.spec["piers"] == 2
+
+
+def test_sessions_leave_no_groups_in_the_model():
+    with use_stand_in_apis(StandInETABSv1(frames=200, levels=5), StandInRamConcept()):
+        sessions = ModelSessions("tower.EDB", log=lambda msg: None)
+        sessions.max_axial(["Level_4", "Level_5"], ["Dead"])
+        sessions.force_envelope(["Level_5"], ["Live"])
+        assert sessions.SapModel.groups == {}
+        sessions.close()
+
+
+def test_sessions_save_only_used_RAM_models_and_reopen_changed_ones(tmp_path):
+    podium, garage = tmp_path / "podium.cpt", tmp_path / "garage.cpt"
+    podium.write_bytes(b"podium")
+    garage.write_bytes(b"garage")
+    with use_stand_in_apis(StandInETABSv1(), StandInRamConcept()):
+        sessions = ModelSessions("tower.EDB", log=lambda msg: None)
+        podium_model = sessions.RAM(str(podium))[0]
+        garage_model = sessions.RAM(str(garage))[0]
+        sessions.save_RAM_models()
+        # the next job only writes to the podium
+        assert sessions.RAM(str(podium))[0] is podium_model
+        sessions.save_RAM_models()
+        assert podium_model.saved_paths == [str(podium)] * 2
+        assert garage_model.saved_paths == [str(garage)]
+        # edited outside the bridge
+        garage.write_bytes(b"garage, edited in RAM Concept")
+        assert sessions.RAM(str(garage))[0] is not garage_model
+        sessions.close()
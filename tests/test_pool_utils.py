@@ -0,0 +1,51 @@
+import pytest
+
+from ..utils.pool_utils import *
+
+
+def test_run_model_study_collects_models_in_order():
+    models = [f"option_{i}.EDB" for i in range(4)]
+    messages = []
+    table, failures = run_model_study(
+        models,
+        ["Dead", "Live"],
+        workers=2,
+        backend="fake",
+        log=messages.append,
+        latency=0.05,
+        levels=2,
+        columns_per_level=3,
+    )
+    assert failures == {}
+    assert len(messages) == 4
+    assert table["model"].unique().tolist() == models
+    assert len(table) == 4 * 6
+    assert list(table.columns) == study_columns + ["Dead", "Live"]
+
+    # the synthetic models are seeded by path, so reruns agree
+    rerun, _ = run_model_study(
+        models[2:3], ["Dead", "Live"], backend="fake", levels=2, columns_per_level=3
+    )
+    expected = table[table["model"] == models[2]].reset_index(drop=True)
+    assert np.allclose(rerun[["Dead", "Live"]], expected[["Dead", "Live"]])
+
+
+def failing_task(model_path, load_cases, **kwargs):
+    if "bad" in model_path:
+        raise FileNotFoundError(f"ETABS could not open {model_path}")
+    return fake_extract_model_forces(model_path, load_cases)
+
+
+def test_run_model_study_records_failures(monkeypatch):
+    monkeypatch.setitem(pool_backends, "failing", failing_task)
+    table, failures = run_model_study(
+        ["a.EDB", "bad.EDB", "c.EDB"], ["Dead"], backend="failing", log=lambda msg: None
+    )
+    assert list(failures) == ["bad.EDB"]
+    assert "could not open" in failures["bad.EDB"]
+    assert table["model"].unique().tolist() == ["a.EDB", "c.EDB"]
+
+
+def test_run_model_study_unknown_backend():
+    with pytest.raises(ValueError):
+        run_model_study(["a.EDB"], ["Dead"], backend="SAP2000")
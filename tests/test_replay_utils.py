@@ -0,0 +1,67 @@
+import pytest
+import numpy as np
+
+from ..utils.replay_utils import *
+from ..utils.api_providers import ETABS_api, RAM_api
+from ..utils.stand_in_apis import StandInETABSv1, StandInRamConcept, use_stand_in_apis
+from ..utils.ETABS_utils import *
+from ..utils.RAM_utils import *
+
+
+def transfer_top_level(ETABS_model_path):
+    SapModel, ETABSObject = initalize_SapModel()
+    open_ETABS_file(SapModel, ETABS_model_path)
+    cols_df = find_columns(get_all_frame_elements(SapModel, lean=True))
+    top_level = find_levels(cols_df)[-1]
+    level_df = cols_df[cols_df["StoryName"] == top_level]
+    frames = level_df["MyNames"].to_list()
+    group_name = create_frame_group(SapModel, "top level", frames)
+    P_max_df = extract_max_axial(
+        SapModel, frames, find_load_cases_by_type(SapModel), group_name
+    )
+    concept, model, cad_manager = start_concept_and_open_model("podium.cpt")
+    registry = LoadingLayerRegistry(cad_manager)
+    add_axial_loads_to_loading_layer(
+        cad_manager,
+        "Live Loading",
+        level_df["Point1X"].to_list(),
+        level_df["Point1Y"].to_list(),
+        P_max_df.sum(axis=1).to_list(),
+        registry=registry,
+    )
+    registry.get("Live Loading").point_loads[0].Fz = 0.0
+    model.save_file("podium.cpt")
+    concept.shut_down()
+    exit_ETABS(ETABSObject)
+    return P_max_df
+
+
+@pytest.fixture
+def recording_path(tmp_path):
+    path = tmp_path / "traffic.npz"
+    with use_stand_in_apis(StandInETABSv1(frames=300, cases=3), StandInRamConcept()):
+        with record_api_traffic(path, meta={"job": {"ETABS_model": "tower.EDB"}}):
+            P_max_df = transfer_top_level("tower.EDB")
+    np.save(tmp_path / "forces.npy", P_max_df.to_numpy())
+    return path
+
+
+def test_replay_answers_without_the_apis(recording_path):
+    recorded = np.load(recording_path.with_name("forces.npy"))
+    assert ETABS_api.module is None and RAM_api.module is None
+    with replay_api_traffic(recording_path) as replay:
+        P_max_df = transfer_top_level("tower.EDB")
+    assert np.array_equal(P_max_df.to_numpy(), recorded)
+    assert replay.mismatches == []
+    assert ETABS_api.module is None and RAM_api.module is None
+
+
+def test_replay_falls_back_on_unrecorded_arguments(recording_path):
+    recording = APIRecording.load(recording_path)
+    assert recording.meta["job"] == {"ETABS_model": "tower.EDB"}
+    with replay_api_traffic(recording) as replay:
+        transfer_top_level("/elsewhere/tower.EDB")
+    assert len(replay.mismatches) == 1
+    with pytest.raises(ReplayMismatch):
+        with replay_api_traffic(recording, strict=True):
+            transfer_top_level("/elsewhere/tower.EDB")
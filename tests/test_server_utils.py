@@ -0,0 +1,114 @@
+import pytest
+import threading
+
+from ..utils.server_utils import *
+
+
+class WarmSessions:
+    """
+    Stands in for ModelSessions; ETABS "starts" once and the model fails to
+    open so every transfer fails quickly
+    """
+
+    def __init__(self):
+        self.opened = []
+        self.closed = 0
+        self.opened_ETABS_model = None
+        self.RAM_models = {}
+        self.force_backend = "FrameForce"
+
+    def open_ETABS_model(self, ETABS_model_path):
+        self.opened.append(ETABS_model_path)
+
+    def ETABS(self, load_cases=None):
+        self.opened_ETABS_model = (self.opened[-1], None, None)
+        raise RuntimeError("model has no columns")
+
+    def max_axial(self, levels, load_cases, reporter=None):
+        self.ETABS()
+
+    def save_RAM_models(self):
+        pass
+
+    def close(self):
+        self.closed += 1
+
+
+@pytest.fixture
+def bridge():
+    sessions = WarmSessions()
+    bridge = BridgeServer(port=0, log=lambda msg: None, sessions=sessions)
+    thread = threading.Thread(target=bridge.serve_forever, daemon=True)
+    thread.start()
+    yield bridge
+    bridge.shutdown()
+
+
+def auth(bridge):
+    return {token_header: bridge.token}
+
+
+def test_jobs_reuse_open_sessions(bridge):
+    job = {
+        "ETABS_model": "tower.EDB",
+        "RAM_model": "podium.cpt",
+        "transfers": [{"level": "Level_2", "RAM_layer": "A", "load_cases": ["Dead"]}],
+    }
+    job_ids = [submit_job(job, bridge.url, bridge.token) for _ in range(2)]
+    records = [
+        wait_for_job(job_id, bridge.url, bridge.token, poll_interval=0.05)
+        for job_id in job_ids
+    ]
+
+    assert [record["status"] for record in records] == ["done", "done"]
+    assert records[0]["summary"]["failed"] == 1
+    assert "no columns" in records[0]["summary"]["transfers"][0]["error"]
+    # both jobs ran on the same sessions, which stay open between jobs
+    assert bridge.sessions.opened == ["tower.EDB", "tower.EDB"]
+    assert bridge.sessions.closed == 0
+    status = requests.get(f"{bridge.url}/status", headers=auth(bridge)).json()
+    assert status["ETABS_model"] == "tower.EDB"
+
+
+def test_invalid_job_and_unknown_id(bridge):
+    response = requests.post(
+        f"{bridge.url}/jobs", json={"transfers": []}, headers=auth(bridge)
+    )
+    assert response.status_code == 400
+    assert (
+        requests.get(f"{bridge.url}/jobs/99", headers=auth(bridge)).status_code == 404
+    )
+
+
+def test_requests_need_token_json_and_no_origin(bridge):
+    job = {"ETABS_model": "tower.EDB", "transfers": []}
+    url = f"{bridge.url}/jobs"
+    assert requests.post(url, json=job).status_code == 401
+    assert (
+        requests.post(url, json=job, headers={token_header: "guess"}).status_code == 401
+    )
+    assert requests.get(f"{bridge.url}/status").status_code == 401
+    # what a web page can send without a CORS preflight
+    simple_post = requests.post(
+        url,
+        data=json.dumps(job),
+        headers={**auth(bridge), "Content-Type": "text/plain"},
+    )
+    assert simple_post.status_code == 415
+    browser_post = requests.post(
+        url, json=job, headers={**auth(bridge), "Origin": "http://example.com"}
+    )
+    assert browser_post.status_code == 403
+    assert requests.post(f"{bridge.url}/shutdown").status_code == 401
+    assert bridge.queued() == 0 and not bridge.jobs
+
+
+def test_shutdown_closes_sessions(bridge):
+    sessions = bridge.sessions
+    requests.post(f"{bridge.url}/shutdown", json={}, headers=auth(bridge))
+    bridge.shutdown()  # a second shutdown waits for nothing and closes nothing
+    for _ in range(100):
+        if sessions.closed:
+            break
+        time.sleep(0.05)
+    assert sessions.closed == 1
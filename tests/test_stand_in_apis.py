@@ -0,0 +1,150 @@
+import pytest
+import numpy as np
+
+from ..utils.stand_in_apis import *
+from ..utils.ETABS_utils import *
+from ..utils.RAM_utils import *
+
+
+@pytest.fixture
+def SapModel():
+    with use_stand_in_apis(StandInETABSv1(frames=500, cases=3, levels=5)):
+        SapModel, ETABSObject = initalize_SapModel()
+        open_ETABS_file(SapModel, "tower.EDB")
+        yield SapModel
+
+
+def test_stand_in_frames_and_cases(SapModel):
+    frames_df = get_all_frame_elements(SapModel)
+    cols_df = find_columns(frames_df)
+    assert len(frames_df) == 500
+    assert len(cols_df) == 200
+    assert find_levels(cols_df) == [f"Level_{i}" for i in range(1, 6)]
+    assert find_load_cases_by_type(SapModel) == ["Dead", "Live", "S Dead"]
+    assert check_analysis_complete(SapModel, cols_df)
+
+
+def test_unrelated_unfinished_case_does_not_force_analysis():
+    ETABS = StandInETABSv1(frames=100, unfinished_cases=["Live"])
+    logged = []
+    with use_stand_in_apis(ETABS):
+        SapModel, ETABSObject = initalize_SapModel()
+        open_ETABS_file(SapModel, "tower.EDB")
+        cols_df = find_columns(get_all_frame_elements(SapModel))
+        assert not check_analysis_complete(SapModel, cols_df, log=logged.append)
+        assert check_analysis_complete(
+            SapModel, cols_df, load_cases=["Dead"], log=logged.append
+        )
+    assert logged == ["ETABS cases without results: {'Live': 'could not start'}"]
+
+
+def test_stand_in_backends_agree(SapModel):
+    cols_df = find_columns(get_all_frame_elements(SapModel, lean=True))
+    frames = cols_df["MyNames"].to_list()[:40]
+    group_name = create_frame_group(SapModel, "columns", frames)
+    per_frame = extract_max_axial(SapModel, frames, ["Dead", "Live"])
+    group = extract_max_axial(SapModel, frames, ["Dead", "Live"], group_name)
+    table = extract_max_axial(
+        SapModel, frames, ["Dead", "Live"], group_name, "DatabaseTables"
+    )
+    assert np.allclose(per_frame.to_numpy(), group.to_numpy())
+    assert np.allclose(per_frame.to_numpy(), table.to_numpy())
+    # lower columns carry more floors
+    assert per_frame["Dead"].iloc[0] > 0
+
+
+def test_stand_in_models_are_seeded_by_path():
+    ETABS = StandInETABSv1(frames=100, analyzed=False)
+    with use_stand_in_apis(ETABS):
+        SapModel, ETABSObject = initalize_SapModel()
+        open_ETABS_file(SapModel, "a.EDB")
+        cols_df = find_columns(get_all_frame_elements(SapModel))
+        assert not check_analysis_complete(SapModel, cols_df)
+        run_ETABS_analysis(SapModel, cols_df)
+        frames = cols_df["MyNames"].to_list()
+        a = extract_max_axial(SapModel, frames, ["Dead"])
+        open_ETABS_file(SapModel, "b.EDB")
+        assert extract_max_axial(SapModel, frames, ["Dead"]) is False
+        run_ETABS_analysis(SapModel, cols_df)
+        b = extract_max_axial(SapModel, frames, ["Dead"])
+    assert not np.allclose(a.to_numpy(), b.to_numpy())
+    assert ETABS.calls > 0
+    assert ETABS_api.module is None
+
+
+def test_stand_in_ram_layers():
+    RAM = StandInRamConcept(structure_points=[[0, 0], [360, 0]])
+    with use_stand_in_apis(RAM=RAM):
+        concept, model, cad_manager = start_concept_and_open_model("podium.cpt")
+        registry = LoadingLayerRegistry(cad_manager)
+        assert registry.names() == ["Other Dead Loading", "Live Loading"]
+        add_force_loading_layer(cad_manager, "Transfer", registry=registry)
+        add_axial_loads_to_loading_layer(
+            cad_manager, "Transfer", [0, 360], [0, 0], [10, 20], registry=registry
+        )
+        calls = RAM.calls
+        counts = sync_axial_loads_to_loading_layer(
+            cad_manager, "Transfer", [0, 720], [0, 0], [15, 30], registry=registry
+        )
+        # the layer read costs a location and an Fz call per existing load
+        sync_calls = RAM.calls - calls
+        model.save_file("podium.cpt")
+    assert counts == {"added": 1, "updated": 1, "removed": 1, "unchanged": 0}
+    assert sync_calls == 1 + 2 * 2 + 3
+    assert len(get_column_and_support_locations(cad_manager)) == 2
+    assert model.saved_paths == ["podium.cpt"]
+
+
+def test_stand_in_force_envelope(SapModel):
+    cols_df = find_columns(get_all_frame_elements(SapModel, lean=True))
+    frames = cols_df["MyNames"].to_list()[:40]
+    group_name = create_frame_group(SapModel, "columns", frames)
+    envelope = extract_force_envelope(SapModel, frames, ["Dead", "Live"], group_name)
+    table = extract_force_envelope(
+        SapModel, frames, ["Dead", "Live"], group_name, "DatabaseTables"
+    )
+    assert len(envelope) == 80
+    assert envelope["Obj"].tolist()[:2] == [str(frames[0])] * 2
+    assert np.allclose(envelope.iloc[:, 2:].to_numpy(), table.iloc[:, 2:].to_numpy())
+    # the max compression comes out of the same sweep
+    P_max_df = extract_max_axial(SapModel, frames, ["Dead", "Live"], group_name)
+    assert np.array_equal(
+        envelope_max_axial(envelope, frames, ["Dead", "Live"]).to_numpy(),
+        P_max_df.to_numpy(),
+    )
+    assert (envelope["M3_top_max"] != envelope["M3_bottom_max"]).all()
+    assert extract_force_envelope(SapModel, frames + ["999999"], ["Dead"]) is False
+
+
+def test_stand_in_piers():
+    with use_stand_in_apis(StandInETABSv1(frames=100, levels=4, piers=3)):
+        SapModel, ETABSObject = initalize_SapModel()
+        open_ETABS_file(SapModel, "tower.EDB")
+        footprints = get_pier_footprints(SapModel)
+        P_max_df = extract_pier_max_axial(SapModel, ["Dead", "Live"])
+    assert len(P_max_df) == 12
+    # P2 is an L of two legs at right angles, one wall panel each
+    assert len(footprints) == 16
+    legs = footprints.loc[("Level_1", "P2")]
+    assert len(legs) == 2
+    assert np.allclose(
+        np.hypot(legs["X2"] - legs["X1"], legs["Y2"] - legs["Y1"]), legs["Length"]
+    )
+    assert (footprints["Length"] >= 120).all()
+    directions = legs[["X2", "Y2"]].to_numpy() - legs[["X1", "Y1"]].to_numpy()
+    assert np.isclose(directions[0] @ directions[1], 0)
+    # lower piers carry more floors
+    assert (
+        P_max_df.loc[("Level_1", "P1"), "Dead"]
+        > P_max_df.loc[("Level_4", "P1"), "Dead"]
+    )
+
+
+def test_temporary_frame_group_is_deleted(SapModel):
+    frames = find_columns(get_all_frame_elements(SapModel))["MyNames"].to_list()
+    with pytest.raises(ValueError):
+        with temporary_frame_group(SapModel, "columns", frames[:10]) as group_name:
+            assert group_name == "columns"
+            assert len(SapModel.groups["columns"]) == 10
+            raise ValueError("extraction failed")
+    assert SapModel.groups == {}
@@ -0,0 +1,83 @@
+import pytest
+import queue
+import threading
+from ..utils.worker_utils import *
+
+
+def next_result(events, timeout=5):
+    """
+    Skips log/progress events and returns the first job result event
+    """
+    while True:
+        event = events.get(timeout=timeout)
+        if event[0] not in ("log", "progress"):
+            return event
+
+
+def test_worker_posts_result_and_progress():
+    def job(reporter, n):
+        reporter.log("started")
+        for i in range(n):
+            reporter.update(i + 1, n, "counting")
+        return n * 2
+
+    worker = BackgroundWorker()
+    worker.submit(job, 3, on_done="done callback")
+    assert next_result(worker.events) == ("done", "done callback", 6)
+    worker.stop()
+
+
+def test_worker_reports_errors():
+    def job(reporter):
+        raise ValueError("bad frame")
+
+    worker = BackgroundWorker()
+    worker.submit(job, on_error="error callback")
+    kind, callback, error, trace = next_result(worker.events)
+    assert kind == "error"
+    assert callback == "error callback"
+    assert isinstance(error, ValueError)
+    assert "bad frame" in trace
+    worker.stop()
+
+
+def test_worker_cancel_between_batches():
+    started = threading.Event()
+    release = threading.Event()
+    batches = []
+
+    def job(reporter):
+        for i in range(100):
+            reporter.update(i, 100, "batch")
+            batches.append(i)
+            started.set()
+            release.wait()
+
+    worker = BackgroundWorker()
+    worker.submit(job)
+    worker.submit(job, on_error="queued job")
+    started.wait(timeout=5)
+    worker.cancel()
+    release.set()
+
+    events = [next_result(worker.events), next_result(worker.events)]
+    assert [event[0] for event in events] == ["cancelled", "cancelled"]
+    assert "queued job" in [event[1] for event in events]
+    assert batches == [0]
+
+    # the worker keeps running jobs after a cancel
+    worker.submit(lambda reporter: "ok")
+    assert next_result(worker.events) == ("done", None, "ok")
+    worker.stop()
+
+
+def test_progress_reporter_eta():
+    events = queue.Queue()
+    reporter = ProgressReporter(events, threading.Event())
+    reporter.start("sweep")
+    reporter.update(5, 10, "sweep")
+    events.get()
+    kind, done, total, label, rate, eta = events.get()
+    assert (kind, done, total, label) == ("progress", 5, 10, "sweep")
+    assert rate > 0
+    assert eta == pytest.approx(5 / rate)
@@ -1,50 +1,41 @@
 """
-This module contains wrapper functions for using the ETABS API.  
-The ETABS API is accessed via ETABS.dll which the user is prompted for before
-ETABSv1 is imported.
+This module contains wrapper functions for using the ETABS API.
+The ETABS API is accessed via ETABS.dll through the ETABS_api provider, which
+loads ETABSv1 the first time one of its classes is used.
 
 Note: When dealing with ETABS API, ret == 0 indicates a successfull API response.
 
 """
 
+from contextlib import contextmanager
 from pathlib import Path
 import math
 import json
+import numpy as np
 import pandas as pd
-import clr
-from System import String, Array
 
-from .validation_utils import (
-    validate_and_get_path,
-    validate_ETABS_dll_path,
-    validate_ETABS_exe_path,
-)
+from .api_providers import ETABS_api
+from .interop_utils import system_array_to_numpy
 
 pd.options.mode.copy_on_write = True  # ensures a copy is returned rather than a view
 
-ETABS_dll_path = validate_and_get_path(validate_ETABS_dll_path, "ETABS .dll")
-ETABS_exe_path = validate_and_get_path(validate_ETABS_exe_path, "ETABS .exe")
-
-clr.AddReference(ETABS_dll_path)
-from ETABSv1 import *
-
 
 # # TODO - figure out how to launch and make exe_path are optional
 def initalize_SapModel():
     # create API helper object
-    helper = cHelper(Helper())
+    helper = ETABS_api.cHelper(ETABS_api.Helper())
     # create instance of ETABs object from specified path
-    myETABSObject = cOAPI(helper.CreateObject(ETABS_exe_path))
+    myETABSObject = ETABS_api.cOAPI(helper.CreateObject(ETABS_api.exe_path))
 
     # start ETABS application
     myETABSObject.ApplicationStart()
 
     # create SapModel object
-    return cSapModel(myETABSObject.SapModel), myETABSObject
+    return ETABS_api.cSapModel(myETABSObject.SapModel), myETABSObject
 
 
 def open_ETABS_file(SapModel, model_path):
-    File = cFile(SapModel.File)
+    File = ETABS_api.cFile(SapModel.File)
     ret = File.OpenFile(model_path)
     if ret == 0:
         return True
@@ -53,12 +44,12 @@ def open_ETABS_file(SapModel, model_path):
 
 
 def find_load_cases_by_type(SapModel, load_case_type=1):
-    LoadCases = cLoadCases(SapModel.LoadCases)
+    LoadCases = ETABS_api.cLoadCases(SapModel.LoadCases)
     load_cases = []
     num_names = 0
     try:
         [ret, num_names, load_cases] = LoadCases.GetNameList(
-            num_names, load_cases, eLoadCaseType(load_case_type)
+            num_names, load_cases, ETABS_api.eLoadCaseType(load_case_type)
         )
         if ret == 0:
             return list(load_cases)
@@ -68,20 +59,101 @@ def find_load_cases_by_type(SapModel, load_case_type=1):
 
 # explore frame data
 def convert_system_array_to_list(sys_str):
-    p_str = [item for item in sys_str]
-    return p_str
+    return system_array_to_numpy(sys_str).tolist()
 
 
 def set_units(SapModel, unit_enum=1):
     try:
-        ret = SapModel.SetPresentUnits(eUnits(unit_enum))
+        ret = SapModel.SetPresentUnits(ETABS_api.eUnits(unit_enum))
         return ret
     except ValueError as e:
         print(f"{e}; see ETABS API documentations for valid unit enumerations")
 
 
-def get_all_frame_elements(SapModel):
-    FrameObj = cFrameObj(SapModel.FrameObj)
+# frame table fields used by the bridge; everything else is dropped in lean mode
+lean_frame_columns = [
+    "MyNames",
+    "PropName",
+    "StoryName",
+    "Point1X",
+    "Point1Y",
+    "Point1Z",
+    "Point2X",
+    "Point2Y",
+    "Point2Z",
+]
+
+
+def compact_frame_names(names):
+    """
+    Stores frame names as int32 when every name is a plain integer (the ETABS
+    default) and as a categorical otherwise
+    """
+    names = np.asarray(names).astype(str)
+    numeric_names = pd.to_numeric(names, errors="coerce")
+    if (
+        len(names)
+        and not np.isnan(numeric_names).any()
+        and np.array_equal(numeric_names.astype(np.int64).astype(str), names)
+        and np.abs(numeric_names).max() < np.iinfo(np.int32).max
+    ):
+        return numeric_names.astype(np.int32)
+    return pd.Categorical(names)
+
+
+def build_frames_df(columns, lean=False, float32=False):
+    """
+    Builds the frames table from a mapping of column name -> array.
+
+    In lean mode non-column frames are dropped before the table is built and
+    only lean_frame_columns are kept, with categorical story and property
+    names, compact frame names and (if float32) single precision coordinates.
+    """
+    if not lean:
+        return pd.DataFrame(columns)
+
+    is_column = (np.asarray(columns["Point1X"]) == np.asarray(columns["Point2X"])) & (
+        np.asarray(columns["Point1Y"]) == np.asarray(columns["Point2Y"])
+    )
+    data = {}
+    for column in lean_frame_columns:
+        values = np.asarray(columns[column])[is_column]
+        if column == "MyNames":
+            values = compact_frame_names(values)
+        elif column in ["PropName", "StoryName"]:
+            values = pd.Categorical(values.astype(str))
+        elif float32:
+            values = values.astype(np.float32)
+        data[column] = values
+    return pd.DataFrame(data)
+
+
+def frames_df_memory_report(frames_df, float32=True):
+    """
+    Compares the memory of the full frames table against the lean layout built
+    from it. Returns bytes per column with a Total row.
+    """
+    lean_df = build_frames_df(frames_df, lean=True, float32=float32)
+    report = pd.DataFrame(
+        {
+            "full_bytes": frames_df.memory_usage(deep=True, index=False),
+            "lean_bytes": lean_df.memory_usage(deep=True, index=False),
+        }
+    )
+    report.loc["Total"] = report.sum()
+    report["lean_bytes"] = report["lean_bytes"].fillna(0).astype(np.int64)
+    report["savings_pct"] = (
+        100 * (1 - report["lean_bytes"] / report["full_bytes"])
+    ).round(1)
+    return report
+
+
+def get_all_frame_elements(SapModel, lean=False, float32=False):
+    """
+    Returns a DataFrame of every frame in the model, or with lean=True only
+    the vertical frames and fields the bridge uses (see build_frames_df)
+    """
+    FrameObj = ETABS_api.cFrameObj(SapModel.FrameObj)
 
     NumberNames = 0
     MyNames = []
@@ -151,48 +223,119 @@ def get_all_frame_elements(SapModel):
     # create pandas data frame
     if ret == 0:
         data = {
-            "MyNames": convert_system_array_to_list(MyNames),
-            "PropName": convert_system_array_to_list(PropName),
-            "StoryName": convert_system_array_to_list(StoryName),
-            "PointName1": convert_system_array_to_list(PointName1),
-            "PointName2": convert_system_array_to_list(PointName2),
-            "Point1X": convert_system_array_to_list(Point1X),
-            "Point1Y": convert_system_array_to_list(Point1Y),
-            "Point1Z": convert_system_array_to_list(Point1Z),
-            "Point2X": convert_system_array_to_list(Point2X),
-            "Point2Y": convert_system_array_to_list(Point2Y),
-            "Point2Z": convert_system_array_to_list(Point2Z),
-            "Angle": convert_system_array_to_list(Angle),
-            "Offset1X": convert_system_array_to_list(Offset1X),
-            "Offset2X": convert_system_array_to_list(Offset2X),
-            "Offset1Y": convert_system_array_to_list(Offset1Y),
-            "Offset2Y": convert_system_array_to_list(Offset2Y),
-            "Offset1Z": convert_system_array_to_list(Offset1Z),
-            "Offset2Z": convert_system_array_to_list(Offset2Z),
-            "CardinalPoint": convert_system_array_to_list(CardinalPoint),
+            "MyNames": system_array_to_numpy(MyNames),
+            "PropName": system_array_to_numpy(PropName),
+            "StoryName": system_array_to_numpy(StoryName),
+            "PointName1": system_array_to_numpy(PointName1),
+            "PointName2": system_array_to_numpy(PointName2),
+            "Point1X": system_array_to_numpy(Point1X),
+            "Point1Y": system_array_to_numpy(Point1Y),
+            "Point1Z": system_array_to_numpy(Point1Z),
+            "Point2X": system_array_to_numpy(Point2X),
+            "Point2Y": system_array_to_numpy(Point2Y),
+            "Point2Z": system_array_to_numpy(Point2Z),
+            "Angle": system_array_to_numpy(Angle),
+            "Offset1X": system_array_to_numpy(Offset1X),
+            "Offset2X": system_array_to_numpy(Offset2X),
+            "Offset1Y": system_array_to_numpy(Offset1Y),
+            "Offset2Y": system_array_to_numpy(Offset2Y),
+            "Offset1Z": system_array_to_numpy(Offset1Z),
+            "Offset2Z": system_array_to_numpy(Offset2Z),
+            "CardinalPoint": system_array_to_numpy(CardinalPoint),
         }
 
-        return pd.DataFrame(data)
+        return build_frames_df(data, lean=lean, float32=float32)
+
+
+def get_case_run_status(SapModel):
+    """
+    Ask ETABS for the run status of every load case flagged to run.
+    Returns {case: status} (1 not run, 2 could not start, 3 not finished,
+    4 finished), or None if the status API is unavailable.
+    """
+    Analyze = ETABS_api.cAnalyze(SapModel.Analyze)
+    NumberItems = 0
+    CaseName = []
+    Status = []
+    Run = []
+    try:
+        [ret, NumberItems, CaseName, Status] = Analyze.GetCaseStatus(
+            NumberItems, CaseName, Status
+        )
+        if ret != 0:
+            return None
+        case_status = dict(zip(list(CaseName), list(Status)))
+
+        # cases not flagged to run never finish, so ignore them
+        [ret, NumberItems, CaseName, Run] = Analyze.GetRunCaseFlag(
+            NumberItems, CaseName, Run
+        )
+        if ret == 0:
+            case_status = {
+                case: case_status[case]
+                for case, run in zip(list(CaseName), list(Run))
+                if run and case in case_status
+            }
+        return case_status
+    except Exception as e:
+        print(f"{e}; ETABS case status unavailable")
+        return None
 
 
-def run_ETABS_analysis(SapModel, frames_df):
+case_status_names = {1: "not run", 2: "could not start", 3: "not finished"}
+
+
+def check_analysis_complete(
+    SapModel, frames_df, sample_size=5, load_cases=None, log=print
+):
     """
-    Run ETABS analysis if necessary and return results object
+    Check whether the model already has analysis results.
+    Uses the case run status when ETABS provides it and only falls back to
+    probing forces for a small sample of frames otherwise. With load_cases,
+    only those cases need to be finished, so an unrelated case that could not
+    start does not force a new analysis. Unfinished cases are logged.
+    """
+    Finished = 4
+    case_status = get_case_run_status(SapModel)
+    if case_status is not None:
+        if load_cases is not None:
+            case_status = {
+                case: status
+                for case, status in case_status.items()
+                if case in load_cases
+            }
+        unfinished = {
+            case: case_status_names.get(status, status)
+            for case, status in case_status.items()
+            if status != Finished
+        }
+        if unfinished:
+            log(f"ETABS cases without results: {unfinished}")
+        return len(case_status) > 0 and not unfinished
+
+    results = ETABS_api.cAnalysisResults(SapModel.Results)
+    sample_frames = frames_df["MyNames"].head(sample_size).to_list()
+    return bool(find_max_axial(results, sample_frames))
+
+
+def run_ETABS_analysis(SapModel, frames_df, load_cases=None, log=print):
+    """
+    Run ETABS analysis if necessary and return results object. With
+    load_cases, only those cases are checked for results.
     """
-    results = cAnalysisResults(SapModel.Results)
     # check if analysis is allready ran before running analysis
-    if not find_max_axial(results, frames_df["MyNames"].to_list()):
-        print("Not analyzed yet, commencing analysis")
-        Analyze = cAnalyze(SapModel.Analyze)
+    if not check_analysis_complete(SapModel, frames_df, load_cases=load_cases, log=log):
+        log("Not analyzed yet, commencing analysis")
+        Analyze = ETABS_api.cAnalyze(SapModel.Analyze)
         ret = Analyze.RunAnalysis()
-        return cAnalysisResults(SapModel.Results)
+        return ETABS_api.cAnalysisResults(SapModel.Results)
     else:
-        print("no analysis req")
-        return results
+        log("no analysis req")
+        return ETABS_api.cAnalysisResults(SapModel.Results)
 
 
 def get_ETABS_results_setup(Results):
-    return cAnalysisResultsSetup(Results.Setup)
+    return ETABS_api.cAnalysisResultsSetup(Results.Setup)
 
 
 def change_ETABS_output_case(Setup, load_case):
@@ -204,76 +347,766 @@ def change_ETABS_output_case(Setup, load_case):
         print(f"{e}; see please select valid load case")
 
 
+def select_ETABS_output_cases(Setup, load_cases: list):
+    """
+    Select all load_cases for output together so one results query returns
+    every case
+    """
+    try:
+        ret = Setup.DeselectAllCasesAndCombosForOutput()
+        for load_case in load_cases:
+            ret = Setup.SetCaseSelectedForOutput(load_case)
+            if ret != 0:
+                print(f"Could not select load case {load_case} for output")
+                return ret
+        return ret
+    except ValueError as e:
+        print(f"{e}; see please select valid load case")
+
+
+def get_frame_forces(Results, name, item_type_elm=0):
+    """
+    Query ETABS FrameForce once for an object, element, group or selection
+    (eItemTypeElm 0, 1, 2 and 3 respectively) and return the flat result
+    arrays as a DataFrame with one row per station per output case.
+    Returns None if ETABS has no results for the request.
+    """
+    NumberResults = 0
+    Obj = []
+    ObjSta = []
+    Elm = []
+    ElmSta = []
+    LoadCase = []
+    StepType = []
+    StepNum = []
+    P = []
+    V2 = []
+    V3 = []
+    T = []
+    M2 = []
+    M3 = []
+
+    [
+        ret,
+        NumberResults,
+        Obj,
+        ObjSta,
+        Elm,
+        ElmSta,
+        LoadCase,
+        StepType,
+        StepNum,
+        P,
+        V2,
+        V3,
+        T,
+        M2,
+        M3,
+    ] = Results.FrameForce(
+        str(name),
+        ETABS_api.eItemTypeElm(item_type_elm),
+        NumberResults,
+        Obj,
+        ObjSta,
+        Elm,
+        ElmSta,
+        LoadCase,
+        StepType,
+        StepNum,
+        P,
+        V2,
+        V3,
+        T,
+        M2,
+        M3,
+    )
+    if ret == 0 and NumberResults != 0:
+        data = {
+            "Obj": system_array_to_numpy(Obj),
+            "ObjSta": system_array_to_numpy(ObjSta),
+            "Elm": system_array_to_numpy(Elm),
+            "ElmSta": system_array_to_numpy(ElmSta),
+            "LoadCase": system_array_to_numpy(LoadCase),
+            "StepType": system_array_to_numpy(StepType),
+            "StepNum": system_array_to_numpy(StepNum),
+            "P": system_array_to_numpy(P),
+            "V2": system_array_to_numpy(V2),
+            "V3": system_array_to_numpy(V3),
+            "T": system_array_to_numpy(T),
+            "M2": system_array_to_numpy(M2),
+            "M3": system_array_to_numpy(M3),
+        }
+        return pd.DataFrame(data)
+
+
+def reduce_max_axial_by_case(forces_df):
+    """
+    Reduce flat FrameForce results for several output cases to a frame x case
+    DataFrame of max compression
+    """
+    return (
+        forces_df.groupby(["Obj", "LoadCase"], sort=False)["P"]
+        .min()
+        .abs()
+        .unstack("LoadCase")
+    )
+
+
+def create_frame_group(SapModel, group_name, frame_objs):
+    """
+    Define (or reset) an ETABS group containing only frame_objs so results for
+    all of them can be requested with a single FrameForce call.
+    Returns the group name, or None if ETABS rejected the group.
+    """
+    Group = ETABS_api.cGroup(SapModel.GroupDef)
+    ret = Group.SetGroup(group_name)
+    if ret != 0:
+        return None
+    Group.Clear(group_name)  # drop assignments left over from previous runs
+
+    FrameObj = ETABS_api.cFrameObj(SapModel.FrameObj)
+    Objects = 0
+    for frame in frame_objs:
+        ret = FrameObj.SetGroupAssign(
+            str(frame), group_name, False, ETABS_api.eItemType(Objects)
+        )
+        if ret != 0:
+            return None
+    return group_name
+
+
+def delete_frame_group(SapModel, group_name):
+    """
+    Delete a group made by create_frame_group. The frames themselves are kept.
+    """
+    Group = ETABS_api.cGroup(SapModel.GroupDef)
+    return Group.Delete(group_name)
+
+
+@contextmanager
+def temporary_frame_group(SapModel, group_name, frame_objs):
+    """
+    create_frame_group for the duration of a with block. The group is deleted
+    afterwards, also when the extraction fails, so it is not saved into the
+    user's model when ETABS saves on exit. Yields None if ETABS rejected the
+    group.
+    """
+    try:
+        yield create_frame_group(SapModel, group_name, frame_objs)
+    finally:
+        delete_frame_group(SapModel, group_name)
+
+
 def find_max_axial(Results, frame_objs: list) -> dict:
+    """
+    Find max compression for each frame in frame_objs for the cases currently
+    selected for output, querying ETABS frame by frame. Returns False if any
+    frame has no results. Bulk extraction goes through extract_max_axial.
+    """
     ObjectElm = 0
     P_max = {}
     for frame in frame_objs:
-        # declare variables
-        Name = str(frame)
-        NumberResults = 0
-        Obj = []
-        ObjSta = []
-        Elm = []
-        ElmSta = []
-        LoadCase = []
-        StepType = []
-        StepNum = []
-        P = []
-        V2 = []
-        V3 = []
-        T = []
-        M2 = []
-        M3 = []
-
-        [
-            ret,
-            NumberResults,
-            Obj,
-            ObjSta,
-            Elm,
-            ElmSta,
-            LoadCase,
-            StepType,
-            StepNum,
-            P,
-            V2,
-            V3,
-            T,
-            M2,
-            M3,
-        ] = Results.FrameForce(
-            Name,
-            eItemTypeElm(ObjectElm),
-            NumberResults,
-            Obj,
-            ObjSta,
-            Elm,
-            ElmSta,
-            LoadCase,
-            StepType,
-            StepNum,
-            P,
-            V2,
-            V3,
-            T,
-            M2,
-            M3,
-        )
-        if ret == 0 and NumberResults != 0:
-            P_max[frame] = abs(min(P))
+        forces_df = get_frame_forces(Results, frame, ObjectElm)
+        if forces_df is not None:
+            P_max[frame] = abs(forces_df["P"].min())
         else:
             return False
             # print(f"Bad Response for frame: {frame}")
     return P_max
 
 
+def report_progress(reporter, done, total, label):
+    """
+    Posts progress to reporter (see worker_utils.ProgressReporter) if given.
+    Raises worker_utils.Cancelled if the user cancelled the sweep.
+    """
+    if reporter is not None:
+        reporter.update(done, total, label)
+
+
+progress_batch_size = 50  # frames queried between progress/cancel checks
+
+
+def get_frames_forces(Results, frame_objs: list, group_name=None, reporter=None):
+    """
+    Pulls the flat FrameForce results of frame_objs for the cases currently
+    selected for output, with one call for group_name if given and frame by
+    frame otherwise. Returns None if any frame has no results.
+    """
+    if group_name is not None:
+        GroupElm = 2
+        report_progress(reporter, 0, 1, f"Querying group {group_name}")
+        forces_df = get_frame_forces(Results, group_name, GroupElm)
+        report_progress(reporter, 1, 1, f"Queried group {group_name}")
+        return forces_df
+
+    ObjectElm = 0
+    frame_forces = []
+    for i, frame in enumerate(frame_objs):
+        if i % progress_batch_size == 0:
+            report_progress(reporter, i, len(frame_objs), "Querying frames")
+        forces_df = get_frame_forces(Results, frame, ObjectElm)
+        if forces_df is None:
+            return None
+        frame_forces.append(forces_df)
+    report_progress(reporter, len(frame_objs), len(frame_objs), "Queried frames")
+    if not frame_forces:
+        return None
+    return pd.concat(frame_forces, ignore_index=True)
+
+
+def find_max_axial_by_case(
+    Results, frame_objs: list, load_cases: list, group_name=None, reporter=None
+):
+    """
+    Find max compression for each frame in frame_objs for every case in
+    load_cases in one sweep. The cases must already be selected for output
+    together (see select_ETABS_output_cases).
+
+    Returns a DataFrame indexed by frame with one column per load case, or False
+    if any frame or case has no results.
+    """
+    forces_df = get_frames_forces(Results, frame_objs, group_name, reporter)
+    if forces_df is None:
+        return False
+    return select_frames_and_cases(
+        reduce_max_axial_by_case(forces_df), frame_objs, load_cases
+    )
+
+
+def select_frames_and_cases(P_max_df, frame_objs: list, load_cases: list):
+    """
+    Orders a frame x case table like frame_objs and load_cases.
+    Returns False if any frame or case is missing.
+    """
+    frame_keys = [str(frame) for frame in frame_objs]
+    if not set(frame_keys).issubset(P_max_df.index) or not set(load_cases).issubset(
+        P_max_df.columns
+    ):
+        return False
+    P_max_df = P_max_df.loc[frame_keys, list(load_cases)]
+    P_max_df.index = frame_objs
+    P_max_df.columns.name = None
+    return P_max_df
+
+
+def get_database_table(SapModel, table_key, group_name="", numeric_fields=()):
+    """
+    Pull a whole ETABS database table with one GetTableForDisplayArray call.
+    The flat string array is reshaped to records x fields and numeric_fields are
+    converted to float64 column by column. Returns None if the table is empty.
+    """
+    DatabaseTables = ETABS_api.cDatabaseTables(SapModel.DatabaseTables)
+    FieldKeyList = []
+    TableVersion = 0
+    FieldsKeysIncluded = []
+    NumberRecords = 0
+    TableData = []
+    [
+        ret,
+        FieldKeyList,
+        TableVersion,
+        FieldsKeysIncluded,
+        NumberRecords,
+        TableData,
+    ] = DatabaseTables.GetTableForDisplayArray(
+        table_key,
+        FieldKeyList,
+        group_name,
+        TableVersion,
+        FieldsKeysIncluded,
+        NumberRecords,
+        TableData,
+    )
+    if ret != 0 or NumberRecords == 0:
+        return None
+    return parse_database_table(
+        FieldsKeysIncluded, NumberRecords, TableData, numeric_fields
+    )
+
+
+def parse_database_table(fields, number_records, table_data, numeric_fields=()):
+    """
+    Converts the flat, row-major string array of a database table to a typed
+    DataFrame
+    """
+    fields = system_array_to_numpy(fields).tolist()
+    table = system_array_to_numpy(table_data).reshape(number_records, len(fields))
+    data = {}
+    for i, field in enumerate(fields):
+        if field in numeric_fields:
+            data[field] = table[:, i].astype(str).astype(np.float64)
+        else:
+            data[field] = table[:, i]
+    return pd.DataFrame(data)
+
+
+def set_database_table_load_cases(SapModel, load_cases: list):
+    """
+    Select load_cases (and no combinations) for database table output
+    """
+    DatabaseTables = ETABS_api.cDatabaseTables(SapModel.DatabaseTables)
+    [ret, _] = DatabaseTables.SetLoadCombinationsSelectedForDisplay([])
+    [ret, _] = DatabaseTables.SetLoadCasesSelectedForDisplay(list(load_cases))
+    return ret
+
+
+column_forces_table_key = "Element Forces - Columns"
+column_forces_numeric_fields = ("Station", "P", "V2", "V3", "T", "M2", "M3")
+
+
+def get_column_forces_table(SapModel, load_cases: list, group_name=None, reporter=None):
+    """
+    Pulls the "Element Forces - Columns" database table for load_cases (limited
+    to group_name if given) in one call, with the columns named like the
+    FrameForce results. Returns None if ETABS has no results.
+    """
+    report_progress(reporter, 0, 1, f"Exporting {column_forces_table_key}")
+    if set_database_table_load_cases(SapModel, load_cases) != 0:
+        return None
+    table_df = get_database_table(
+        SapModel,
+        column_forces_table_key,
+        group_name=group_name or "",
+        numeric_fields=column_forces_numeric_fields,
+    )
+    if table_df is None:
+        return None
+    report_progress(reporter, 1, 1, f"Exported {column_forces_table_key}")
+    return table_df.rename(
+        columns={"UniqueName": "Obj", "OutputCase": "LoadCase", "Station": "ObjSta"}
+    )
+
+
+def find_max_axial_by_case_from_table(
+    SapModel, frame_objs: list, load_cases: list, group_name=None, reporter=None
+):
+    """
+    Same result as find_max_axial_by_case, but pulls the whole
+    "Element Forces - Columns" database table for load_cases (limited to
+    group_name if given) in one call instead of using FrameForce
+    """
+    forces_df = get_column_forces_table(SapModel, load_cases, group_name, reporter)
+    if forces_df is None:
+        return False
+    return select_frames_and_cases(
+        reduce_max_axial_by_case(forces_df), frame_objs, load_cases
+    )
+
+
+max_axial_backends = ["FrameForce", "DatabaseTables"]
+
+
+def extract_max_axial(
+    SapModel,
+    frame_objs: list,
+    load_cases: list,
+    group_name=None,
+    backend="FrameForce",
+    reporter=None,
+):
+    """
+    Find max compression per frame per load case with the selected backend:
+    "FrameForce" (per object, or per group if group_name is given) or
+    "DatabaseTables" (one "Element Forces - Columns" table export).
+    reporter receives progress and can cancel between batches of frames.
+    """
+    if backend == "DatabaseTables":
+        return find_max_axial_by_case_from_table(
+            SapModel, frame_objs, load_cases, group_name=group_name, reporter=reporter
+        )
+    elif backend == "FrameForce":
+        Results = ETABS_api.cAnalysisResults(SapModel.Results)
+        select_ETABS_output_cases(get_ETABS_results_setup(Results), load_cases)
+        return find_max_axial_by_case(
+            Results, frame_objs, load_cases, group_name=group_name, reporter=reporter
+        )
+    raise ValueError(f"Unknown backend {backend}; expected one of {max_axial_backends}")
+
+
+envelope_components = ["P", "V2", "V3", "T", "M2", "M3"]
+envelope_locations = ["", "_bottom", "_top"]
+
+
+def reversed_columns(cols_df) -> list:
+    """
+    Returns the names of the columns drawn top-down, i.e. whose I end
+    (Point1Z) is above their J end (Point2Z)
+    """
+    is_reversed = cols_df["Point1Z"].to_numpy() > cols_df["Point2Z"].to_numpy()
+    return cols_df["MyNames"].astype(str)[is_reversed].to_list()
+
+
+def reduce_force_envelope(forces_df, float32=False, reversed_frames=()):
+    """
+    Reduces flat frame force results (FrameForce or the columns table) to the
+    signed max and min of every component per frame and case: over all
+    stations (P_max, P_min, ...), at the bottom end station (P_bottom_max, ...)
+    and at the top end station (P_top_max, ...). The bottom is the I end (the
+    lowest station) and the top the J end, except for reversed_frames, the
+    columns drawn top-down (see reversed_columns), where they swap.
+
+    Returns one row per frame and case with categorical Obj and LoadCase
+    columns; float32=True halves the size of the value columns.
+    """
+    obj_codes, obj_names = pd.factorize(forces_df["Obj"].astype(str))
+    case_codes, case_names = pd.factorize(forces_df["LoadCase"].astype(str))
+    group = obj_codes.astype(np.int64) * len(case_names) + case_codes
+    # one sort brings every frame and case together; each component is then
+    # reduced for all groups at once
+    order = np.argsort(group, kind="stable")
+    group = group[order]
+    starts = np.flatnonzero(np.r_[True, group[1:] != group[:-1]])
+    counts = np.diff(np.r_[starts, len(group)])
+    # component x row, so every reduction runs over contiguous memory
+    values = forces_df[envelope_components].to_numpy(np.float64).T[:, order]
+    station = forces_df["ObjSta"].to_numpy(np.float64)[order]
+    bottom = np.minimum.reduceat(station, starts)
+    top = np.maximum.reduceat(station, starts)
+    is_reversed = np.isin(obj_names, [str(frame) for frame in reversed_frames])
+    if is_reversed.any():
+        flip = is_reversed[group[starts] // len(case_names)]
+        bottom, top = np.where(flip, top, bottom), np.where(flip, bottom, top)
+    rows_at = {
+        "": None,
+        "_bottom": np.flatnonzero(station == np.repeat(bottom, counts)),
+        "_top": np.flatnonzero(station == np.repeat(top, counts)),
+    }
+
+    data = {
+        "Obj": pd.Categorical.from_codes(
+            group[starts] // len(case_names), categories=obj_names
+        ),
+        "LoadCase": pd.Categorical.from_codes(
+            group[starts] % len(case_names), categories=case_names
+        ),
+    }
+    dtype = np.float32 if float32 else np.float64
+    for location in envelope_locations:
+        rows = rows_at[location]
+        if rows is None:
+            location_values, location_starts = values, starts
+        else:
+            location_values = values[:, rows]
+            location_group = group[rows]
+            location_starts = np.flatnonzero(
+                np.r_[True, location_group[1:] != location_group[:-1]]
+            )
+        if location_values.shape[1] == len(location_starts):
+            # one result per frame and case, e.g. a linear case at an end
+            maxima = minima = location_values
+        else:
+            maxima = np.maximum.reduceat(location_values, location_starts, 1)
+            minima = np.minimum.reduceat(location_values, location_starts, 1)
+        for k, component in enumerate(envelope_components):
+            data[f"{component}{location}_max"] = maxima[k].astype(dtype)
+            data[f"{component}{location}_min"] = minima[k].astype(dtype)
+    return pd.DataFrame(data)
+
+
+def select_envelope_frames_and_cases(envelope, frame_objs: list, load_cases: list):
+    """
+    Orders an envelope table by frame_objs, then load_cases. Returns False if
+    any frame and case pair is missing.
+    """
+    frame_keys = [str(frame) for frame in frame_objs]
+    obj = envelope["Obj"].cat
+    case = envelope["LoadCase"].cat
+    obj_index = pd.Index(obj.categories).get_indexer(frame_keys)
+    case_index = pd.Index(case.categories).get_indexer(list(load_cases))
+    if (obj_index < 0).any() or (case_index < 0).any():
+        return False
+    n_cases = len(case.categories)
+    row_of_group = np.full(len(obj.categories) * n_cases, -1)
+    row_of_group[obj.codes.astype(np.int64) * n_cases + case.codes] = np.arange(
+        len(envelope)
+    )
+    rows = row_of_group[(obj_index[:, None] * n_cases + case_index).ravel()]
+    if (rows < 0).any():
+        return False
+    envelope = envelope.iloc[rows].reset_index(drop=True)
+    envelope["Obj"] = pd.Categorical.from_codes(
+        np.repeat(np.arange(len(frame_keys)), len(load_cases)), categories=frame_keys
+    )
+    envelope["LoadCase"] = pd.Categorical.from_codes(
+        np.tile(np.arange(len(load_cases)), len(frame_keys)),
+        categories=list(load_cases),
+    )
+    return envelope
+
+
+def envelope_max_axial(envelope, frame_objs: list, load_cases: list):
+    """
+    Returns the frame x case max compression table of extract_max_axial from an
+    envelope table, or False if any frame or case is missing
+    """
+    P_min = envelope.pivot(index="Obj", columns="LoadCase", values="P_min")
+    P_min.index = P_min.index.astype(str)
+    P_min.columns = P_min.columns.astype(str)
+    return select_frames_and_cases(P_min.abs(), frame_objs, load_cases)
+
+
+def extract_force_envelope(
+    SapModel,
+    frame_objs: list,
+    load_cases: list,
+    group_name=None,
+    backend="FrameForce",
+    reporter=None,
+    float32=False,
+    reversed_frames=(),
+):
+    """
+    Same sweep as extract_max_axial, but keeps every force component: returns
+    the envelope table (see reduce_force_envelope) of frame_objs for
+    load_cases, ordered by frame and case, or False if any frame or case has
+    no results. reversed_frames are the columns drawn top-down.
+    """
+    if backend == "DatabaseTables":
+        forces_df = get_column_forces_table(SapModel, load_cases, group_name, reporter)
+    elif backend == "FrameForce":
+        Results = ETABS_api.cAnalysisResults(SapModel.Results)
+        select_ETABS_output_cases(get_ETABS_results_setup(Results), load_cases)
+        forces_df = get_frames_forces(Results, frame_objs, group_name, reporter)
+    else:
+        raise ValueError(
+            f"Unknown backend {backend}; expected one of {max_axial_backends}"
+        )
+    if forces_df is None:
+        return False
+    return select_envelope_frames_and_cases(
+        reduce_force_envelope(forces_df, float32, reversed_frames),
+        frame_objs,
+        load_cases,
+    )
+
+
+def get_pier_forces(Results):
+    """
+    Query ETABS PierForce once: forces at the top and bottom of every pier on
+    every story for the cases currently selected for output. Returns a
+    DataFrame with one row per story, pier, case and location, or None if ETABS
+    has no results.
+    """
+    NumberResults = 0
+    StoryName = []
+    PierName = []
+    LoadCase = []
+    Location = []
+    P = []
+    V2 = []
+    V3 = []
+    T = []
+    M2 = []
+    M3 = []
+
+    [
+        ret,
+        NumberResults,
+        StoryName,
+        PierName,
+        LoadCase,
+        Location,
+        P,
+        V2,
+        V3,
+        T,
+        M2,
+        M3,
+    ] = Results.PierForce(
+        NumberResults,
+        StoryName,
+        PierName,
+        LoadCase,
+        Location,
+        P,
+        V2,
+        V3,
+        T,
+        M2,
+        M3,
+    )
+    if ret == 0 and NumberResults != 0:
+        data = {
+            "StoryName": system_array_to_numpy(StoryName),
+            "PierName": system_array_to_numpy(PierName),
+            "LoadCase": system_array_to_numpy(LoadCase),
+            "Location": system_array_to_numpy(Location),
+            "P": system_array_to_numpy(P),
+            "V2": system_array_to_numpy(V2),
+            "V3": system_array_to_numpy(V3),
+            "T": system_array_to_numpy(T),
+            "M2": system_array_to_numpy(M2),
+            "M3": system_array_to_numpy(M3),
+        }
+        return pd.DataFrame(data)
+
+
+def reduce_pier_max_axial(pier_forces_df, location="Bottom"):
+    """
+    Reduce PierForce results to a (story, pier) x case table of the max
+    compression at location ("Bottom", where the pier bears on the slab, or
+    "Top")
+    """
+    at_location = pier_forces_df[
+        pier_forces_df["Location"].astype(str).str.lower() == location.lower()
+    ]
+    P_max_df = (
+        at_location.groupby(["StoryName", "PierName", "LoadCase"], sort=False)["P"]
+        .min()
+        .abs()
+        .unstack("LoadCase")
+    )
+    P_max_df.columns.name = None
+    return P_max_df
+
+
+def extract_pier_max_axial(SapModel, load_cases: list, location="Bottom"):
+    """
+    Find the max compression of every pier on every story for every case in
+    load_cases with a single PierForce call. Returns a (story, pier) x case
+    DataFrame, or False if ETABS has no results for a case.
+    """
+    Results = ETABS_api.cAnalysisResults(SapModel.Results)
+    select_ETABS_output_cases(get_ETABS_results_setup(Results), load_cases)
+    pier_forces_df = get_pier_forces(Results)
+    if pier_forces_df is None:
+        return False
+    P_max_df = reduce_pier_max_axial(pier_forces_df, location)
+    if not set(load_cases).issubset(P_max_df.columns):
+        return False
+    return P_max_df[list(load_cases)]
+
+
+pier_label_table_key = "Area Assignments - Pier Labels"
+# database table field -> pier leg column
+pier_label_fields = {
+    "Story": "StoryName",
+    "UniqueName": "AreaName",
+    "PierName": "PierName",
+}
+
+
+def get_area_plan_segments(SapModel):
+    """
+    Returns the plan segment of every area object from one GetAllAreas call,
+    as a DataFrame of AreaName, X1, Y1, X2, Y2. The ends are the two boundary
+    points farthest apart in plan, which for a wall panel are its ends.
+    """
+    AreaObj = ETABS_api.cAreaObj(SapModel.AreaObj)
+    NumberNames = 0
+    MyName = []
+    DesignOrientation = []
+    NumberBoundaryPts = 0
+    PointDelimiter = []
+    PointNames = []
+    PointX = []
+    PointY = []
+    PointZ = []
+    [
+        ret,
+        NumberNames,
+        MyName,
+        DesignOrientation,
+        NumberBoundaryPts,
+        PointDelimiter,
+        PointNames,
+        PointX,
+        PointY,
+        PointZ,
+    ] = AreaObj.GetAllAreas(
+        NumberNames,
+        MyName,
+        DesignOrientation,
+        NumberBoundaryPts,
+        PointDelimiter,
+        PointNames,
+        PointX,
+        PointY,
+        PointZ,
+    )
+    if ret != 0 or NumberNames == 0:
+        return None
+    # PointDelimiter holds the index of the last boundary point of each area
+    last = system_array_to_numpy(PointDelimiter).astype(np.int64)
+    first = np.r_[0, last[:-1] + 1]
+    xy = np.column_stack(
+        [system_array_to_numpy(PointX), system_array_to_numpy(PointY)]
+    ).astype(np.float64)
+    area = np.repeat(np.arange(len(last)), last - first + 1)
+
+    def farthest_from(origin):
+        distance = np.hypot(*(xy - origin[area]).T)
+        return xy[np.lexsort((distance, area))[last]]
+
+    centroid = np.add.reduceat(xy, first) / (last - first + 1)[:, None]
+    end1 = farthest_from(centroid)
+    end2 = farthest_from(end1)
+    return pd.DataFrame(
+        {
+            "AreaName": system_array_to_numpy(MyName),
+            "X1": end1[:, 0],
+            "Y1": end1[:, 1],
+            "X2": end2[:, 0],
+            "Y2": end2[:, 1],
+        }
+    )
+
+
+def get_pier_footprints(SapModel):
+    """
+    Returns the plan footprint of every wall leg of every pier on every
+    story, indexed by (story, pier) with one row per leg: the leg's area
+    object, end points X1, Y1, X2, Y2 and plan length. L, C and box cores
+    get one row per wall panel. One "Area Assignments - Pier Labels" table
+    export plus one GetAllAreas call. Returns None if the model has no piers.
+    """
+    labels_df = get_database_table(SapModel, pier_label_table_key)
+    if labels_df is None:
+        return None
+    labels_df = labels_df[list(pier_label_fields)].rename(columns=pier_label_fields)
+    labels_df = labels_df[~labels_df["PierName"].isin(["None", ""])]
+    segments_df = get_area_plan_segments(SapModel)
+    if labels_df.empty or segments_df is None:
+        return None
+    footprints = labels_df.merge(segments_df, on="AreaName")
+    footprints["Length"] = np.hypot(
+        footprints["X2"] - footprints["X1"], footprints["Y2"] - footprints["Y1"]
+    )
+    footprints = footprints[footprints["Length"] > 0]
+    return footprints.set_index(["StoryName", "PierName"])
+
+
 def find_columns(df):
     return df[(df["Point1X"] == df["Point2X"]) & (df["Point1Y"] == df["Point2Y"])]
 
 
 def find_levels(df):
-    # adjust so it is sorted
-    return df["StoryName"].unique().tolist()
+    """
+    Returns story names sorted from lowest to highest column base elevation
+    """
+    return (
+        df.groupby("StoryName", observed=True, sort=False)["Point1Z"]
+        .min()
+        .sort_values()
+        .index.tolist()
+    )
+
+
+def build_story_index(df) -> dict:
+    """
+    Partition the column table by story once so per-level selections avoid a
+    boolean scan of the whole table. Returns {story: row positions} with the
+    positions of each story sorted by elevation (Point1Z).
+    """
+    story_codes, stories = pd.factorize(df["StoryName"])
+    order = np.lexsort((df["Point1Z"].to_numpy(), story_codes))
+    counts = np.bincount(story_codes, minlength=len(stories))
+    return dict(zip(stories, np.split(order, np.cumsum(counts)[:-1])))
+
+
+def select_story(df, story_index: dict, story):
+    return df.iloc[story_index[story]]
 
 
 def exit_ETABS(myETABSObject):
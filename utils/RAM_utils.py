@@ -1,29 +1,18 @@
 """
 This module contains wrapper functions for the RAM Concept API. 
-Validation of the user-provided RAM Concept python directory is 
-performed before adding it to $PATH and importing necessary libraries. 
+The RAM Concept python directory is validated, added to $PATH and imported
+by the RAM_api provider the first time Concept is started.
 """
 
-import sys  # add RAM concept API installation to path so it can be found (it is in same location as application not in venv)
 import requests
+import numpy as np
 
-from .validation_utils import (
-    validate_and_get_path,
-    validate_RAM_path,
-)
-
-RAM_dir_path = validate_and_get_path(validate_RAM_path, "RAM Concept Python Directory")
-sys.path.insert(1, RAM_dir_path)
-
-from ram_concept.concept import Concept
-from ram_concept.cad_manager import CadManager
-from ram_concept.force_loading_layer import ForceLoadingLayer
-from ram_concept.model import Model
-from ram_concept.force_loading_layer import ForceLoadingLayer
+from .api_providers import RAM_api
+from .misc_utils import match_points_by_location
 
 
 def start_concept_and_open_model(path, headless=True):
-    concept = Concept.start_concept(headless=headless)
+    concept = RAM_api.start_concept(headless=headless)
     model = concept.open_file(path)
     cad_manager = model.cad_manager
     return concept, model, cad_manager
@@ -47,25 +36,150 @@ def shut_down(concept):
     concept.shut_down()
 
 
-def check_loading_layer_exists(cad_manager, layer_name):
+class LoadingLayerRegistry:
+    """
+    Loads the force loading layer names and handles once and serves existence
+    checks and lookups from memory instead of walking
+    cad_manager.force_loading_layers over the API every time. Layers added
+    through add() are registered as they are created.
+    """
+
+    def __init__(self, cad_manager, omitted_layers=["Self-Dead Loading"]):
+        self.cad_manager = cad_manager
+        self.omitted_layers = omitted_layers
+        self.refresh()
+
+    def refresh(self):
+        """
+        Re-reads layers from RAM, e.g. after they were changed outside the bridge
+        """
+        self.layers = {
+            layer.name: layer
+            for layer in self.cad_manager.force_loading_layers
+            if layer.name not in self.omitted_layers
+        }
+
+    def names(self):
+        return list(self.layers)
+
+    def exists(self, layer_name):
+        return layer_name in self.layers
+
+    def get(self, layer_name):
+        return self.layers.get(layer_name)
+
+    def add(self, layer_name):
+        if layer_name not in self.layers and layer_name not in self.omitted_layers:
+            layer = self.cad_manager.add_force_loading_layer(layer_name)
+            if layer is None:
+                layer = self.cad_manager.force_loading_layer(layer_name)
+            self.layers[layer_name] = layer
+        return self.layers.get(layer_name)
+
+
+def check_loading_layer_exists(cad_manager, layer_name, registry=None):
+    if registry is not None:
+        return registry.exists(layer_name)
     current_loading_layers = get_all_loading_layers(cad_manager)
     if layer_name in current_loading_layers:
         return True
     else:
-        False
+        return False
 
 
-def add_force_loading_layer(cad_manager, new_layer_name):
-    if not check_loading_layer_exists(cad_manager, new_layer_name):
+def add_force_loading_layer(cad_manager, new_layer_name, registry=None):
+    if registry is not None:
+        registry.add(new_layer_name)
+    elif not check_loading_layer_exists(cad_manager, new_layer_name):
         cad_manager.add_force_loading_layer(new_layer_name)
 
 
-def add_axial_loads_to_loading_layer(cad_manager, layer_name, x, y, Fz):
-    if check_loading_layer_exists(cad_manager, layer_name):
+def add_axial_loads_to_loading_layer(cad_manager, layer_name, x, y, Fz, registry=None):
+    if registry is not None:
+        force_loading_layer = registry.get(layer_name)
+    elif check_loading_layer_exists(cad_manager, layer_name):
         force_loading_layer = cad_manager.force_loading_layer(layer_name)
+    else:
+        force_loading_layer = None
+    if force_loading_layer is not None:
         force_loading_layer.add_point_loads(x, y, Fz=Fz)
 
 
+def sync_axial_loads_to_loading_layer(
+    cad_manager,
+    layer_name,
+    x,
+    y,
+    Fz,
+    location_tolerance=1.0,
+    force_tolerance=1.0,
+    registry=None,
+):
+    """
+    Makes the point loads on a layer match x, y, Fz while touching only what
+    changed: existing loads are matched to the new ones by location (within
+    location_tolerance, see match_points_by_location), then changed loads are
+    updated, missing ones added and loads with no new counterpart deleted.
+    Loads on the layer that were not written by the bridge are deleted too.
+
+    RAM Concept has no bulk read, so reading the layer costs two API calls per
+    existing load (location and Fz). A sync saves model churn (fewer loads
+    rewritten), not API traffic: it makes more calls than one bulk
+    add_point_loads.
+
+    Returns counts of added, updated, removed and unchanged loads, or None if
+    the layer does not exist.
+    """
+    if registry is not None:
+        force_loading_layer = registry.get(layer_name)
+    elif check_loading_layer_exists(cad_manager, layer_name):
+        force_loading_layer = cad_manager.force_loading_layer(layer_name)
+    else:
+        force_loading_layer = None
+    if force_loading_layer is None:
+        return None
+
+    existing_loads = list(force_loading_layer.point_loads)
+    existing_locations = [load.location for load in existing_loads]
+    existing_pts = [[location.x, location.y] for location in existing_locations]
+    existing_Fz = np.array([load.Fz for load in existing_loads], dtype=float)
+    new_pts = np.column_stack([x, y]) if len(x) else np.empty((0, 2))
+    Fz = np.asarray(Fz, dtype=float)
+
+    matched_old, matched_new, unmatched_old, unmatched_new = match_points_by_location(
+        existing_pts, new_pts, location_tolerance
+    )
+    changed = np.abs(existing_Fz[matched_old] - Fz[matched_new]) > force_tolerance
+    for i, j in zip(matched_old[changed], matched_new[changed]):
+        existing_loads[i].Fz = float(Fz[j])
+    for i in unmatched_old:
+        existing_loads[i].delete()
+    if len(unmatched_new):
+        force_loading_layer.add_point_loads(
+            new_pts[unmatched_new, 0].tolist(),
+            new_pts[unmatched_new, 1].tolist(),
+            Fz=Fz[unmatched_new].tolist(),
+        )
+    return {
+        "added": len(unmatched_new),
+        "updated": int(changed.sum()),
+        "removed": len(unmatched_old),
+        "unchanged": int((~changed).sum()),
+    }
+
+
+def get_column_and_support_locations(cad_manager):
+    """
+    Returns an N x 2 array of the plan locations of every column and point
+    support on the RAM structure layer, used for automatic calibration
+    """
+    structure_layer = cad_manager.structure_layer
+    locations = [column.location for column in structure_layer.columns] + [
+        support.location for support in structure_layer.point_supports
+    ]
+    return np.array([[location.x, location.y] for location in locations]).reshape(-1, 2)
+
+
 def calibrate_ETABS_to_RAM(ETABs_coord: list, RAM_coord: list) -> list:
     """
     this function takes the same point in ETABs coordinates and in RAM coordinates and creates
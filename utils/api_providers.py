@@ -0,0 +1,138 @@
+"""
+This module resolves the ETABS and RAM Concept APIs lazily.
+
+Importing ETABS_utils or RAM_utils no longer loads pythonnet, ETABSv1 or
+ram_concept. Instead the module level ETABS_api and RAM_api providers load them
+on first attribute access, e.g. ETABS_api.cFile(...) or RAM_api.Concept.
+resolve_paths() only does a quick check of the configured paths (prompting the
+user if they are missing) and is meant to run on the GUI thread; the full
+validation happens in load(), and its ETABSv1 module / Concept instance are
+kept and reused.
+
+Setting a provider's metrics to metrics_utils.metrics_recorder times every
+API call: ETABS interface objects (the cInterface casts) and RAM Concept
+instances are handed out inside InstrumentedAPIObject proxies.
+"""
+
+import sys
+import threading
+
+from .validation_utils import (
+    validate_and_get_path,
+    check_ETABS_dll_path,
+    validate_ETABS_dll_path,
+    validate_ETABS_exe_path,
+    check_RAM_path,
+    validate_RAM_path,
+    take_validated_concept,
+)
+from .metrics_utils import InstrumentedAPIObject, unwrap
+
+
+class APIProvider:
+    def __init__(self, config_path="config.json"):
+        self.config_path = config_path
+        self.module = None
+        self.metrics = None  # MetricsRecorder timing API calls, if any
+        self.lock = threading.Lock()
+
+    def __getattr__(self, name):
+        # only called for names not set in __init__, i.e. API names
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return getattr(self.load(), name)
+
+    def load(self):
+        with self.lock:
+            if self.module is None:
+                self.module = self.import_module()
+        return self.module
+
+
+class ETABSProvider(APIProvider):
+    def __init__(self, config_path="config.json"):
+        super().__init__(config_path)
+        self.dll_path = None
+        self.exe_path = None
+
+    def __getattr__(self, name):
+        value = super().__getattr__(name)
+        metrics = self.metrics
+        if metrics is None or not (name[:1] == "c" and name[1:2].isupper()):
+            return value
+
+        def cast(obj):
+            return InstrumentedAPIObject(
+                value(unwrap(obj)), f"ETABS.{name[1:]}", metrics
+            )
+
+        return cast
+
+    def resolve_paths(self, master=None, prompt=True):
+        """
+        Returns True if the ETABS .dll and .exe paths are configured, prompting
+        the user for them otherwise
+        """
+        self.dll_path = validate_and_get_path(
+            check_ETABS_dll_path, "ETABS .dll", self.config_path, master, prompt
+        )
+        self.exe_path = validate_and_get_path(
+            validate_ETABS_exe_path, "ETABS .exe", self.config_path, master, prompt
+        )
+        return self.dll_path is not None and self.exe_path is not None
+
+    def import_module(self):
+        if self.dll_path is None and not self.resolve_paths():
+            raise ImportError("ETABS .dll path is not configured")
+        if not validate_ETABS_dll_path(self.dll_path):
+            raise ImportError(f"Could not load the ETABS API from {self.dll_path}")
+        import ETABSv1
+
+        return ETABSv1
+
+
+class RAMProvider(APIProvider):
+    def __init__(self, config_path="config.json"):
+        super().__init__(config_path)
+        self.dir_path = None
+
+    def resolve_paths(self, master=None, prompt=True):
+        """
+        Returns True if the RAM Concept python directory is configured, prompting
+        the user for it otherwise
+        """
+        self.dir_path = validate_and_get_path(
+            check_RAM_path,
+            "RAM Concept Python Directory",
+            self.config_path,
+            master,
+            prompt,
+        )
+        return self.dir_path is not None
+
+    def import_module(self):
+        if self.dir_path is None and not self.resolve_paths():
+            raise ImportError("RAM Concept python directory is not configured")
+        # starts and pings a headless Concept, which start_concept reuses
+        if not validate_RAM_path(self.dir_path):
+            raise ImportError(f"Could not start RAM Concept from {self.dir_path}")
+        from ram_concept import concept
+
+        return concept
+
+    def start_concept(self, headless=True):
+        """
+        Returns the Concept instance started during validation if there is one,
+        otherwise starts a new one
+        """
+        Concept = self.load().Concept
+        concept = take_validated_concept() if headless else None
+        if concept is None:
+            concept = Concept.start_concept(headless=headless)
+        if self.metrics is not None:
+            concept = InstrumentedAPIObject(concept, "RAM.Concept", self.metrics, True)
+        return concept
+
+
+ETABS_api = ETABSProvider()
+RAM_api = RAMProvider()
@@ -0,0 +1,215 @@
+"""
+This module times every stage of the ETABS to RAM Concept pipeline on synthetic
+models served by the stand-in APIs (see stand_in_apis), so performance can be
+measured and compared between commits on machines without ETABS.
+
+Each run opens a synthetic model, then times frame extraction, column
+detection, the force sweep over all columns and cases, calibration of the top
+level, the load write of that level and the RAM save. The best time of
+`repeats` runs is kept per stage. Results are plain dicts written to JSON
+together with the commit and package versions; compare_benchmarks lines two of
+them up.
+"""
+
+import json
+import platform
+import subprocess
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+from .ETABS_utils import *
+from .RAM_utils import *
+from .misc_utils import auto_calibrate, rotation_matrix_from_angle, transform_points
+from .pipeline_utils import ETABS_group_prefix
+from .stand_in_apis import StandInETABSv1, StandInRamConcept, use_stand_in_apis
+
+benchmark_stages = [
+    "frame extraction",
+    "column detection",
+    "force sweep",
+    "calibration",
+    "load write",
+    "save",
+]
+default_benchmark_frames = [1000, 10000, 50000, 200000]
+default_benchmark_cases = [1, 10, 50]
+
+
+@contextmanager
+def time_stage(timings: dict, stage):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[stage] = time.perf_counter() - start
+
+
+def run_pipeline_once(frames, cases, levels, latency, backend) -> dict:
+    """
+    Runs the pipeline once on a synthetic model. Returns {stage: seconds}.
+    """
+    ETABS = StandInETABSv1(frames=frames, cases=cases, levels=levels, latency=latency)
+    RAM = StandInRamConcept(latency=latency)
+    timings = {}
+    with use_stand_in_apis(ETABS, RAM):
+        SapModel, ETABSObject = initalize_SapModel()
+        open_ETABS_file(SapModel, f"benchmark_{frames}_{cases}.EDB")
+        load_cases = find_load_cases_by_type(SapModel)
+
+        with time_stage(timings, "frame extraction"):
+            frames_df = get_all_frame_elements(SapModel, lean=True)
+        with time_stage(timings, "column detection"):
+            cols_df = find_columns(frames_df)
+            story_index = build_story_index(cols_df)
+            top_level = find_levels(cols_df)[-1]
+        with time_stage(timings, "force sweep"):
+            column_names = cols_df["MyNames"].to_list()
+            with temporary_frame_group(
+                SapModel, f"{ETABS_group_prefix}all_columns", column_names
+            ) as group_name:
+                P_max_df = extract_max_axial(
+                    SapModel, column_names, load_cases, group_name, backend
+                )
+            if P_max_df is False:
+                raise ValueError("The stand-in returned no forces")
+
+        level_df = select_story(cols_df, story_index, top_level)
+        ETABS_pts = level_df[["Point1X", "Point1Y"]].to_numpy(np.float64)
+        # RAM sees the level rotated and shifted, as after a real model export
+        RAM.structure_points = transform_points(
+            ETABS_pts, rotation_matrix_from_angle(np.radians(30)), [1200.0, -600.0]
+        )
+        concept, model, cad_manager = start_concept_and_open_model("benchmark.cpt")
+        with time_stage(timings, "calibration"):
+            rotation_matrix, delta_translation, residuals = auto_calibrate(
+                ETABS_pts, get_column_and_support_locations(cad_manager)
+            )
+        with time_stage(timings, "load write"):
+            RAM_pts = transform_points(ETABS_pts, rotation_matrix, delta_translation)
+            loads = P_max_df.iloc[story_index[top_level]].sum(axis=1)
+            registry = LoadingLayerRegistry(cad_manager)
+            add_axial_loads_to_loading_layer(
+                cad_manager,
+                "Other Dead Loading",
+                RAM_pts[:, 0].tolist(),
+                RAM_pts[:, 1].tolist(),
+                loads.to_list(),
+                registry=registry,
+            )
+        with time_stage(timings, "save"):
+            model.save_file("benchmark.cpt")
+        concept.shut_down()
+        exit_ETABS(ETABSObject)
+    return timings
+
+
+def run_pipeline_benchmark(
+    frames=1000, cases=3, levels=10, latency=0.0, backend="FrameForce", repeats=3
+) -> dict:
+    """
+    Returns the configuration and the best time per stage over repeats runs
+    """
+    runs = [
+        run_pipeline_once(frames, cases, levels, latency, backend)
+        for _ in range(repeats)
+    ]
+    stages = {stage: min(run[stage] for run in runs) for stage in benchmark_stages}
+    return {
+        "frames": frames,
+        "cases": cases,
+        "levels": levels,
+        "latency_s": latency,
+        "backend": backend,
+        "repeats": repeats,
+        "stages_s": stages,
+        "total_s": sum(stages.values()),
+    }
+
+
+def get_git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmark_suite(
+    frames_list=default_benchmark_frames,
+    cases_list=default_benchmark_cases,
+    levels=10,
+    latency=0.0,
+    backend="FrameForce",
+    repeats=3,
+    log=print,
+) -> dict:
+    """
+    Runs run_pipeline_benchmark for every frames x cases combination
+    """
+    results = {
+        "commit": get_git_commit(),
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "runs": [],
+    }
+    for frames in frames_list:
+        for cases in cases_list:
+            run = run_pipeline_benchmark(
+                frames, cases, levels, latency, backend, repeats
+            )
+            results["runs"].append(run)
+            log(f"{frames} frames, {cases} cases: {run['total_s']:.3f} s")
+    return results
+
+
+def write_benchmark(results: dict, path):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=4)
+
+
+def load_benchmark(path) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def benchmark_table(results: dict):
+    """
+    Returns one row per run and stage with its time in seconds
+    """
+    rows = [
+        {
+            "frames": run["frames"],
+            "cases": run["cases"],
+            "latency_s": run["latency_s"],
+            "backend": run["backend"],
+            "stage": stage,
+            "seconds": seconds,
+        }
+        for run in results["runs"]
+        for stage, seconds in run["stages_s"].items()
+    ]
+    return pd.DataFrame(rows)
+
+
+def compare_benchmarks(old: dict, new: dict):
+    """
+    Lines up the stage times of two benchmark results. ratio < 1 means new is
+    faster.
+    """
+    keys = ["frames", "cases", "latency_s", "backend", "stage"]
+    table = benchmark_table(old).merge(
+        benchmark_table(new), on=keys, suffixes=("_old", "_new")
+    )
+    table["ratio"] = table["seconds_new"] / table["seconds_old"]
+    return table
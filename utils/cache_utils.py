@@ -0,0 +1,131 @@
+"""
+This module contains an on-disk cache of data pulled from ETABS so an unchanged
+model can be reopened without starting ETABS.
+
+Each entry is a compressed .npz file holding the frames table, the load case
+names by analysis type and the per-case column forces extracted so far. Entries
+are keyed by a fingerprint of the EDB file (path, size, mtime and a content
+hash) and the least recently used entries are evicted once the cache grows past
+its size limit.
+"""
+
+import hashlib
+import os
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+default_cache_dir = (
+    Path(os.getenv("LOCALAPPDATA", Path.home())) / "ETABS_RAM_bridge" / "cache"
+)
+default_max_cache_bytes = 500 * 1024**2  # 500 MB
+
+
+def fingerprint_model_file(model_path, chunk_size=1024**2) -> str:
+    """
+    Returns a key identifying the exact state of the model file
+    """
+    path = Path(model_path).resolve()
+    stat = path.stat()
+    content_hash = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            content_hash.update(chunk)
+    key = f"{path}|{stat.st_size}|{stat.st_mtime_ns}|{content_hash.hexdigest()}"
+    return hashlib.blake2b(key.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def column_to_array(series):
+    """
+    Converts a DataFrame column to an array np.load can read without pickle
+    """
+    if pd.api.types.is_numeric_dtype(series.dtype):
+        return series.to_numpy()
+    return series.astype(str).to_numpy(dtype=str)
+
+
+class ResultsCache:
+    def __init__(self, cache_dir=default_cache_dir, max_bytes=default_max_cache_bytes):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+
+    def entry_path(self, key):
+        return self.cache_dir / f"{key}.npz"
+
+    def load(self, key):
+        """
+        Returns dict with frames_df, load_cases ({analysis type: [cases]}) and
+        forces (frame x case DataFrame) or None on a cache miss
+        """
+        path = self.entry_path(key)
+        if not path.exists():
+            return None
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                frames_df = pd.DataFrame(
+                    {
+                        column: data[f"frames__{column}"]
+                        for column in data["frames_columns"]
+                    }
+                )
+                load_cases = {
+                    int(name.split("__")[1]): data[name].tolist()
+                    for name in data.files
+                    if name.startswith("load_cases__")
+                }
+                forces = pd.DataFrame(
+                    data["force_values"],
+                    index=data["force_frames"],
+                    columns=data["force_cases"],
+                )
+        except (OSError, ValueError, KeyError) as e:
+            print(f"{e}; discarding unreadable cache entry {path}")
+            path.unlink(missing_ok=True)
+            return None
+        os.utime(path)  # mark as recently used
+        return {"frames_df": frames_df, "load_cases": load_cases, "forces": forces}
+
+    def save(self, key, frames_df, load_cases: dict, forces):
+        """
+        Writes an entry for key, replacing any previous one, then evicts least
+        recently used entries until the cache fits in max_bytes
+        """
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        arrays = {"frames_columns": np.array(frames_df.columns, dtype=str)}
+        for column in frames_df.columns:
+            arrays[f"frames__{column}"] = column_to_array(frames_df[column])
+        for load_case_type, cases in load_cases.items():
+            arrays[f"load_cases__{load_case_type}"] = np.array(cases, dtype=str)
+        arrays["force_frames"] = np.array(forces.index, dtype=str)
+        arrays["force_cases"] = np.array(forces.columns, dtype=str)
+        arrays["force_values"] = forces.to_numpy(dtype=float).reshape(
+            len(forces.index), len(forces.columns)
+        )
+
+        path = self.entry_path(key)
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "wb") as f:
+            np.savez_compressed(f, **arrays)
+        os.replace(tmp_path, path)
+        self.evict(keep=key)
+
+    def rename(self, old_key, new_key):
+        """
+        Moves an entry to a new key, e.g. after ETABS saves the model on exit
+        """
+        old_path = self.entry_path(old_key)
+        if old_key != new_key and old_path.exists():
+            os.replace(old_path, self.entry_path(new_key))
+
+    def evict(self, keep=None):
+        entries = sorted(
+            self.cache_dir.glob("*.npz"), key=lambda path: path.stat().st_mtime
+        )
+        total_bytes = sum(path.stat().st_size for path in entries)
+        for path in entries:
+            if total_bytes <= self.max_bytes:
+                break
+            if path.stem == keep:
+                continue
+            total_bytes -= path.stat().st_size
+            path.unlink()
@@ -0,0 +1,138 @@
+"""
+This module combines per-case column forces into factored load combinations.
+
+Forces are a frame x case table (as returned by ModelSessions.max_axial or
+extract_max_axial) and combinations are {name: {case: factor}}, e.g.
+
+    {"1.2D+1.6L": {"Dead": 1.2, "Live": 1.6}, "1.0D+0.5L": {"Dead": 1.0, "Live": 0.5}}
+
+or written out as text, "1.2 Dead + 1.6 Live". coefficient_matrix lays the
+factors out as a case x combination matrix, so combine_forces computes every
+combination of every frame with one matrix multiply.
+
+The forces are compression magnitudes (abs of the min P per case), which have
+lost their sign, so factors must not be negative: "0.9 Dead - 1.0 Wind" would
+subtract the wind compression from the dead load even where wind causes
+tension, and is rejected.
+"""
+
+import re
+import numpy as np
+import pandas as pd
+
+# a quoted case name, a sign, anything else up to the next quote or sign, or
+# a stray quote (which then fails to parse)
+combination_token = re.compile(r"\"[^\"]*\"|'[^']*'|[+-]|[^\"'+-]+|.")
+# [factor followed by a space or *] case name; unquoted names can't start with
+# a digit, so "2nd Floor" is not read as 2 x "nd Floor"
+combination_term = re.compile(
+    r"^(?:(\d*\.?\d+)(?:\s*\*\s*|\s+))?(?:\"([^\"]+)\"|'([^']+)'|([^\d.\s\"'][^\"']*))$"
+)
+
+
+def parse_combination(text) -> dict:
+    """
+    Parses "1.2 Dead + 1.6 Live" (also "1.2*Dead" or "Dead" for a factor of 1)
+    into {case: factor}. Case names may contain spaces; names that start with a
+    digit or contain + or - are quoted: "1.0 Dead + 1.0 'EQ-X'".
+    """
+    terms = [[]]
+    signs = [1.0]
+    for token in combination_token.findall(text):
+        if token in ("+", "-"):
+            terms.append([])
+            signs.append(-1.0 if token == "-" else 1.0)
+        else:
+            terms[-1].append(token)
+    combination = {}
+    for sign, term in zip(signs, terms):
+        term = "".join(term).strip()
+        if not term:
+            continue
+        match = combination_term.match(term)
+        if match is None:
+            raise ValueError(
+                f"Invalid load combination term {term!r} in {text!r}; write "
+                '"1.2 Dead" or "1.2*Dead" and quote case names that start with a '
+                "digit or contain + or -"
+            )
+        factor, *names = match.groups()
+        case = next(name for name in names if name is not None).strip()
+        combination[case] = combination.get(case, 0.0) + sign * float(factor or 1)
+    if not combination:
+        raise ValueError(f"Empty load combination {text!r}")
+    return combination
+
+
+def normalize_combinations(combinations: dict) -> dict:
+    """
+    Returns {name: {case: factor}} for combinations given as {case: factor}
+    tables or as text. Raises ValueError for negative factors, which the
+    unsigned compression forces can't carry.
+    """
+    normalized = {
+        name: (
+            parse_combination(combination)
+            if isinstance(combination, str)
+            else {case: float(factor) for case, factor in combination.items()}
+        )
+        for name, combination in combinations.items()
+    }
+    for name, combination in normalized.items():
+        negative = [case for case, factor in combination.items() if factor < 0]
+        if negative:
+            raise ValueError(
+                f"Load combination {name!r} has negative factors for {negative}; "
+                "the forces are compression magnitudes without sign, so load "
+                "cases can only be added"
+            )
+    return normalized
+
+
+def sum_combination(load_cases: list) -> dict:
+    """
+    Returns the unfactored sum of load_cases as a one entry combinations table
+    """
+    return {"+".join(load_cases): {lc: 1.0 for lc in load_cases}}
+
+
+def combination_cases(combinations: dict) -> list:
+    """
+    Returns the load cases used by combinations in order of first use
+    """
+    return list(
+        dict.fromkeys(
+            case for combination in combinations.values() for case in combination
+        )
+    )
+
+
+def coefficient_matrix(combinations: dict, load_cases=None):
+    """
+    Returns (case x combination factor matrix, its load cases). load_cases fixes
+    the row order, e.g. to the columns of a force table.
+    """
+    combinations = normalize_combinations(combinations)
+    if load_cases is None:
+        load_cases = combination_cases(combinations)
+    rows = {lc: i for i, lc in enumerate(load_cases)}
+    coefficients = np.zeros((len(load_cases), len(combinations)))
+    for j, combination in enumerate(combinations.values()):
+        for case, factor in combination.items():
+            if case not in rows:
+                raise KeyError(f"Load case {case} is not in {list(load_cases)}")
+            coefficients[rows[case], j] = factor
+    return coefficients, list(load_cases)
+
+
+def combine_forces(forces, combinations: dict):
+    """
+    Returns a frame x combination table of forces (frame x case) combined with
+    the factors of combinations
+    """
+    coefficients, load_cases = coefficient_matrix(combinations)
+    missing = [lc for lc in load_cases if lc not in forces.columns]
+    if missing:
+        raise KeyError(f"No forces for load cases {missing}")
+    combined = forces[load_cases].to_numpy(np.float64) @ coefficients
+    return pd.DataFrame(combined, index=forces.index, columns=list(combinations))
@@ -0,0 +1,95 @@
+"""
+This module converts .NET System arrays returned by the ETABS API (via pythonnet)
+into NumPy arrays.
+
+Numeric arrays are bulk copied into the NumPy buffer with Marshal.Copy and
+string arrays are joined on the .NET side and split once in Python, rather than
+iterating every element through pythonnet. System is imported on first use so
+this module can be imported (and tested) without the .NET runtime.
+"""
+
+import numpy as np
+
+numeric_dtypes = {
+    "System.Double": np.float64,
+    "System.Single": np.float32,
+    "System.Int64": np.int64,
+    "System.Int32": np.int32,
+    "System.Int16": np.int16,
+    "System.Byte": np.uint8,
+}
+string_separator = "\x1f"  # ASCII unit separator, not allowed in ETABS names
+
+System_namespace = None
+
+
+def load_System():
+    """
+    Returns (IntPtr, Int64, String, Marshal) from the .NET runtime, or None if
+    pythonnet has not been loaded
+    """
+    global System_namespace
+    if System_namespace is None:
+        try:
+            from System import IntPtr, Int64, String
+            from System.Runtime.InteropServices import Marshal
+        except ImportError:
+            return None
+        System_namespace = (IntPtr, Int64, String, Marshal)
+    return System_namespace
+
+
+def get_element_type_name(sys_array):
+    try:
+        return sys_array.GetType().GetElementType().FullName
+    except AttributeError:
+        return None
+
+
+def system_array_to_numpy(sys_array, dtype=None):
+    """
+    Converts a System.Array (or any sequence) to a 1D NumPy array.
+    System.Double/Single/Int arrays keep their native dtype unless dtype is
+    given, System.String arrays become object arrays of str.
+    """
+    if sys_array is None:
+        return np.array([], dtype=dtype or np.float64)
+    element_type = get_element_type_name(sys_array)
+    if element_type is None:  # already a Python sequence
+        return np.asarray(sys_array, dtype=dtype)
+
+    length = sys_array.Length
+    if element_type == "System.String":
+        values = system_string_array_to_numpy(sys_array, length)
+    elif element_type in numeric_dtypes:
+        values = system_numeric_array_to_numpy(
+            sys_array, length, numeric_dtypes[element_type]
+        )
+    else:
+        values = np.array(list(sys_array))
+    if dtype is not None:
+        values = values.astype(dtype, copy=False)
+    return values
+
+
+def system_numeric_array_to_numpy(sys_array, length, dtype):
+    System = load_System()
+    if System is None or length == 0:
+        return np.fromiter(sys_array, dtype=dtype, count=length)
+    IntPtr, Int64, String, Marshal = System
+    values = np.empty(length, dtype=dtype)
+    # copy the whole .NET buffer into the NumPy buffer in one call
+    Marshal.Copy(sys_array, 0, IntPtr.__overloads__[Int64](values.ctypes.data), length)
+    return values
+
+
+def system_string_array_to_numpy(sys_array, length):
+    if length == 0:
+        return np.array([], dtype=object)
+    System = load_System()
+    if System is None:
+        return np.array(list(sys_array), dtype=object)
+    IntPtr, Int64, String, Marshal = System
+    # one .NET -> Python string conversion instead of one per element
+    joined = str(String.Join(string_separator, sys_array))
+    return np.array(joined.split(string_separator), dtype=object)
@@ -0,0 +1,277 @@
+"""
+This module measures where the time of a run goes: in named pipeline stages
+and in every ETABS and RAM Concept API call.
+
+metrics_recorder routes timings to the runs in progress. Stages are timed with
+metrics_recorder.stage("name") or the @metrics_recorder.timed("name")
+decorator. API calls are timed by InstrumentedAPIObject proxies, which the
+ETABS_api and RAM_api providers put around the API objects they hand out once
+their `metrics` attribute is set to the recorder. A finished RunMetrics is
+written to JSON and summarized as a table for the log.
+
+With no run in progress a timing costs two perf_counter calls, so the
+instrumentation can stay on.
+"""
+
+import json
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from functools import wraps
+from pathlib import Path
+import numpy as np
+
+default_metrics_dir = (
+    Path(os.getenv("LOCALAPPDATA", Path.home())) / "ETABS_RAM_bridge" / "metrics"
+)
+
+
+class RunMetrics:
+    def __init__(self, name):
+        self.name = name
+        self.started = datetime.now()
+        self.start_time = time.perf_counter()
+        self.elapsed_s = None
+        self.stages = {}  # stage -> [count, total s, max s]
+        self.api_calls = {}  # "ETABS.FrameObj.GetAllFrames" -> [count, total, max]
+        self.lock = threading.Lock()
+
+    def add(self, table, name, seconds):
+        with self.lock:
+            entry = table.get(name)
+            if entry is None:
+                table[name] = [1, seconds, seconds]
+            else:
+                entry[0] += 1
+                entry[1] += seconds
+                entry[2] = max(entry[2], seconds)
+
+    def finish(self):
+        self.elapsed_s = time.perf_counter() - self.start_time
+        return self
+
+    def api_totals(self) -> dict:
+        """
+        Returns {"ETABS": [count, total s], "RAM": [count, total s]}
+        """
+        totals = {}
+        with self.lock:
+            for name, (count, total_s, max_s) in self.api_calls.items():
+                api_total = totals.setdefault(name.split(".", 1)[0], [0, 0.0])
+                api_total[0] += count
+                api_total[1] += total_s
+        return totals
+
+    def to_dict(self) -> dict:
+        def entries(table):
+            return {
+                name: {"count": count, "total_s": total_s, "max_s": max_s}
+                for name, (count, total_s, max_s) in table.items()
+            }
+
+        with self.lock:
+            stages = entries(self.stages)
+            api_calls = entries(self.api_calls)
+        return {
+            "name": self.name,
+            "started": self.started.isoformat(timespec="seconds"),
+            "elapsed_s": self.elapsed_s,
+            "stages": stages,
+            "api_totals": {
+                api: {"count": count, "total_s": total_s}
+                for api, (count, total_s) in self.api_totals().items()
+            },
+            "api_calls": api_calls,
+        }
+
+    def write(self, metrics_dir=default_metrics_dir):
+        """
+        Writes the run to <metrics_dir>/<start time>_<name>.json and returns the
+        path
+        """
+        metrics_dir = Path(metrics_dir)
+        metrics_dir.mkdir(parents=True, exist_ok=True)
+        slug = re.sub(r"\W+", "_", self.name).strip("_")
+        path = metrics_dir / f"{self.started.strftime('%Y%m%d-%H%M%S')}_{slug}.json"
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=4)
+        return path
+
+    def summary_lines(self, top_calls=5) -> list:
+        """
+        Returns the stage times, API totals and slowest API calls as table rows
+        """
+        with self.lock:
+            stages = sorted(self.stages.items(), key=lambda item: -item[1][1])
+            calls = sorted(self.api_calls.items(), key=lambda item: -item[1][1])
+        elapsed = self.elapsed_s or time.perf_counter() - self.start_time
+        lines = [f"{self.name} took {elapsed:.2f}s"]
+        lines += [f"{'stage':<32}{'count':>7}{'total s':>10}{'max s':>9}"]
+        lines += [
+            f"{stage:<32}{count:>7}{total_s:>10.3f}{max_s:>9.3f}"
+            for stage, (count, total_s, max_s) in stages
+        ]
+        lines += [
+            f"{api + ' API calls':<32}{count:>7}{total_s:>10.3f}"
+            for api, (count, total_s) in self.api_totals().items()
+        ]
+        lines += [
+            f"{name[-32:]:<32}{count:>7}{total_s:>10.3f}{max_s:>9.3f}"
+            for name, (count, total_s, max_s) in calls[:top_calls]
+        ]
+        return lines
+
+
+class MetricsRecorder:
+    def __init__(self):
+        # replaced rather than mutated, so recording reads it without the lock
+        self.runs = ()
+        self.lock = threading.Lock()
+
+    def start_run(self, name) -> RunMetrics:
+        run = RunMetrics(name)
+        with self.lock:
+            self.runs = self.runs + (run,)
+        return run
+
+    def finish_run(self, run: RunMetrics) -> RunMetrics:
+        with self.lock:
+            self.runs = tuple(r for r in self.runs if r is not run)
+        return run.finish()
+
+    def record_stage(self, stage, seconds):
+        for run in self.runs:
+            run.add(run.stages, stage, seconds)
+
+    def record_call(self, name, seconds):
+        for run in self.runs:
+            run.add(run.api_calls, name, seconds)
+
+    @contextmanager
+    def stage(self, stage):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_stage(stage, time.perf_counter() - start)
+
+    def timed(self, stage):
+        """
+        Decorator timing every call of the function as stage
+        """
+
+        def decorator(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.stage(stage):
+                    return func(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+
+metrics_recorder = MetricsRecorder()
+
+plain_types = (
+    str,
+    bytes,
+    int,
+    float,
+    complex,
+    bool,
+    type(None),
+    dict,
+    np.ndarray,
+    np.generic,
+)
+
+
+def unwrap(value):
+    if isinstance(value, InstrumentedAPIObject):
+        return object.__getattribute__(value, "_obj")
+    return value
+
+
+class InstrumentedAPIObject:
+    """
+    Forwards attribute access, calls and assignments to an API object and
+    records how long each took under "<prefix>.<name>". With deep=True (the
+    RAM Concept API, where results are further API objects) returned objects
+    are wrapped too.
+
+    The proxy passes for the object it wraps: len(), iteration, bool(), ==,
+    hash() and isinstance() are forwarded, and proxies passed back to the API
+    as arguments are unwrapped.
+    """
+
+    __slots__ = ("_obj", "_prefix", "_recorder", "_deep")
+
+    def __init__(self, obj, prefix, recorder, deep=False):
+        object.__setattr__(self, "_obj", obj)
+        object.__setattr__(self, "_prefix", prefix)
+        object.__setattr__(self, "_recorder", recorder)
+        object.__setattr__(self, "_deep", deep)
+
+    def __getattr__(self, name):
+        call_name = f"{self._prefix}.{name}"
+        start = time.perf_counter()
+        value = getattr(self._obj, name)
+        if not callable(value):
+            # properties of the RAM API are calls over the API too
+            self._recorder.record_call(call_name, time.perf_counter() - start)
+            return self._wrap(value)
+
+        def call(*args, **kwargs):
+            args = [unwrap(arg) for arg in args]
+            kwargs = {key: unwrap(value) for key, value in kwargs.items()}
+            start = time.perf_counter()
+            try:
+                return self._wrap(value(*args, **kwargs))
+            finally:
+                self._recorder.record_call(call_name, time.perf_counter() - start)
+
+        return call
+
+    def __setattr__(self, name, value):
+        start = time.perf_counter()
+        setattr(self._obj, name, unwrap(value))
+        self._recorder.record_call(
+            f"{self._prefix}.{name}=", time.perf_counter() - start
+        )
+
+    def __repr__(self):
+        return f"Instrumented({self._obj!r})"
+
+    # special methods are looked up on the type, so __getattr__ never sees them
+    @property
+    def __class__(self):
+        return type(self._obj)
+
+    def __len__(self):
+        return len(self._obj)
+
+    def __iter__(self):
+        return (self._wrap(item) for item in self._obj)
+
+    def __bool__(self):
+        return bool(self._obj)
+
+    def __eq__(self, other):
+        return self._obj == unwrap(other)
+
+    def __hash__(self):
+        return hash(self._obj)
+
+    def _wrap(self, value):
+        if not self._deep or isinstance(value, plain_types + (InstrumentedAPIObject,)):
+            return value
+        if isinstance(value, (list, tuple)):
+            return type(value)(self._wrap(item) for item in value)
+        api = self._prefix.split(".", 1)[0]
+        return InstrumentedAPIObject(
+            value, f"{api}.{type(value).__name__}", self._recorder, deep=True
+        )
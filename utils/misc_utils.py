@@ -7,6 +7,7 @@ import numpy as np
 import os
 import sys
 import pandas as pd
+from scipy.spatial import cKDTree
 
 
 def find_rotation_matrix(src_vec: list, dest_vec: list) -> list:
@@ -66,6 +67,259 @@ def convert_point_to_new_coord_system(
     return (matrix_rotation(x, y, rotation_matrix) + delta_translation).tolist()
 
 
+def transform_points(
+    points: np.ndarray, rotation_matrix: list, delta_translation: list
+) -> np.ndarray:
+    """
+    Batch version of convert_point_to_new_coord_system: rotates and translates
+    an N x 2 array of points in one matrix operation
+    """
+    points = np.asarray(points, dtype=float).reshape(-1, 2)
+    rotation_matrix = np.asarray(rotation_matrix, dtype=float)
+    return points @ rotation_matrix.T + np.asarray(delta_translation, dtype=float)
+
+
+def fit_rigid_transform(src_pts: np.ndarray, out_pts: np.ndarray) -> tuple:
+    """
+    Least squares (Kabsch) rotation matrix and translation mapping matched
+    N x 2 src_pts onto out_pts
+    """
+    src_centroid = src_pts.mean(axis=0)
+    out_centroid = out_pts.mean(axis=0)
+    H = (src_pts - src_centroid).T @ (out_pts - out_centroid)
+    U, S, Vt = np.linalg.svd(H)
+    # guard against a reflection solution
+    d = np.sign(np.linalg.det(Vt.T @ U.T))
+    rotation_matrix = Vt.T @ np.diag([1.0, d]) @ U.T
+    delta_translation = out_centroid - rotation_matrix @ src_centroid
+    return rotation_matrix, delta_translation
+
+
+def rotation_matrix_from_angle(theta: float) -> np.ndarray:
+    return np.array([[np.cos(theta), -np.sin(theta)], [np.sin(theta), np.cos(theta)]])
+
+
+def nearest_neighbour_vectors(pts: np.ndarray) -> tuple:
+    """
+    Returns length and angle of the vector from each point to its nearest
+    neighbour. Coincident points (e.g. a RAM column on a point support) are
+    counted once, so no length is 0.
+    """
+    unique_pts, inverse = np.unique(pts, axis=0, return_inverse=True)
+    if len(unique_pts) < 2:
+        raise ValueError(f"Need at least 2 distinct points, got {len(unique_pts)}")
+    inverse = inverse.reshape(-1)
+    distances, matches = cKDTree(unique_pts).query(unique_pts, k=2)
+    vectors = unique_pts[matches[:, 1]] - unique_pts
+    angles = np.arctan2(vectors[:, 1], vectors[:, 0])
+    return distances[inverse, 1], angles[inverse]
+
+
+def estimate_rotations(
+    src_pts, out_pts, num_candidates=4, bin_degrees=1.0, sample_size=200
+) -> list:
+    """
+    Vote for the rotation between two point sets without known pairs: points
+    whose nearest neighbour distance agrees vote with the angle between their
+    nearest neighbour vectors. Returns the num_candidates strongest angles.
+    """
+    src_lengths, src_angles = nearest_neighbour_vectors(src_pts)
+    out_lengths, out_angles = nearest_neighbour_vectors(out_pts)
+    order = np.argsort(out_lengths)
+    out_lengths, out_angles = out_lengths[order], out_angles[order]
+
+    sample = np.linspace(0, len(src_pts) - 1, min(sample_size, len(src_pts)))
+    votes = []
+    for i in sample.astype(int):
+        lo, hi = np.searchsorted(
+            out_lengths, [0.99 * src_lengths[i], 1.01 * src_lengths[i]]
+        )
+        votes.append(out_angles[lo:hi] - src_angles[i])
+    votes = np.mod(np.concatenate(votes), 2 * np.pi)
+
+    num_bins = int(round(360 / bin_degrees))
+    counts, edges = np.histogram(votes, bins=num_bins, range=(0, 2 * np.pi))
+    rotations = []
+    for peak in np.argsort(counts)[::-1][: 4 * num_candidates]:
+        if counts[peak] == 0 or len(rotations) == num_candidates:
+            break
+        # refine with the circular mean of the votes around the peak
+        center = (edges[peak] + edges[peak + 1]) / 2
+        offsets = np.angle(np.exp(1j * (votes - center)))
+        near = np.abs(offsets) <= np.radians(1.5 * bin_degrees)
+        theta = center + offsets[near].mean()
+        if all(
+            abs(np.angle(np.exp(1j * (theta - other)))) > np.radians(2 * bin_degrees)
+            for other in rotations
+        ):
+            rotations.append(theta)
+    return rotations or [0.0]
+
+
+def estimate_translation(rotated_src_pts, out_pts, resolution, sample_size=100):
+    """
+    Vote for the translation between rotated_src_pts and out_pts: the offsets
+    from a sample of source points to every out point pile up at the true
+    translation
+    """
+    sample = np.linspace(
+        0, len(rotated_src_pts) - 1, min(sample_size, len(rotated_src_pts))
+    ).astype(int)
+    offsets = (out_pts[None, :, :] - rotated_src_pts[sample][:, None, :]).reshape(-1, 2)
+    cells = np.round(offsets / resolution).astype(np.int64)
+    cells -= cells.min(axis=0)
+    # flatten 2D cells to one integer key so counting is a 1D sort
+    keys = cells[:, 0] * (cells[:, 1].max() + 1) + cells[:, 1]
+    unique_keys, first, counts = np.unique(keys, return_index=True, return_counts=True)
+    best_cell = np.round(offsets[first[counts.argmax()]] / resolution) * resolution
+    near = np.linalg.norm(offsets - best_cell, axis=1) <= 1.5 * resolution
+    return offsets[near].mean(axis=0)
+
+
+def auto_calibrate(
+    src_pts, out_pts, initial_transform=None, max_iterations=50, tolerance=1e-6
+) -> tuple:
+    """
+    Find the rigid transform aligning src_pts (e.g. ETABS columns of a level)
+    with out_pts (e.g. RAM columns and supports) without known point pairs.
+
+    Starting guesses come from initial_transform (rotation_matrix,
+    delta_translation) if given, otherwise from estimate_rotations and
+    estimate_translation. Each guess is refined by iterative closest point:
+    points are matched to their nearest neighbour with a KD-tree, outlier pairs
+    are dropped and the transform is refit with fit_rigid_transform until it
+    converges. The guess matching the most points wins.
+
+    Returns rotation_matrix, delta_translation and the per point residual
+    (distance from each transformed src point to its nearest out point).
+    """
+    src_pts = np.asarray(src_pts, dtype=float).reshape(-1, 2)
+    out_pts = np.asarray(out_pts, dtype=float).reshape(-1, 2)
+    for name, pts in [("source", src_pts), ("target", out_pts)]:
+        if len(np.unique(pts, axis=0)) < 2:
+            raise ValueError(
+                f"Auto calibration needs at least 2 distinct {name} points, "
+                f"got {len(np.unique(pts, axis=0))}"
+            )
+    tree = cKDTree(out_pts)
+    spacing = np.median(nearest_neighbour_vectors(out_pts)[0])
+    match_tolerance = spacing / 4
+
+    if initial_transform is not None:
+        rotation_matrix, delta_translation = initial_transform
+        initial_transforms = [
+            (np.asarray(rotation_matrix, float), np.asarray(delta_translation, float))
+        ]
+    else:
+        initial_transforms = []
+        for theta in estimate_rotations(src_pts, out_pts):
+            rotation_matrix = rotation_matrix_from_angle(theta)
+            delta_translation = estimate_translation(
+                transform_points(src_pts, rotation_matrix, [0, 0]),
+                out_pts,
+                resolution=match_tolerance,
+            )
+            initial_transforms.append((rotation_matrix, delta_translation))
+
+    best = None
+    for rotation_matrix, delta_translation in initial_transforms:
+        previous_error = np.inf
+        for _ in range(max_iterations):
+            distances, matches = tree.query(
+                transform_points(src_pts, rotation_matrix, delta_translation)
+            )
+            # drop pairs far worse than typical, e.g. columns missing in RAM
+            keep = distances <= max(3 * np.median(distances), tolerance)
+            rotation_matrix, delta_translation = fit_rigid_transform(
+                src_pts[keep], out_pts[matches[keep]]
+            )
+            error = distances[keep].mean()
+            if previous_error - error < tolerance:
+                break
+            previous_error = error
+
+        residuals, _ = tree.query(
+            transform_points(src_pts, rotation_matrix, delta_translation)
+        )
+        score = (np.sum(residuals <= match_tolerance), -np.median(residuals))
+        if best is None or score > best[0]:
+            best = (score, rotation_matrix, delta_translation, residuals)
+    return best[1:]
+
+
+def match_points_by_location(old_pts, new_pts, tolerance: float) -> tuple:
+    """
+    Pair up two point sets by location with a spatial hash (grid of cells the
+    size of tolerance). Each new point is matched to the nearest unmatched old
+    point within tolerance.
+
+    Returns (matched_old, matched_new, unmatched_old, unmatched_new) index arrays.
+    """
+    old_pts = np.asarray(old_pts, dtype=float).reshape(-1, 2)
+    new_pts = np.asarray(new_pts, dtype=float).reshape(-1, 2)
+    spatial_hash = {}
+    for i, cell in enumerate(
+        map(tuple, np.floor(old_pts / tolerance).astype(np.int64))
+    ):
+        spatial_hash.setdefault(cell, []).append(i)
+
+    is_matched_old = np.zeros(len(old_pts), dtype=bool)
+    matched_old, matched_new = [], []
+    new_cells = np.floor(new_pts / tolerance).astype(np.int64)
+    for j, (cx, cy) in enumerate(new_cells):
+        candidates = [
+            i
+            for dx in (-1, 0, 1)
+            for dy in (-1, 0, 1)
+            for i in spatial_hash.get((cx + dx, cy + dy), [])
+            if not is_matched_old[i]
+        ]
+        if not candidates:
+            continue
+        distances = np.linalg.norm(old_pts[candidates] - new_pts[j], axis=1)
+        nearest = distances.argmin()
+        if distances[nearest] <= tolerance:
+            is_matched_old[candidates[nearest]] = True
+            matched_old.append(candidates[nearest])
+            matched_new.append(j)
+
+    is_matched_new = np.zeros(len(new_pts), dtype=bool)
+    is_matched_new[matched_new] = True
+    return (
+        np.array(matched_old, dtype=int),
+        np.array(matched_new, dtype=int),
+        np.flatnonzero(~is_matched_old),
+        np.flatnonzero(~is_matched_new),
+    )
+
+
+def distribute_along_segments(
+    start_pts: np.ndarray, end_pts: np.ndarray, spacing: float
+) -> tuple:
+    """
+    Spreads a load along each of N segments (e.g. wall footprints) as point
+    loads no more than spacing apart, ends included. Points get tributary
+    shares (half at the ends), so they add up to 1 per segment and act like a
+    uniform line load.
+
+    Returns (M x 2 points, segment of each point, share of each point) for all
+    segments at once.
+    """
+    start_pts = np.asarray(start_pts, dtype=float).reshape(-1, 2)
+    end_pts = np.asarray(end_pts, dtype=float).reshape(-1, 2)
+    lengths = np.linalg.norm(end_pts - start_pts, axis=1)
+    intervals = np.maximum(1, np.ceil(lengths / spacing).astype(np.int64))
+    counts = intervals + 1
+    segment = np.repeat(np.arange(len(start_pts)), counts)
+    first = np.repeat(np.cumsum(counts) - counts, counts)
+    step = np.arange(counts.sum()) - first
+    t = step / intervals[segment]
+    points = start_pts[segment] + t[:, None] * (end_pts - start_pts)[segment]
+    is_end = (step == 0) | (step == intervals[segment])
+    shares = np.where(is_end, 0.5, 1.0) / intervals[segment]
+    return points, segment, shares
+
+
 def resource_path(relative_path: str) -> str:
     """Get absolute path to resource, works for dev and for PyInstaller."""
     try:
@@ -0,0 +1,657 @@
+"""
+This module runs the ETABS to RAM Concept load transfer pipeline without the GUI.
+
+A job file (JSON or TOML) lists the ETABS model and the transfers to make:
+
+    ETABS_model = "C:/models/tower.EDB"
+    RAM_model = "C:/models/podium.cpt"      # default for every transfer
+    calibration = "auto"                    # default for every transfer
+
+    [[transfers]]
+    level = "Level_2"
+    RAM_layer = "Other Dead Loading"
+    load_cases = ["Dead", "S Dead"]
+    sync = true
+
+A transfer writes the sum of its load_cases to RAM_layer. Factored load
+combinations can be written instead, each to its own layer:
+
+    [load_combinations]                     # for every transfer
+    "1.2D+1.6L" = "1.2 Dead + 1.6 Live"
+    "1.0D+0.5L" = {Dead = 1.0, Live = 0.5}
+
+    [[transfers]]
+    level = "Level_3"
+    combinations = {"1.2D+1.6L" = "Factored Loading", "1.0D+0.5L" = "Service Loading"}
+
+A combination name that is not defined in load_combinations is parsed as the
+combination itself (see combination_utils).
+
+    envelope = "envelope.csv"
+
+writes the signed max/min of P, V2, V3, T, M2 and M3 of every column of the
+job's levels (see ETABS_utils.reduce_force_envelope), taken from the same
+sweep as the loads.
+
+    piers = true                            # per transfer or for every transfer
+    pier_spacing = 24.0                     # in, default 24
+
+adds the level's pier (shear wall) loads to its column loads. The max
+compression at the bottom of each pier is combined like a column's, shared
+between the pier's wall legs (the area objects carrying its label, so L, C and
+box cores keep their shape) by plan length, and spread along each leg as point
+loads no more than pier_spacing apart (see
+misc_utils.distribute_along_segments), so columns and walls reach each layer in
+one bulk write. The forces of every pier on every story come from one PierForce
+call.
+Calibration is "auto" (match the level's columns to the RAM columns and
+supports), a table of point pairs ({"ETABS point 1" = [x, y], "RAM point 1" =
+[x, y], "ETABS point 2" = ..., "RAM point 2" = ...}) or omitted to use the
+ETABS coordinates as they are. ETABS and RAM Concept are started once and
+kept open for all transfers, and the forces of every level in the job are
+extracted in one sweep before the transfers run. A failed transfer is
+recorded in the summary and the job moves on to the next one.
+"""
+
+import json
+import time
+import tomllib
+from datetime import datetime
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+from .ETABS_utils import *
+from .RAM_utils import *
+from .misc_utils import (
+    calibrate,
+    auto_calibrate,
+    distribute_along_segments,
+    transform_points,
+)
+from .combination_utils import (
+    combination_cases,
+    combine_forces,
+    normalize_combinations,
+    parse_combination,
+    sum_combination,
+)
+from .metrics_utils import metrics_recorder
+
+ETABS_group_prefix = "ETABS_to_RAM_"  # prefix of the temporary per-level groups
+default_pier_spacing = 24.0  # in, between the point loads of a wall
+
+
+def load_job_file(path) -> dict:
+    """
+    Reads a .json or .toml job file. Relative model paths are resolved against
+    the job file's folder.
+    """
+    path = Path(path)
+    if path.suffix.lower() == ".toml":
+        with open(path, "rb") as f:
+            job = tomllib.load(f)
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            job = json.load(f)
+
+    def resolve(model_path):
+        return str((path.parent / model_path).resolve())
+
+    job["ETABS_model"] = resolve(job["ETABS_model"])
+    if "envelope" in job:
+        job["envelope"] = resolve(job["envelope"])
+    if "RAM_model" in job:
+        job["RAM_model"] = resolve(job["RAM_model"])
+    for transfer in job.get("transfers", []):
+        if "RAM_model" in transfer:
+            transfer["RAM_model"] = resolve(transfer["RAM_model"])
+    return job
+
+
+def model_file_state(path):
+    """
+    Returns (path, size, mtime) of a model file, to tell whether it changed on
+    disk since it was opened
+    """
+    try:
+        stat = Path(path).stat()
+    except OSError:
+        return (str(path), None, None)
+    return (str(path), stat.st_size, stat.st_mtime_ns)
+
+
+def get_levels_positions(story_index: dict, levels: list) -> np.ndarray:
+    """
+    Returns the cols_df row positions of the columns of all levels, level by
+    level
+    """
+    return np.concatenate([story_index[level] for level in levels])
+
+
+def levels_group(SapModel, levels: list, frame_objs: list):
+    """
+    Returns a with block context holding frame_objs, the columns of levels, in
+    a temporary ETABS group (see temporary_frame_group). It yields the group
+    name, or None if ETABS rejected the group and forces are queried frame by
+    frame.
+    """
+    if len(levels) == 1:
+        group_name = f"{ETABS_group_prefix}{levels[0]}"
+    else:
+        group_name = f"{ETABS_group_prefix}{len(levels)}_levels"
+    return temporary_frame_group(SapModel, group_name, frame_objs)
+
+
+def extract_levels_max_axial(
+    SapModel,
+    cols_df,
+    forces,
+    positions,
+    load_cases: list,
+    group_name=None,
+    backend="FrameForce",
+    reporter=None,
+):
+    """
+    Fills forces (a frame x case table whose rows line up with cols_df) at
+    positions for every case in load_cases. Cases missing for any of those rows
+    are extracted for all of them in one sweep.
+
+    Returns the list of extracted cases ([] if all were already there) or False
+    if ETABS returned no results.
+    """
+    missing_cases = [
+        lc
+        for lc in load_cases
+        if lc not in forces.columns or forces[lc].iloc[positions].isna().any()
+    ]
+    if not missing_cases:
+        return []
+    P_max_df = extract_max_axial(
+        SapModel,
+        cols_df["MyNames"].iloc[positions].to_list(),
+        missing_cases,
+        group_name=group_name,
+        backend=backend,
+        reporter=reporter,
+    )
+    if P_max_df is False:
+        return False
+    set_levels_forces(forces, positions, P_max_df, missing_cases)
+    return missing_cases
+
+
+def set_levels_forces(forces, positions, P_max_df, load_cases: list):
+    """
+    Writes the load_cases columns of P_max_df (rows as positions) to forces
+    """
+    for lc in load_cases:
+        if lc not in forces.columns:
+            forces[lc] = np.nan
+        forces.iloc[positions, forces.columns.get_loc(lc)] = P_max_df[lc].to_numpy()
+
+
+class ModelSessions:
+    """
+    Starts ETABS and RAM Concept on first use and keeps them (and every opened
+    RAM model) open until close(). open_ETABS_model switches to another EDB in
+    the running ETABS instance, so the sessions can be reused across jobs.
+    Either model is reopened when its file changed on disk, and
+    save_RAM_models saves only the RAM models used since the last save.
+    """
+
+    def __init__(self, ETABS_model_path, force_backend="FrameForce", log=print):
+        self.ETABS_model_path = ETABS_model_path
+        self.force_backend = force_backend
+        self.log = log
+        self.SapModel = None
+        self.ETABSObject = None
+        self.opened_ETABS_model = None  # (path, size, mtime) of the open EDB
+        self.cols_df = None
+        self.story_index = {}
+        self.forces = None  # frame x case max compression, rows as cols_df
+        self.pier_footprints = None  # (story, pier) wall legs
+        self.pier_forces = None  # (story, pier) x case max compression
+        self.concept = None
+        self.RAM_models = {}  # path -> (model, cad_manager, layer registry)
+        self.RAM_model_states = {}  # path -> file state when opened or saved
+        self.touched_RAM_models = []  # paths used since the last save
+
+    def open_ETABS_model(self, ETABS_model_path):
+        """
+        Makes ETABS_model_path the model used by the next ETABS() call
+        """
+        self.ETABS_model_path = ETABS_model_path
+
+    def ETABS_model_state(self):
+        return model_file_state(self.ETABS_model_path)
+
+    @metrics_recorder.timed("ETABS start-up and analysis")
+    def ETABS(self, load_cases=None):
+        """
+        Returns SapModel, starting ETABS on first use and opening and analyzing
+        the ETABS model whenever it is not the one already open (or its file
+        changed since). With load_cases, the model is only analyzed if one of
+        them has no results.
+        """
+        if self.SapModel is None:
+            self.log("Starting ETABS")
+            self.SapModel, self.ETABSObject = initalize_SapModel()
+        if self.opened_ETABS_model != self.ETABS_model_state():
+            self.log(f"Opening ETABS model at: {self.ETABS_model_path}")
+            open_ETABS_file(self.SapModel, self.ETABS_model_path)
+            self.cols_df = find_columns(
+                get_all_frame_elements(self.SapModel, lean=True)
+            )
+            self.story_index = build_story_index(self.cols_df)
+            self.forces = pd.DataFrame(index=self.cols_df["MyNames"].astype(str))
+            self.pier_footprints = self.pier_forces = None
+            lb_in_F = 1
+            set_units(self.SapModel, unit_enum=lb_in_F)
+            run_ETABS_analysis(self.SapModel, self.cols_df, load_cases, self.log)
+            self.log("ETABS analysis complete")
+            # ETABS saves the model before analyzing, so record it afterwards
+            self.opened_ETABS_model = self.ETABS_model_state()
+        return self.SapModel
+
+    def max_axial(self, levels: list, load_cases: list, reporter=None):
+        """
+        Returns {level: frame x case max compression} for levels, extracting any
+        missing forces of all levels in one sweep
+        """
+        SapModel = self.ETABS(load_cases)
+        unknown_levels = [level for level in levels if level not in self.story_index]
+        if unknown_levels:
+            raise KeyError(f"ETABS model has no levels {unknown_levels}")
+        positions = get_levels_positions(self.story_index, levels)
+        frames = self.cols_df["MyNames"].iloc[positions].to_list()
+        with metrics_recorder.stage("ETABS force sweep"), levels_group(
+            SapModel, levels, frames
+        ) as group_name:
+            extracted = extract_levels_max_axial(
+                SapModel,
+                self.cols_df,
+                self.forces,
+                positions,
+                load_cases,
+                group_name=group_name,
+                backend=self.force_backend,
+                reporter=reporter,
+            )
+        if extracted is False:
+            raise ValueError(f"ETABS returned no results for load cases: {load_cases}")
+        if extracted:
+            self.log(f"Extracted {extracted} for {len(levels)} level(s) in one sweep")
+        return {
+            level: self.forces.iloc[self.story_index[level]][list(load_cases)]
+            for level in levels
+        }
+
+    def force_envelope(self, levels: list, load_cases: list, reporter=None):
+        """
+        Returns the force envelope table of the columns of levels for
+        load_cases (see extract_force_envelope). The max compression of the
+        same sweep is kept, so max_axial needs no sweep for these levels.
+        """
+        SapModel = self.ETABS(load_cases)
+        unknown_levels = [level for level in levels if level not in self.story_index]
+        if unknown_levels:
+            raise KeyError(f"ETABS model has no levels {unknown_levels}")
+        positions = get_levels_positions(self.story_index, levels)
+        frames = self.cols_df["MyNames"].iloc[positions].to_list()
+        with metrics_recorder.stage("ETABS force sweep"), levels_group(
+            SapModel, levels, frames
+        ) as group_name:
+            envelope = extract_force_envelope(
+                SapModel,
+                frames,
+                load_cases,
+                group_name=group_name,
+                backend=self.force_backend,
+                reporter=reporter,
+                reversed_frames=reversed_columns(self.cols_df.iloc[positions]),
+            )
+        if envelope is False:
+            raise ValueError(f"ETABS returned no results for load cases: {load_cases}")
+        set_levels_forces(
+            self.forces,
+            positions,
+            envelope_max_axial(envelope, frames, load_cases),
+            load_cases,
+        )
+        self.log(f"Extracted the force envelope of {len(levels)} level(s)")
+        return envelope
+
+    def pier_max_axial(self, load_cases: list):
+        """
+        Returns the (story, pier) x case max compression of every pier on every
+        story, extracting any missing cases in one PierForce call
+        """
+        SapModel = self.ETABS(load_cases)
+        missing = [
+            lc
+            for lc in load_cases
+            if self.pier_forces is None or lc not in self.pier_forces.columns
+        ]
+        if missing:
+            with metrics_recorder.stage("ETABS pier force sweep"):
+                P_max_df = extract_pier_max_axial(SapModel, missing)
+            if P_max_df is False:
+                raise ValueError(
+                    f"ETABS returned no pier results for load cases: {missing}"
+                )
+            if self.pier_forces is None:
+                self.pier_forces = P_max_df
+            else:
+                self.pier_forces = self.pier_forces.join(P_max_df, how="outer")
+            self.log(f"Extracted {missing} for {len(P_max_df)} piers in one sweep")
+        return self.pier_forces[list(load_cases)]
+
+    def piers(self, level, load_cases: list):
+        """
+        Returns (wall legs, pier x case max compression) of the piers of level,
+        one row per leg, rows aligned. The legs' Share column is each leg's
+        share of its pier's load. Both are empty if the level has no piers.
+        """
+        SapModel = self.ETABS(load_cases)
+        if self.pier_footprints is None:
+            self.pier_footprints = get_pier_footprints(SapModel)
+            if self.pier_footprints is None:
+                self.pier_footprints = pd.DataFrame(
+                    columns=["AreaName", "X1", "Y1", "X2", "Y2", "Length"],
+                    index=pd.MultiIndex.from_arrays(
+                        [[], []], names=["StoryName", "PierName"]
+                    ),
+                )
+        stories = self.pier_footprints.index.get_level_values("StoryName")
+        footprints = self.pier_footprints[stories == level]
+        if footprints.empty:
+            return footprints.assign(Share=np.empty(0)), pd.DataFrame(
+                index=footprints.index, columns=list(load_cases), dtype=float
+            )
+        P_max_df = self.pier_max_axial(load_cases).reindex(footprints.index)
+        unloaded = P_max_df.index[P_max_df.isna().any(axis=1)]
+        if len(unloaded):
+            raise ValueError(f"ETABS returned no forces for piers {list(unloaded)}")
+        pier_length = footprints.groupby(level=[0, 1])["Length"].transform("sum")
+        return footprints.assign(Share=footprints["Length"] / pier_length), P_max_df
+
+    @metrics_recorder.timed("RAM start-up")
+    def RAM(self, RAM_model_path):
+        """
+        Returns (model, cad_manager, layer registry) for RAM_model_path, starting
+        RAM Concept and opening the file on first use or when it changed on
+        disk since
+        """
+        opened_state = self.RAM_model_states.get(RAM_model_path)
+        if opened_state is not None and opened_state != model_file_state(
+            RAM_model_path
+        ):
+            self.log(f"RAM model changed on disk, reopening: {RAM_model_path}")
+            del self.RAM_models[RAM_model_path], self.RAM_model_states[RAM_model_path]
+        if RAM_model_path not in self.RAM_models:
+            self.log(f"Opening RAM model at: {RAM_model_path}")
+            if self.concept is None:
+                self.concept, model, cad_manager = start_concept_and_open_model(
+                    RAM_model_path
+                )
+            else:
+                model = self.concept.open_file(RAM_model_path)
+                cad_manager = model.cad_manager
+            set_units_to_US(model)
+            self.RAM_models[RAM_model_path] = (
+                model,
+                cad_manager,
+                LoadingLayerRegistry(cad_manager),
+            )
+            self.RAM_model_states[RAM_model_path] = model_file_state(RAM_model_path)
+        if RAM_model_path not in self.touched_RAM_models:
+            self.touched_RAM_models.append(RAM_model_path)
+        return self.RAM_models[RAM_model_path]
+
+    @metrics_recorder.timed("RAM save")
+    def save_RAM_models(self):
+        """
+        Saves the RAM models used since the last save; models other jobs opened
+        are left as they are on disk
+        """
+        for path in self.touched_RAM_models:
+            model, cad_manager, registry = self.RAM_models[path]
+            model.save_file(path)
+            self.RAM_model_states[path] = model_file_state(path)
+            self.log(f"Saved RAM model: {path}")
+        self.touched_RAM_models = []
+
+    def close(self):
+        if self.ETABSObject or self.SapModel:
+            exit_ETABS(self.ETABSObject)
+            clean_up_ETABS(self.ETABSObject, self.SapModel)
+        if self.concept:
+            self.concept.shut_down()
+        # the next ETABS()/RAM() call starts fresh instances
+        self.SapModel = self.ETABSObject = self.opened_ETABS_model = None
+        self.concept = None
+        self.RAM_models = {}
+        self.RAM_model_states = {}
+        self.touched_RAM_models = []
+
+
+def calibrate_level(level_df, calibration, cad_manager):
+    """
+    Returns (rotation_matrix, delta_translation, residuals or None) for the
+    calibration entry of a transfer
+    """
+    if calibration is None:
+        return np.eye(2), np.zeros(2), None
+    if calibration == "auto":
+        return auto_calibrate(
+            level_df[["Point1X", "Point1Y"]].to_numpy(),
+            get_column_and_support_locations(cad_manager),
+        )
+    rotation_matrix, delta_translation = calibrate(
+        calibration["ETABS point 1"],
+        calibration["ETABS point 2"],
+        calibration["RAM point 1"],
+        calibration["RAM point 2"],
+    )
+    return rotation_matrix, delta_translation, None
+
+
+def transfer_combinations(transfer: dict):
+    """
+    Returns ({name: {case: factor}}, {name: RAM layer}) for a transfer: its
+    combinations, or the sum of its load_cases written to its RAM_layer
+    """
+    if "combinations" not in transfer:
+        combinations = sum_combination(list(transfer["load_cases"]))
+        return combinations, {name: transfer["RAM_layer"] for name in combinations}
+    definitions = normalize_combinations(transfer.get("load_combinations") or {})
+    combinations = {
+        name: definitions[name] if name in definitions else parse_combination(name)
+        for name in transfer["combinations"]
+    }
+    return combinations, dict(transfer["combinations"])
+
+
+def transfer_load_cases(transfer: dict) -> list:
+    return combination_cases(transfer_combinations(transfer)[0])
+
+
+def run_transfer(sessions: ModelSessions, transfer: dict, reporter=None) -> dict:
+    """
+    Extracts the level's column (and with piers, wall) loads from ETABS and
+    writes each combination to its RAM layer. Returns the transfer's summary
+    entry.
+    """
+    level = transfer["level"]
+    combinations, layers = transfer_combinations(transfer)
+    load_cases = combination_cases(combinations)
+    P_max_df = sessions.max_axial([level], load_cases, reporter=reporter)[level]
+    level_df = select_story(sessions.cols_df, sessions.story_index, level)
+    # every combination of every column in one matrix multiply
+    loads_df = combine_forces(P_max_df, combinations)
+    ETABS_pts = level_df[["Point1X", "Point1Y"]].to_numpy()
+    summary = {"columns": len(level_df)}
+    if transfer.get("piers", False):
+        legs, pier_P_max_df = sessions.piers(level, load_cases)
+        pier_pts, leg, shares = distribute_along_segments(
+            legs[["X1", "Y1"]].to_numpy(np.float64),
+            legs[["X2", "Y2"]].to_numpy(np.float64),
+            transfer.get("pier_spacing", default_pier_spacing),
+        )
+        # each point's share of its leg times the leg's share of its pier
+        shares = shares * legs["Share"].to_numpy(np.float64)[leg]
+        pier_loads_df = (
+            combine_forces(pier_P_max_df, combinations).iloc[leg] * shares[:, None]
+        )
+        ETABS_pts = np.vstack([ETABS_pts, pier_pts])
+        loads_df = pd.concat([loads_df, pier_loads_df], ignore_index=True)
+        summary["piers"] = legs.index.nunique()
+        summary["pier_legs"] = len(legs)
+        summary["pier_points"] = len(pier_pts)
+
+    model, cad_manager, registry = sessions.RAM(transfer["RAM_model"])
+    with metrics_recorder.stage("Calibration"):
+        rotation_matrix, delta_translation, residuals = calibrate_level(
+            level_df, transfer.get("calibration"), cad_manager
+        )
+    RAM_pts = transform_points(ETABS_pts, rotation_matrix, delta_translation)
+    if residuals is not None:
+        summary["median_residual_in"] = float(np.median(residuals))
+        summary["max_residual_in"] = float(np.max(residuals))
+
+    combination_summaries = {}
+    for name, RAM_layer in layers.items():
+        loads = loads_df[name].to_list()
+        combination_summary = {
+            "RAM_layer": RAM_layer,
+            "total_load_lb": float(np.sum(loads)),
+        }
+        with metrics_recorder.stage("RAM load write"):
+            if transfer.get("sync", False):
+                combination_summary["sync_counts"] = sync_axial_loads_to_loading_layer(
+                    cad_manager,
+                    RAM_layer,
+                    RAM_pts[:, 0],
+                    RAM_pts[:, 1],
+                    loads,
+                    registry=registry,
+                )
+            else:
+                add_axial_loads_to_loading_layer(
+                    cad_manager,
+                    RAM_layer,
+                    RAM_pts[:, 0].tolist(),
+                    RAM_pts[:, 1].tolist(),
+                    loads,
+                    registry=registry,
+                )
+        combination_summaries[name] = combination_summary
+    if "combinations" in transfer:
+        summary["combinations"] = combination_summaries
+    else:
+        (combination_summary,) = combination_summaries.values()
+        del combination_summary["RAM_layer"]
+        summary.update(combination_summary)
+    return summary
+
+
+def run_job(job: dict, log=print, sessions=None, close=True) -> dict:
+    """
+    Runs every transfer of a job and returns a JSON serializable summary.
+    With close=False the sessions are left open for the next job.
+    """
+    started = time.perf_counter()
+    summary = {
+        "ETABS_model": job["ETABS_model"],
+        "started": datetime.now().isoformat(timespec="seconds"),
+        "transfers": [],
+    }
+    force_backend = job.get("ETABS_force_backend", "FrameForce")
+    if sessions is None:
+        sessions = ModelSessions(job["ETABS_model"], force_backend, log=log)
+    else:
+        sessions.open_ETABS_model(job["ETABS_model"])
+        sessions.force_backend = force_backend
+    try:
+        transfers = job.get("transfers", [])
+        try:
+            # one sweep for every level and case in the job; transfers then
+            # read their slice from memory
+            load_cases = list(
+                dict.fromkeys(
+                    lc
+                    for t in transfers
+                    for lc in transfer_load_cases(
+                        {"load_combinations": job.get("load_combinations"), **t}
+                    )
+                )
+            )
+            sessions.ETABS(load_cases)
+            levels = [
+                level
+                for level in dict.fromkeys(t["level"] for t in transfers)
+                if level in sessions.story_index
+            ]
+            if levels and job.get("envelope"):
+                envelope = sessions.force_envelope(levels, load_cases)
+                envelope.to_csv(job["envelope"], index=False)
+                summary["envelope"] = job["envelope"]
+                summary["max_column_tension_lb"] = max(
+                    float(envelope["P_max"].max()), 0.0
+                )
+                log(f"Force envelope written to {job['envelope']}")
+            elif levels:
+                sessions.max_axial(levels, load_cases)
+            if any(t.get("piers", job.get("piers")) for t in transfers):
+                # footprints first, so a model without piers is not swept
+                for level in levels:
+                    sessions.piers(level, load_cases)
+        except Exception as e:
+            log(f"Combined extraction failed, extracting per transfer: {e}")
+        for transfer in transfers:
+            transfer = {
+                "RAM_model": job.get("RAM_model"),
+                "calibration": job.get("calibration"),
+                "load_combinations": job.get("load_combinations"),
+                "piers": job.get("piers", False),
+                "pier_spacing": job.get("pier_spacing", default_pier_spacing),
+                **transfer,
+            }
+            entry = {
+                "level": transfer.get("level"),
+                "RAM_model": transfer["RAM_model"],
+                "RAM_layer": transfer.get("RAM_layer"),
+                "load_cases": transfer.get("load_cases"),
+            }
+            transfer_started = time.perf_counter()
+            if "combinations" in transfer:
+                RAM_layers = list(dict(transfer["combinations"]).values())
+            else:
+                RAM_layers = entry["RAM_layer"]
+            log(f"Transferring {entry['level']} loads to {RAM_layers}")
+            try:
+                entry.update(run_transfer(sessions, transfer))
+                entry["status"] = "ok"
+            except Exception as e:
+                entry["status"] = "failed"
+                entry["error"] = f"{type(e).__name__}: {e}"
+                log(f"Transfer of {entry['level']} failed: {entry['error']}")
+            entry["elapsed_s"] = round(time.perf_counter() - transfer_started, 3)
+            summary["transfers"].append(entry)
+        sessions.save_RAM_models()
+    finally:
+        if close:
+            sessions.close()
+
+    statuses = [entry["status"] for entry in summary["transfers"]]
+    summary["ok"] = statuses.count("ok")
+    summary["failed"] = statuses.count("failed")
+    summary["elapsed_s"] = round(time.perf_counter() - started, 3)
+    return summary
+
+
+def write_summary(summary: dict, path):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=4)
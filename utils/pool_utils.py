@@ -0,0 +1,162 @@
+"""
+This module extracts column forces from several ETABS models side by side.
+
+run_model_study hands one task per EDB model to a pool of worker processes.
+Each task starts its own ETABS instance, opens the model, runs the analysis if
+needed, extracts the max compression of every column for the load cases and
+exits ETABS again, so at most `workers` ETABS processes run at once. The
+per-model tables are collected into one table with a model column; a model that
+fails is recorded and the others carry on.
+
+The "fake" backend generates a synthetic model from the model path instead of
+starting ETABS, so the scheduling can be run and tested without ETABS.
+"""
+
+import hashlib
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+import pandas as pd
+
+from .api_providers import ETABS_api
+from .ETABS_utils import *
+from .pipeline_utils import ETABS_group_prefix
+
+default_pool_workers = 2  # each worker holds an ETABS license while it runs
+study_columns = ["model", "MyNames", "StoryName", "Point1X", "Point1Y"]
+
+
+def model_forces_table(model_path, cols_df, P_max_df, load_cases: list):
+    """
+    Returns one row per column of the model with its max compression per case
+    """
+    table = pd.DataFrame(
+        {
+            "model": str(model_path),
+            "MyNames": cols_df["MyNames"].astype(str).to_numpy(),
+            "StoryName": cols_df["StoryName"].astype(str).to_numpy(),
+            "Point1X": cols_df["Point1X"].to_numpy(np.float64),
+            "Point1Y": cols_df["Point1Y"].to_numpy(np.float64),
+        }
+    )
+    for lc in load_cases:
+        table[lc] = P_max_df[lc].to_numpy(np.float64)
+    return table
+
+
+def extract_model_forces(
+    model_path, load_cases: list, force_backend="FrameForce", config_path="config.json"
+):
+    """
+    Opens model_path in a new ETABS instance and returns its column forces table
+    (see model_forces_table). Runs in a worker process.
+    """
+    # worker processes do not share the GUI's provider, so nobody can be prompted
+    ETABS_api.config_path = config_path
+    if ETABS_api.dll_path is None and not ETABS_api.resolve_paths(prompt=False):
+        raise ImportError(f"ETABS API paths are missing from {config_path}")
+
+    SapModel, ETABSObject = initalize_SapModel()
+    try:
+        if not open_ETABS_file(SapModel, str(model_path)):
+            raise FileNotFoundError(f"ETABS could not open {model_path}")
+        cols_df = find_columns(get_all_frame_elements(SapModel, lean=True))
+        lb_in_F = 1
+        set_units(SapModel, unit_enum=lb_in_F)
+        run_ETABS_analysis(SapModel, cols_df, load_cases)
+        frames = cols_df["MyNames"].to_list()
+        with temporary_frame_group(
+            SapModel, f"{ETABS_group_prefix}all_columns", frames
+        ) as group_name:
+            P_max_df = extract_max_axial(
+                SapModel, frames, load_cases, group_name, backend=force_backend
+            )
+        if P_max_df is False:
+            raise ValueError(f"ETABS returned no results for load cases: {load_cases}")
+    finally:
+        exit_ETABS(ETABSObject)
+    return model_forces_table(model_path, cols_df, P_max_df, load_cases)
+
+
+def fake_extract_model_forces(
+    model_path,
+    load_cases: list,
+    force_backend="FrameForce",
+    config_path="config.json",
+    latency=0.0,
+    levels=3,
+    columns_per_level=4,
+):
+    """
+    Stands in for extract_model_forces without ETABS. The synthetic model is
+    seeded by model_path, so a path always gives the same forces. latency
+    (seconds) simulates ETABS start-up and analysis.
+    """
+    time.sleep(latency)
+    seed = int(
+        hashlib.blake2b(str(model_path).encode("utf-8"), digest_size=4).hexdigest(), 16
+    )
+    rng = np.random.default_rng(seed)
+    n = levels * columns_per_level
+    cols_df = pd.DataFrame(
+        {
+            "MyNames": np.arange(1, n + 1),
+            "StoryName": np.repeat(
+                [f"Level_{i + 2}" for i in range(levels)], columns_per_level
+            ),
+            "Point1X": np.tile(np.arange(columns_per_level) * 360.0, levels),
+            "Point1Y": np.zeros(n),
+        }
+    )
+    P_max_df = pd.DataFrame({lc: rng.uniform(1e4, 5e5, n) for lc in load_cases})
+    return model_forces_table(model_path, cols_df, P_max_df, load_cases)
+
+
+pool_backends = {"ETABS": extract_model_forces, "fake": fake_extract_model_forces}
+
+
+def run_model_study(
+    model_paths: list,
+    load_cases: list,
+    workers=default_pool_workers,
+    backend="ETABS",
+    log=print,
+    **task_kwargs,
+):
+    """
+    Extracts the column forces of every model in model_paths with up to workers
+    ETABS processes at once. task_kwargs are passed to the backend's task.
+
+    Returns (table, failures): the models' tables stacked in model_paths order
+    and {model path: error} for the models that failed.
+    """
+    if backend not in pool_backends:
+        raise ValueError(
+            f"Unknown backend {backend}; expected one of {list(pool_backends)}"
+        )
+    task = pool_backends[backend]
+    tables = {}
+    failures = {}
+    workers = max(1, min(workers, len(model_paths)))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(task, model_path, list(load_cases), **task_kwargs): model_path
+            for model_path in model_paths
+        }
+        for future in as_completed(futures):
+            model_path = futures[future]
+            try:
+                tables[model_path] = future.result()
+                log(f"Extracted {len(tables[model_path])} columns from {model_path}")
+            except Exception as e:
+                failures[model_path] = f"{type(e).__name__}: {e}"
+                log(f"Extraction from {model_path} failed: {failures[model_path]}")
+
+    ordered_tables = [tables[path] for path in model_paths if path in tables]
+    if not ordered_tables:
+        return pd.DataFrame(columns=study_columns + list(load_cases)), failures
+    table = pd.concat(ordered_tables, ignore_index=True)
+    table["model"] = pd.Categorical(
+        table["model"], categories=list(dict.fromkeys(map(str, model_paths)))
+    )
+    return table, failures
@@ -0,0 +1,391 @@
+"""
+This module records the ETABS and RAM Concept API traffic of a run and replays
+it without ETABS or RAM Concept, so a slow or failing run can be reproduced
+(and profiled) offline from one file.
+
+record_api_traffic() puts RecordedAPIObject proxies around the ETABSv1 module
+and ram_concept's concept module in the ETABS_api and RAM_api providers. Every
+attribute read, call and assignment made through them is stored with its
+response; .NET arrays are converted to NumPy arrays on the way. API objects
+are not stored but referred to by handles, which are numbered by how they were
+obtained (e.g. SapModel.File of the SapModel returned by cSapModel(...)), so
+the same object reached twice gets the same handle.
+
+replay_api_traffic() installs a recording in the providers instead of the
+APIs. Calls are looked up by their handle and arguments and answered from
+memory, repeated calls in the recorded order. A call whose arguments were not
+recorded (e.g. a model path on another machine) gets the next recorded call of
+the same method, or raises ReplayMismatch with strict=True.
+
+Recordings are saved as .npz files: a JSON index of the traffic plus the
+arrays, compressed and loadable without pickle.
+"""
+
+import hashlib
+import json
+from collections import namedtuple
+from contextlib import contextmanager
+from datetime import datetime
+import numpy as np
+
+from .api_providers import ETABS_api, RAM_api
+from .interop_utils import get_element_type_name, system_array_to_numpy
+from .validation_utils import take_validated_concept
+
+Handle = namedtuple("Handle", "id")
+scalar_types = (str, bytes, int, float, complex, bool, type(None))
+
+
+class ReplayMismatch(LookupError):
+    pass
+
+
+class APIRecording:
+    """
+    The traffic of one or more APIs: responses[key] lists the responses to the
+    access key in the order they were made, calls[handle] the keys of the
+    calls made on handle.
+    """
+
+    def __init__(self, meta=None):
+        self.meta = meta or {"created": datetime.now().isoformat(timespec="seconds")}
+        self.roots = {}  # api name -> handle
+        self.handles = {}  # access key -> handle
+        self.responses = {}  # access key -> [stored response, ...]
+        self.calls = {}  # handle -> [call key, ...]
+        self.callables = set()  # handles of methods, classes and functions
+
+    def handle(self, key):
+        return self.handles.setdefault(key, len(self.handles))
+
+    def root(self, api, module):
+        """
+        Returns module wrapped so that everything reached through it is recorded
+        """
+        self.roots[api] = self.handle(api)
+        return self.wrap(module, self.roots[api])
+
+    def wrap(self, obj, handle):
+        if callable(obj):
+            self.callables.add(handle)
+            return RecordedAPIFunction(obj, handle, self)
+        return RecordedAPIObject(obj, handle, self)
+
+    def store(self, key, value):
+        """
+        Adds value as a response to key and returns it for the caller, with API
+        objects wrapped
+        """
+        stored, live = self.encode(key, value)
+        self.responses.setdefault(key, []).append(stored)
+        return live
+
+    def encode(self, key, value):
+        if isinstance(value, scalar_types):
+            return value, value
+        if isinstance(value, np.generic):
+            return value.item(), value
+        if isinstance(value, np.ndarray):
+            return value.copy(), value
+        if get_element_type_name(value) is not None:
+            values = system_array_to_numpy(value)
+            return values, values.copy()
+        if isinstance(value, (list, tuple)):
+            items = [self.encode(f"{key}[{i}]", item) for i, item in enumerate(value)]
+            return (
+                type(value)(stored for stored, live in items),
+                type(value)(live for stored, live in items),
+            )
+        if isinstance(value, dict):
+            items = {k: self.encode(f"{key}[{k!r}]", v) for k, v in value.items()}
+            return (
+                {k: stored for k, (stored, live) in items.items()},
+                {k: live for k, (stored, live) in items.items()},
+            )
+        handle = self.handle(key)
+        return Handle(handle), self.wrap(value, handle)
+
+    def save(self, path):
+        arrays = {}
+
+        def pack(value):
+            if isinstance(value, Handle):
+                return {"$handle": value.id}
+            if isinstance(value, np.ndarray):
+                name = f"array_{len(arrays)}"
+                is_object = value.dtype == object
+                arrays[name] = value.astype(str) if is_object else value
+                return {"$array": name, "object": is_object}
+            if isinstance(value, tuple):
+                return {"$tuple": [pack(item) for item in value]}
+            if isinstance(value, list):
+                return [pack(item) for item in value]
+            if isinstance(value, dict):
+                return {"$dict": [[k, pack(v)] for k, v in value.items()]}
+            if isinstance(value, bytes):
+                return {"$bytes": value.hex()}
+            if isinstance(value, complex):
+                return {"$complex": [value.real, value.imag]}
+            return value
+
+        index = {
+            "meta": self.meta,
+            "roots": self.roots,
+            "handles": self.handles,
+            "responses": {
+                key: [pack(value) for value in values]
+                for key, values in self.responses.items()
+            },
+            "calls": {str(handle): keys for handle, keys in self.calls.items()},
+            "callables": sorted(self.callables),
+        }
+        np.savez_compressed(path, index=np.array(json.dumps(index)), **arrays)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            index = json.loads(str(data["index"]))
+
+            def unpack(value):
+                if isinstance(value, list):
+                    return [unpack(item) for item in value]
+                if not isinstance(value, dict):
+                    return value
+                if "$handle" in value:
+                    return Handle(value["$handle"])
+                if "$array" in value:
+                    array = data[value["$array"]]
+                    return array.astype(object) if value["object"] else array
+                if "$tuple" in value:
+                    return tuple(unpack(item) for item in value["$tuple"])
+                if "$dict" in value:
+                    return {k: unpack(v) for k, v in value["$dict"]}
+                if "$bytes" in value:
+                    return bytes.fromhex(value["$bytes"])
+                if "$complex" in value:
+                    return complex(*value["$complex"])
+                return value
+
+            recording = cls(index["meta"])
+            recording.roots = index["roots"]
+            recording.handles = index["handles"]
+            recording.responses = {
+                key: [unpack(value) for value in values]
+                for key, values in index["responses"].items()
+            }
+            recording.calls = {
+                int(handle): keys for handle, keys in index["calls"].items()
+            }
+            recording.callables = set(index["callables"])
+        return recording
+
+
+def call_key(handle, args, kwargs):
+    """
+    Returns the access key of a call: the handle and a digest of the arguments,
+    with API objects reduced to their handles
+    """
+    digest = hashlib.blake2b(digest_size=8)
+
+    def feed(value):
+        if isinstance(value, (RecordedAPIObject, ReplayedAPIObject)):
+            digest.update(b"H%d;" % value._handle)
+        elif isinstance(value, np.ndarray):
+            digest.update(f"A{value.dtype.str}{value.shape};".encode())
+            if value.dtype == object:
+                digest.update("\x1f".join(map(str, value.ravel())).encode())
+            else:
+                digest.update(np.ascontiguousarray(value).tobytes())
+        elif isinstance(value, (list, tuple)):
+            digest.update(b"[")
+            for item in value:
+                feed(item)
+            digest.update(b"]")
+        elif isinstance(value, dict):
+            feed(sorted(value.items()))
+        elif isinstance(value, np.generic):
+            feed(value.item())
+        elif get_element_type_name(value) is not None:
+            feed(system_array_to_numpy(value))
+        else:
+            digest.update(f"{type(value).__name__}:{value!r};".encode())
+
+    feed((list(args), kwargs))
+    return f"{handle}({digest.hexdigest()})"
+
+
+def unwrap_recorded(value):
+    if isinstance(value, RecordedAPIObject):
+        return object.__getattribute__(value, "_obj")
+    if isinstance(value, list):
+        return [unwrap_recorded(item) for item in value]
+    return value
+
+
+class RecordedAPIObject:
+    """
+    Forwards attribute access, calls and assignments to an API object and
+    stores their responses in the recording
+    """
+
+    __slots__ = ("_obj", "_handle", "_recording")
+
+    def __init__(self, obj, handle, recording):
+        object.__setattr__(self, "_obj", obj)
+        object.__setattr__(self, "_handle", handle)
+        object.__setattr__(self, "_recording", recording)
+
+    def __getattr__(self, name):
+        return self._recording.store(f"{self._handle}.{name}", getattr(self._obj, name))
+
+    def __setattr__(self, name, value):
+        setattr(self._obj, name, unwrap_recorded(value))
+        self._recording.store(f"{self._handle}.{name}=", value)
+
+    def __repr__(self):
+        return f"Recorded({self._obj!r})"
+
+
+class RecordedAPIFunction(RecordedAPIObject):
+    # a separate class so callable() tells methods and plain objects apart
+    __slots__ = ()
+
+    def __call__(self, *args, **kwargs):
+        key = call_key(self._handle, args, kwargs)
+        self._recording.calls.setdefault(self._handle, []).append(key)
+        response = self._obj(
+            *[unwrap_recorded(arg) for arg in args],
+            **{k: unwrap_recorded(v) for k, v in kwargs.items()},
+        )
+        return self._recording.store(key, response)
+
+
+class APIReplay:
+    """
+    Serves the responses of a recording. served counts how often each access
+    key was answered.
+    """
+
+    def __init__(self, recording: APIRecording, strict=False):
+        self.recording = recording
+        self.strict = strict
+        self.served = {}  # access key -> responses served
+        self.fallbacks = {}  # handle -> calls answered out of argument order
+        self.mismatches = []  # call keys answered by fallback
+
+    def root(self, api):
+        if api not in self.recording.roots:
+            raise ReplayMismatch(f"The recording holds no {api} traffic")
+        return self.proxy(self.recording.roots[api])
+
+    def proxy(self, handle):
+        if handle in self.recording.callables:
+            return ReplayedAPIFunction(handle, self)
+        return ReplayedAPIObject(handle, self)
+
+    def serve(self, key):
+        responses = self.recording.responses[key]
+        count = self.served.get(key, 0)
+        self.served[key] = count + 1
+        # a repeat beyond the recording gets the last response again
+        return self.decode(responses[min(count, len(responses) - 1)])
+
+    def decode(self, value):
+        if isinstance(value, Handle):
+            return self.proxy(value.id)
+        if isinstance(value, np.ndarray):
+            return value.copy()  # callers may modify the arrays they are given
+        if isinstance(value, (list, tuple)):
+            return type(value)(self.decode(item) for item in value)
+        if isinstance(value, dict):
+            return {k: self.decode(v) for k, v in value.items()}
+        return value
+
+    def get(self, handle, name):
+        key = f"{handle}.{name}"
+        if key not in self.recording.responses:
+            raise AttributeError(f"{name} was not recorded on handle {handle}")
+        return self.serve(key)
+
+    def call(self, handle, args, kwargs):
+        key = call_key(handle, args, kwargs)
+        if key in self.recording.responses:
+            return self.serve(key)
+        recorded = self.recording.calls.get(handle)
+        if self.strict or not recorded:
+            raise ReplayMismatch(f"Call {key} was not recorded")
+        count = self.fallbacks.get(handle, 0)
+        self.fallbacks[handle] = count + 1
+        self.mismatches.append(key)
+        return self.serve(recorded[min(count, len(recorded) - 1)])
+
+
+class ReplayedAPIObject:
+    __slots__ = ("_handle", "_replay")
+
+    def __init__(self, handle, replay):
+        object.__setattr__(self, "_handle", handle)
+        object.__setattr__(self, "_replay", replay)
+
+    def __getattr__(self, name):
+        return self._replay.get(self._handle, name)
+
+    def __setattr__(self, name, value):
+        key = f"{self._handle}.{name}="
+        self._replay.served[key] = self._replay.served.get(key, 0) + 1
+
+    def __repr__(self):
+        return f"Replayed(handle {self._handle})"
+
+
+class ReplayedAPIFunction(ReplayedAPIObject):
+    __slots__ = ()
+
+    def __call__(self, *args, **kwargs):
+        return self._replay.call(self._handle, args, kwargs)
+
+
+@contextmanager
+def record_api_traffic(path=None, ETABS=True, RAM=True, meta=None):
+    """
+    Records the traffic of the ETABS_api and/or RAM_api providers and saves it
+    to path (if given) afterwards, also when the run fails
+    """
+    recording = APIRecording()
+    recording.meta.update(meta or {})
+    previous = (ETABS_api.module, RAM_api.module)
+    if ETABS:
+        ETABS_api.module = recording.root("ETABS", ETABS_api.load())
+    if RAM:
+        module = RAM_api.load()
+        # the Concept validation started is not recorded, so start a new one
+        concept = take_validated_concept()
+        if concept is not None:
+            concept.shut_down()
+        RAM_api.module = recording.root("RAM", module)
+    try:
+        yield recording
+    finally:
+        ETABS_api.module, RAM_api.module = previous
+        if path is not None:
+            recording.save(path)
+
+
+@contextmanager
+def replay_api_traffic(recording, strict=False):
+    """
+    Serves the ETABS_api and RAM_api providers from recording (an APIRecording
+    or the path of a saved one) and restores them afterwards
+    """
+    if not isinstance(recording, APIRecording):
+        recording = APIRecording.load(recording)
+    replay = APIReplay(recording, strict)
+    previous = (ETABS_api.module, RAM_api.module)
+    if "ETABS" in recording.roots:
+        ETABS_api.module = replay.root("ETABS")
+    if "RAM" in recording.roots:
+        RAM_api.module = replay.root("RAM")
+    try:
+        yield replay
+    finally:
+        ETABS_api.module, RAM_api.module = previous
@@ -0,0 +1,267 @@
+"""
+This module runs the bridge as a long-running local job server.
+
+BridgeServer listens on the loopback interface only and keeps one ModelSessions
+open across jobs, so ETABS, RAM Concept and every opened model stay warm. Jobs
+(the same dicts as job files, see pipeline_utils) are queued on a single
+BackgroundWorker and run one at a time on its thread, so every API call is
+made from the same thread. A job on the EDB that is already open skips the
+ETABS start-up, the model open and the analysis; its forces already in memory
+are not extracted again.
+
+Every request must carry the server's token in the X-Bridge-Token header. The
+token is generated when the server starts and printed with its URL. POSTs must
+be application/json and requests with an Origin header are refused, so a web
+page in a local browser cannot queue jobs or stop the server.
+
+HTTP API (JSON bodies):
+    POST /jobs          queue a job, returns {"id": ..., "queued": ...}
+    GET  /jobs/<id>     status ("queued", "running", "done", "failed") and
+                        the job summary once done
+    GET  /status        open models and queue length
+    POST /shutdown      close ETABS and RAM Concept and stop the server
+
+submit_job and wait_for_job are the client side.
+"""
+
+import hmac
+import itertools
+import json
+import secrets
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import requests
+
+from .pipeline_utils import ModelSessions, run_job
+from .worker_utils import BackgroundWorker
+
+default_server_port = 8765
+default_server_url = f"http://127.0.0.1:{default_server_port}"
+token_header = "X-Bridge-Token"
+token_env_var = "ETABS_RAM_BRIDGE_TOKEN"  # default token of the CLI client
+
+
+class BridgeRequestHandler(BaseHTTPRequestHandler):
+    def send_json(self, status, body):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def check_request(self, post=False) -> bool:
+        """
+        Answers and returns False for requests from browsers, without the
+        token or, for POSTs, not sent as JSON
+        """
+        if self.headers.get("Origin") is not None:
+            self.send_json(403, {"error": "Cross-origin requests are not accepted"})
+            return False
+        token = self.headers.get(token_header, "")
+        if not hmac.compare_digest(token.encode(), self.server.bridge.token.encode()):
+            self.send_json(401, {"error": f"Missing or wrong {token_header}"})
+            return False
+        if post and self.headers.get_content_type() != "application/json":
+            self.send_json(415, {"error": "Content-Type must be application/json"})
+            return False
+        return True
+
+    def do_GET(self):
+        bridge = self.server.bridge
+        if not self.check_request():
+            return
+        if self.path == "/status":
+            self.send_json(200, bridge.status())
+        elif self.path.startswith("/jobs/"):
+            record = bridge.job_record(self.path[len("/jobs/") :])
+            if record is None:
+                self.send_json(404, {"error": f"Unknown job {self.path}"})
+            else:
+                self.send_json(200, record)
+        else:
+            self.send_json(404, {"error": f"Unknown path {self.path}"})
+
+    def do_POST(self):
+        bridge = self.server.bridge
+        if not self.check_request(post=True):
+            return
+        if self.path == "/jobs":
+            length = int(self.headers.get("Content-Length", 0))
+            try:
+                job = json.loads(self.rfile.read(length))
+                job_id = bridge.submit(job)
+            except (ValueError, KeyError, TypeError) as e:
+                self.send_json(400, {"error": f"Invalid job: {e}"})
+                return
+            self.send_json(202, {"id": job_id, "queued": bridge.queued()})
+        elif self.path == "/shutdown":
+            self.send_json(200, {"stopping": True})
+            # shutdown() waits for serve_forever, so it can't run on this thread
+            threading.Thread(target=bridge.shutdown, daemon=True).start()
+        else:
+            self.send_json(404, {"error": f"Unknown path {self.path}"})
+
+    def log_message(self, format, *args):
+        pass  # clients poll /jobs/<id>, so per-request lines would flood the log
+
+
+class BridgeServer:
+    def __init__(self, port=default_server_port, log=print, sessions=None, token=None):
+        self.log = log
+        self.token = token or secrets.token_urlsafe(32)
+        self.sessions = sessions  # created with the first job
+        self.jobs = {}  # job id -> record
+        self.job_ids = itertools.count(1)
+        self.lock = threading.Lock()
+        self.stopping = False
+        self.worker = BackgroundWorker(name="bridge")
+        self.events_thread = threading.Thread(
+            target=self.handle_worker_events, name="bridge events", daemon=True
+        )
+        self.events_thread.start()
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", port), BridgeRequestHandler)
+        self.httpd.bridge = self
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def submit(self, job: dict) -> str:
+        """
+        Queues job and returns its id
+        """
+        if "ETABS_model" not in job:
+            raise KeyError("ETABS_model")
+        with self.lock:
+            job_id = str(next(self.job_ids))
+            self.jobs[job_id] = {
+                "id": job_id,
+                "status": "queued",
+                "ETABS_model": job["ETABS_model"],
+                "submitted": time.time(),
+            }
+        self.worker.submit(
+            self.run_job_on_worker,
+            job_id,
+            job,
+            on_done=job_id,
+            on_error=job_id,
+        )
+        self.log(f"Queued job {job_id} for {job['ETABS_model']}")
+        return job_id
+
+    def run_job_on_worker(self, reporter, job_id, job):
+        self.update_job(job_id, status="running")
+        if self.sessions is None:
+            self.sessions = ModelSessions(
+                job["ETABS_model"],
+                force_backend=job.get("ETABS_force_backend", "FrameForce"),
+                log=self.log,
+            )
+        return run_job(job, log=self.log, sessions=self.sessions, close=False)
+
+    def handle_worker_events(self):
+        # the worker's callbacks are the job ids; results are stored, not called
+        while True:
+            event = self.worker.events.get()
+            if event[0] in ("done", "error", "cancelled") and event[1] is None:
+                continue  # server housekeeping, not a job
+            if event[0] == "done":
+                _, job_id, summary = event
+                self.update_job(job_id, status="done", summary=summary)
+                self.log(f"Job {job_id} done")
+            elif event[0] in ("error", "cancelled"):
+                job_id, error = event[1], event[2]
+                self.update_job(
+                    job_id, status="failed", error=f"{type(error).__name__}: {error}"
+                )
+                self.log(f"Job {job_id} failed: {error}")
+            elif event[0] == "log":
+                self.log(event[1])
+
+    def update_job(self, job_id, **fields):
+        with self.lock:
+            self.jobs[job_id].update(fields)
+
+    def job_record(self, job_id):
+        with self.lock:
+            record = self.jobs.get(job_id)
+            return dict(record) if record is not None else None
+
+    def queued(self):
+        with self.lock:
+            return sum(record["status"] == "queued" for record in self.jobs.values())
+
+    def status(self):
+        sessions = self.sessions
+        return {
+            "ETABS_model": (
+                sessions.opened_ETABS_model[0]
+                if sessions is not None and sessions.opened_ETABS_model
+                else None
+            ),
+            "RAM_models": list(sessions.RAM_models) if sessions is not None else [],
+            "queued": self.queued(),
+        }
+
+    def serve_forever(self):
+        self.log(f"Bridge server listening on {self.url}")
+        self.log(f"Bridge server token: {self.token}")
+        self.httpd.serve_forever()
+
+    def shutdown(self):
+        """
+        Stops accepting requests, lets the running job finish and closes ETABS
+        and RAM Concept. Only the first call does anything.
+        """
+        with self.lock:
+            if self.stopping:
+                return
+            self.stopping = True
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        closed = threading.Event()
+
+        def close_sessions(reporter):
+            # on the worker, like every other API call
+            try:
+                if self.sessions is not None:
+                    self.sessions.close()
+            finally:
+                closed.set()
+
+        self.worker.submit(close_sessions)
+        self.worker.stop()
+        closed.wait()
+        self.log("Bridge server stopped")
+
+
+def submit_job(job: dict, url=default_server_url, token=None, timeout=10) -> str:
+    """
+    Queues job on the bridge server at url and returns its id
+    """
+    response = requests.post(
+        f"{url}/jobs", json=job, headers={token_header: token or ""}, timeout=timeout
+    )
+    response.raise_for_status()
+    return response.json()["id"]
+
+
+def wait_for_job(
+    job_id, url=default_server_url, token=None, poll_interval=1.0, timeout=10
+):
+    """
+    Polls the bridge server until the job has finished and returns its record
+    """
+    while True:
+        response = requests.get(
+            f"{url}/jobs/{job_id}", headers={token_header: token or ""}, timeout=timeout
+        )
+        response.raise_for_status()
+        record = response.json()
+        if record["status"] in ("done", "failed"):
+            return record
+        time.sleep(poll_interval)
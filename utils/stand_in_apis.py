@@ -0,0 +1,704 @@
+"""
+This module contains stand-ins for the ETABSv1 and ram_concept APIs so the
+pipeline can run (and be timed) on machines without ETABS or RAM Concept.
+
+StandInETABSv1 answers the ETABSv1 calls the bridge makes with a synthetic
+model: a jittered grid of columns per level plus beams, the requested number
+of linear static load cases and deterministic forces at three stations per
+frame. Every model opened is seeded by its path. StandInRamConcept keeps
+loading layers and point loads in memory. Both sleep `latency` seconds per API
+call to mimic COM round trips and count their calls.
+
+use_stand_in_apis() installs them in the ETABS_api and RAM_api providers, e.g.
+
+    with use_stand_in_apis(StandInETABSv1(frames=10000, cases=5), StandInRamConcept()):
+        SapModel, ETABSObject = initalize_SapModel()
+"""
+
+import hashlib
+import time
+from contextlib import contextmanager
+import numpy as np
+
+from .api_providers import ETABS_api, RAM_api
+
+column_spacing = 360.0  # in
+story_height = 144.0  # in
+stations_per_frame = 3
+
+
+class StandInAPI:
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.calls = 0
+
+    def call(self):
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+
+def path_seed(path) -> int:
+    return int(
+        hashlib.blake2b(str(path).encode("utf-8"), digest_size=4).hexdigest(), 16
+    )
+
+
+class SyntheticETABSModel:
+    """
+    Frame geometry and forces of a synthetic building. About 40% of the frames
+    are columns, spread over `levels` stories; the rest are beams. Each story
+    also has `piers` wall piers; every second one is an L-shaped core of two
+    legs, each leg one wall area object per story.
+    """
+
+    def __init__(self, frames=1000, cases=3, levels=10, piers=0, seed=0):
+        rng = np.random.default_rng(seed)
+        levels = max(1, min(levels, frames))
+        columns_per_level = max(1, int(0.4 * frames) // levels)
+        grid_size = int(np.ceil(np.sqrt(columns_per_level)))
+        grid = np.arange(columns_per_level)
+        # irregular column layout so calibration has a unique answer
+        plan_x = (grid % grid_size) * column_spacing + rng.uniform(
+            -60, 60, columns_per_level
+        )
+        plan_y = (grid // grid_size) * column_spacing + rng.uniform(
+            -60, 60, columns_per_level
+        )
+        n_columns = columns_per_level * levels
+        n_beams = max(0, frames - n_columns)
+        level = np.repeat(np.arange(levels), columns_per_level)
+        beam_level = np.arange(n_beams) % levels
+        beam_start = np.arange(n_beams) % columns_per_level
+
+        self.names = np.arange(1, n_columns + n_beams + 1).astype(str).astype(object)
+        self.stories = np.array([f"Level_{i + 1}" for i in range(levels)], dtype=object)
+        self.story = np.concatenate([level, beam_level])
+        self.is_column = np.arange(len(self.names)) < n_columns
+        self.point1 = np.column_stack(
+            [
+                np.concatenate([np.tile(plan_x, levels), plan_x[beam_start]]),
+                np.concatenate([np.tile(plan_y, levels), plan_y[beam_start]]),
+                np.concatenate([level, beam_level + 1]) * story_height,
+            ]
+        )
+        self.point2 = self.point1.copy()
+        self.point2[:n_columns, 2] += story_height
+        self.point2[n_columns:, 0] += column_spacing
+        self.plan_points = np.column_stack([plan_x, plan_y])
+
+        self.load_cases = ["Dead", "Live", "S Dead", "Wind", "Seismic"][:cases] + [
+            f"Case_{i + 1}" for i in range(max(0, cases - 5))
+        ]
+        # columns carry the floors above them, beams a small share
+        floors_above = np.where(self.is_column, levels - self.story, 0.1)
+        self.base_load = floors_above * rng.uniform(2e4, 6e4, len(self.names))
+        self.case_factors = rng.uniform(0.2, 1.0, len(self.load_cases))
+        self.analyzed = True
+
+        # walls from halfway between columns along x; odd piers add a leg
+        # along y from the same corner, making an L
+        wall = np.tile(np.arange(piers), levels)
+        self.pier_story = np.repeat(np.arange(levels), piers)
+        self.pier_names = np.array([f"P{i + 1}" for i in range(piers)], dtype=object)
+        self.leg_pier = np.repeat(np.arange(piers), np.arange(piers) % 2 + 1)
+        corner = self.plan_points[self.leg_pier % columns_per_level] + [
+            column_spacing / 2,
+            column_spacing / 4,
+        ]
+        is_second_leg = np.r_[False, self.leg_pier[1:] == self.leg_pier[:-1]]
+        leg_length = rng.uniform(120, 240, len(self.leg_pier))
+        self.leg_start = corner
+        self.leg_end = corner + leg_length[:, None] * np.where(
+            is_second_leg[:, None], [0.0, 1.0], [1.0, 0.0]
+        )
+        self.pier_base_load = (levels - self.pier_story) * rng.uniform(1e5, 3e5, piers)[
+            wall
+        ]
+
+    def frame_index(self, name):
+        index = int(name) - 1
+        if not 0 <= index < len(self.names):
+            raise KeyError(name)
+        return index
+
+    def frame_forces(self, frames, load_cases):
+        """
+        Returns the flat FrameForce result arrays for frame indices x load_cases
+        x stations
+        """
+        frames = np.asarray(frames, dtype=np.int64)
+        case_ids = np.array([self.load_cases.index(lc) for lc in load_cases], int)
+        n = len(frames) * len(case_ids) * stations_per_frame
+        frame = np.repeat(frames, len(case_ids) * stations_per_frame)
+        case = np.tile(np.repeat(case_ids, stations_per_frame), len(frames))
+        station = np.tile(np.arange(stations_per_frame), len(frames) * len(case_ids))
+        length = np.linalg.norm(self.point2[frame] - self.point1[frame], axis=1)
+        sta = station / (stations_per_frame - 1) * length
+        P = -self.base_load[frame] * self.case_factors[case] * (1 + 0.01 * station)
+        V = 0.02 * P
+        return {
+            "Obj": self.names[frame],
+            "ObjSta": sta,
+            "Elm": self.names[frame],
+            "ElmSta": sta,
+            "LoadCase": np.array(self.load_cases, dtype=object)[case],
+            "StepType": np.full(n, "", dtype=object),
+            "StepNum": np.zeros(n),
+            "P": P,
+            "V2": V,
+            "V3": -V,
+            "T": 0.001 * P,
+            "M2": V * (sta - length / 2),
+            "M3": -V * (sta - length / 2),
+        }
+
+    def pier_forces(self, load_cases):
+        """
+        Returns the flat PierForce result arrays for every story x pier x
+        load_cases x (Top, Bottom)
+        """
+        case_ids = np.array([self.load_cases.index(lc) for lc in load_cases], int)
+        n_piers = len(self.pier_story)
+        pier = np.repeat(np.arange(n_piers), len(case_ids) * 2)
+        case = np.tile(np.repeat(case_ids, 2), n_piers)
+        bottom = np.tile([0, 1], n_piers * len(case_ids))
+        wall = pier % max(1, len(self.pier_names))
+        P = -self.pier_base_load[pier] * self.case_factors[case] * (1 + 0.02 * bottom)
+        V = 0.01 * P
+        return {
+            "StoryName": self.stories[self.pier_story[pier]],
+            "PierName": self.pier_names[wall],
+            "LoadCase": np.array(self.load_cases, dtype=object)[case],
+            "Location": np.array(["Top", "Bottom"], dtype=object)[bottom],
+            "P": P,
+            "V2": V,
+            "V3": -V,
+            "T": 0.001 * P,
+            "M2": V * story_height * bottom,
+            "M3": -V * story_height * bottom,
+        }
+
+    def wall_areas(self):
+        """
+        Returns (story, leg) of every wall area object, story by story; area k
+        is named W<k + 1>
+        """
+        n_legs = len(self.leg_pier)
+        return np.repeat(np.arange(len(self.stories)), n_legs), np.tile(
+            np.arange(n_legs), len(self.stories)
+        )
+
+    def pier_labels(self):
+        """
+        Returns the "Area Assignments - Pier Labels" table columns
+        """
+        story, leg = self.wall_areas()
+        names = np.array([f"W{k + 1}" for k in range(len(leg))], dtype=object)
+        return {
+            "Story": self.stories[story],
+            "Label": names,
+            "UniqueName": names,
+            "PierName": self.pier_names[self.leg_pier[leg]],
+        }
+
+    def area_boundaries(self):
+        """
+        Returns the flat GetAllAreas results: 4 boundary points per wall area,
+        bottom edge first
+        """
+        story, leg = self.wall_areas()
+        n = len(leg)
+        corner = np.tile([0, 1, 1, 0], n)
+        level = np.repeat(story, 4) + np.tile([0, 0, 1, 1], n)
+        xy = np.where(
+            corner[:, None] == 0,
+            self.leg_start[np.repeat(leg, 4)],
+            self.leg_end[np.repeat(leg, 4)],
+        )
+        return {
+            "MyName": np.array([f"W{k + 1}" for k in range(n)], dtype=object),
+            "DesignOrientation": np.ones(n, dtype=np.int64),  # wall
+            "NumberBoundaryPts": 4 * n,
+            "PointDelimiter": 4 * np.arange(1, n + 1) - 1,
+            "PointNames": np.array([f"{i + 1}" for i in range(4 * n)], dtype=object),
+            "PointX": xy[:, 0],
+            "PointY": xy[:, 1],
+            "PointZ": level * story_height,
+        }
+
+
+class StandInSapModel:
+    def __init__(self, api):
+        self.api = api
+        self.model = None
+        self.groups = {}  # group name -> set of frame indices
+        self.selected_cases = []
+        self.table_cases = []
+        self.File = StandInFile(self)
+        self.FrameObj = StandInFrameObj(self)
+        self.AreaObj = StandInAreaObj(self)
+        self.LoadCases = StandInLoadCases(self)
+        self.Analyze = StandInAnalyze(self)
+        self.GroupDef = StandInGroup(self)
+        self.Results = StandInResults(self)
+        self.DatabaseTables = StandInDatabaseTables(self)
+
+    def SetPresentUnits(self, units):
+        self.api.call()
+        return 0
+
+
+class StandInInterface:
+    def __init__(self, sap_model):
+        self.sap_model = sap_model
+
+    @property
+    def model(self):
+        return self.sap_model.model
+
+    def call(self):
+        self.sap_model.api.call()
+
+
+class StandInFile(StandInInterface):
+    def OpenFile(self, path):
+        self.call()
+        spec = self.sap_model.api.spec
+        self.sap_model.model = SyntheticETABSModel(seed=path_seed(path), **spec)
+        self.model.analyzed = self.sap_model.api.analyzed
+        self.sap_model.groups = {}
+        return 0
+
+
+class StandInFrameObj(StandInInterface):
+    def GetAllFrames(self, NumberNames, *args):
+        self.call()
+        model = self.model
+        n = len(model.names)
+        zeros = np.zeros(n)
+        return [
+            0,
+            n,
+            model.names,
+            np.full(n, "C24X24", dtype=object),
+            model.stories[model.story],
+            model.names,  # point names are not used by the bridge
+            model.names,
+            model.point1[:, 0],
+            model.point1[:, 1],
+            model.point1[:, 2],
+            model.point2[:, 0],
+            model.point2[:, 1],
+            model.point2[:, 2],
+            zeros,
+            zeros,
+            zeros,
+            zeros,
+            zeros,
+            zeros,
+            zeros,
+            np.full(n, 10, dtype=np.int32),
+        ]
+
+    def SetGroupAssign(self, name, group_name, remove, item_type):
+        self.call()
+        if group_name not in self.sap_model.groups:
+            return 1
+        try:
+            self.sap_model.groups[group_name].add(self.model.frame_index(name))
+        except KeyError:
+            return 1
+        return 0
+
+
+class StandInAreaObj(StandInInterface):
+    def GetAllAreas(self, NumberNames, *args):
+        self.call()
+        areas = self.model.area_boundaries()
+        return [0, len(areas["MyName"]), *areas.values()]
+
+
+class StandInLoadCases(StandInInterface):
+    def GetNameList(self, NumberNames, MyName, load_case_type):
+        self.call()
+        linear_static = 1
+        names = self.model.load_cases if load_case_type == linear_static else []
+        return [0, len(names), np.array(names, dtype=object)]
+
+
+class StandInAnalyze(StandInInterface):
+    def GetCaseStatus(self, NumberItems, CaseName, Status):
+        self.call()
+        not_run, could_not_start, finished = 1, 2, 4
+        status = finished if self.model.analyzed else not_run
+        cases = self.model.load_cases
+        unfinished = self.sap_model.api.unfinished_cases
+        statuses = [could_not_start if lc in unfinished else status for lc in cases]
+        return [0, len(cases), np.array(cases, dtype=object), statuses]
+
+    def GetRunCaseFlag(self, NumberItems, CaseName, Run):
+        self.call()
+        cases = self.model.load_cases
+        return [0, len(cases), np.array(cases, dtype=object), [True] * len(cases)]
+
+    def RunAnalysis(self):
+        self.call()
+        time.sleep(self.sap_model.api.analysis_time)
+        self.model.analyzed = True
+        return 0
+
+
+class StandInGroup(StandInInterface):
+    def SetGroup(self, group_name, *args):
+        self.call()
+        self.sap_model.groups.setdefault(group_name, set())
+        return 0
+
+    def Clear(self, group_name):
+        self.call()
+        self.sap_model.groups[group_name] = set()
+        return 0
+
+    def Delete(self, group_name):
+        self.call()
+        return 0 if self.sap_model.groups.pop(group_name, None) is not None else 1
+
+
+class StandInResultsSetup(StandInInterface):
+    def DeselectAllCasesAndCombosForOutput(self):
+        self.call()
+        self.sap_model.selected_cases = []
+        return 0
+
+    def SetCaseSelectedForOutput(self, load_case, selected=True):
+        self.call()
+        if load_case not in self.model.load_cases:
+            return 1
+        self.sap_model.selected_cases.append(load_case)
+        return 0
+
+
+class StandInResults(StandInInterface):
+    def __init__(self, sap_model):
+        super().__init__(sap_model)
+        self.Setup = StandInResultsSetup(sap_model)
+
+    def FrameForce(self, name, item_type_elm, NumberResults, *args):
+        self.call()
+        object_elm, group_elm = 0, 2
+        if not self.model.analyzed or not self.sap_model.selected_cases:
+            return [1, 0, *args]
+        if item_type_elm == group_elm:
+            if name not in self.sap_model.groups:
+                return [1, 0, *args]
+            frames = sorted(self.sap_model.groups[name])
+        elif item_type_elm == object_elm:
+            try:
+                frames = [self.model.frame_index(name)]
+            except KeyError:
+                return [1, 0, *args]
+        else:
+            raise NotImplementedError(f"eItemTypeElm {item_type_elm}")
+        forces = self.model.frame_forces(frames, self.sap_model.selected_cases)
+        return [0, len(forces["P"]), *forces.values()]
+
+    def PierForce(self, NumberResults, *args):
+        self.call()
+        if not self.model.analyzed or not self.sap_model.selected_cases:
+            return [1, 0, *args]
+        forces = self.model.pier_forces(self.sap_model.selected_cases)
+        return [0, len(forces["P"]), *forces.values()]
+
+
+class StandInDatabaseTables(StandInInterface):
+    fields = [
+        "Story",
+        "Column",
+        "UniqueName",
+        "OutputCase",
+        "CaseType",
+        "StepType",
+        "Station",
+        "P",
+        "V2",
+        "V3",
+        "T",
+        "M2",
+        "M3",
+    ]
+
+    def SetLoadCombinationsSelectedForDisplay(self, names):
+        self.call()
+        return [0, names]
+
+    def SetLoadCasesSelectedForDisplay(self, names):
+        self.call()
+        self.sap_model.table_cases = list(names)
+        return [0, names]
+
+    def GetTableForDisplayArray(
+        self,
+        table_key,
+        FieldKeyList,
+        group_name,
+        TableVersion,
+        FieldsKeysIncluded,
+        NumberRecords,
+        TableData,
+    ):
+        self.call()
+        model = self.model
+        if table_key == "Area Assignments - Pier Labels":
+            labels = model.pier_labels()
+            n = len(labels["Story"])
+            if n == 0:
+                return [1, FieldKeyList, 0, FieldsKeysIncluded, 0, TableData]
+            table = np.column_stack(
+                [np.asarray(c).astype(str) for c in labels.values()]
+            )
+            return [0, FieldKeyList, 1, list(labels), n, table.ravel()]
+        cases = [lc for lc in self.sap_model.table_cases if lc in model.load_cases]
+        if table_key != "Element Forces - Columns" or not model.analyzed or not cases:
+            return [1, FieldKeyList, 0, FieldsKeysIncluded, 0, TableData]
+        if group_name:
+            frames = sorted(self.sap_model.groups.get(group_name, ()))
+        else:
+            frames = np.flatnonzero(model.is_column)
+        forces = model.frame_forces(frames, cases)
+        frame = np.repeat(frames, len(cases) * stations_per_frame).astype(int)
+        columns = [
+            model.stories[model.story[frame]],
+            forces["Obj"],
+            forces["Obj"],
+            forces["LoadCase"],
+            np.full(len(frame), "LinStatic", dtype=object),
+            forces["StepType"],
+            *[forces[field] for field in ["ObjSta", "P", "V2", "V3", "T", "M2", "M3"]],
+        ]
+        table = np.column_stack([np.asarray(c).astype(str) for c in columns])
+        return [0, FieldKeyList, 1, self.fields, len(frame), table.ravel()]
+
+
+class StandInETABSObject:
+    def __init__(self, api):
+        self.api = api
+        self.SapModel = None
+
+    def ApplicationStart(self, *args):
+        self.api.call()
+        time.sleep(self.api.start_time)
+        self.SapModel = StandInSapModel(self.api)
+        return 0
+
+    def ApplicationExit(self, save):
+        self.api.call()
+        return 0
+
+
+class StandInHelper:
+    def __init__(self, api):
+        self.api = api
+
+    def CreateObject(self, exe_path):
+        self.api.call()
+        return StandInETABSObject(self.api)
+
+
+class StandInETABSv1(StandInAPI):
+    """
+    Module-like stand-in for ETABSv1. The cInterface casts and eEnum
+    constructors pass their argument through. Cases in unfinished_cases
+    report "could not start", even after an analysis.
+    """
+
+    def __init__(
+        self,
+        frames=1000,
+        cases=3,
+        levels=10,
+        piers=0,
+        latency=0.0,
+        start_time=0.0,
+        analysis_time=0.0,
+        analyzed=True,
+        unfinished_cases=(),
+    ):
+        super().__init__(latency)
+        self.spec = {"frames": frames, "cases": cases, "levels": levels, "piers": piers}
+        self.start_time = start_time
+        self.analysis_time = analysis_time
+        self.analyzed = analyzed
+        self.unfinished_cases = list(unfinished_cases)
+
+    def Helper(self):
+        return StandInHelper(self)
+
+    def __getattr__(self, name):
+        if name[:1] in ("c", "e") and name[1:2].isupper():
+            return lambda value: value
+        raise AttributeError(name)
+
+
+class StandInPoint:
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+
+class StandInPointLoad:
+    def __init__(self, layer, x, y, Fz):
+        self.layer = layer
+        self._location = StandInPoint(x, y)
+        self._Fz = Fz
+
+    @property
+    def location(self):
+        self.layer.api.call()
+        return self._location
+
+    @property
+    def Fz(self):
+        self.layer.api.call()
+        return self._Fz
+
+    @Fz.setter
+    def Fz(self, value):
+        self.layer.api.call()
+        self._Fz = value
+
+    def delete(self):
+        self.layer.api.call()
+        self.layer.loads.remove(self)
+
+
+class StandInLoadingLayer:
+    def __init__(self, api, name):
+        self.api = api
+        self.name = name
+        self.loads = []
+
+    @property
+    def point_loads(self):
+        self.api.call()
+        return list(self.loads)
+
+    def add_point_loads(self, x, y, Fz):
+        self.api.call()
+        self.loads.extend(
+            StandInPointLoad(self, float(xi), float(yi), float(Fi))
+            for xi, yi, Fi in zip(x, y, Fz)
+        )
+
+
+class StandInColumn:
+    def __init__(self, x, y):
+        self.location = StandInPoint(x, y)
+
+
+class StandInStructureLayer:
+    def __init__(self, points):
+        self.columns = [StandInColumn(x, y) for x, y in points]
+        self.point_supports = []
+
+
+class StandInCadManager:
+    def __init__(self, api):
+        self.api = api
+        self.layers = {
+            name: StandInLoadingLayer(api, name)
+            for name in ["Self-Dead Loading", "Other Dead Loading", "Live Loading"]
+        }
+        self.structure_layer = StandInStructureLayer(api.structure_points)
+
+    @property
+    def force_loading_layers(self):
+        self.api.call()
+        return list(self.layers.values())
+
+    def force_loading_layer(self, name):
+        self.api.call()
+        return self.layers.get(name)
+
+    def add_force_loading_layer(self, name):
+        self.api.call()
+        return self.layers.setdefault(name, StandInLoadingLayer(self.api, name))
+
+
+class StandInUnits:
+    def __init__(self, api):
+        self.api = api
+
+    def set_US_API_units(self):
+        self.api.call()
+
+
+class StandInRamModel:
+    def __init__(self, api):
+        self.api = api
+        self.cad_manager = StandInCadManager(api)
+        self.units = StandInUnits(api)
+        self.saved_paths = []
+
+    def save_file(self, path):
+        self.api.call()
+        time.sleep(self.api.save_time)
+        self.saved_paths.append(path)
+
+
+class StandInConcept:
+    def __init__(self, api):
+        self.api = api
+        self.models = {}
+
+    def open_file(self, path):
+        self.api.call()
+        self.models[path] = StandInRamModel(self.api)
+        return self.models[path]
+
+    def ping(self):
+        return "PONG"
+
+    def shut_down(self):
+        self.api.call()
+
+
+class StandInConceptFactory:
+    def __init__(self, api):
+        self.api = api
+
+    def start_concept(self, headless=True):
+        self.api.call()
+        time.sleep(self.api.start_time)
+        return StandInConcept(self.api)
+
+
+class StandInRamConcept(StandInAPI):
+    """
+    Module-like stand-in for ram_concept.concept. structure_points (N x 2) are
+    the columns on the structure layer of every model opened.
+    """
+
+    def __init__(self, latency=0.0, start_time=0.0, save_time=0.0, structure_points=()):
+        super().__init__(latency)
+        self.start_time = start_time
+        self.save_time = save_time
+        self.structure_points = np.asarray(structure_points, float).reshape(-1, 2)
+        self.Concept = StandInConceptFactory(self)
+
+
+@contextmanager
+def use_stand_in_apis(ETABS=None, RAM=None):
+    """
+    Serves the ETABS_api and RAM_api providers from the given stand-ins (None
+    leaves a provider as it is) and restores them afterwards
+    """
+    previous = (ETABS_api.module, RAM_api.module)
+    if ETABS is not None:
+        ETABS_api.module = ETABS
+    if RAM is not None:
+        RAM_api.module = RAM
+    try:
+        yield ETABS, RAM
+    finally:
+        ETABS_api.module, RAM_api.module = previous
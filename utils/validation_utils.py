@@ -2,14 +2,14 @@
 This module performs functions that perform validation on user provided paths to .dll files (ETABS)
 and well as python dirctory of RAM Cconcept. 
 
-These validation functions are used inside the ETABS_utils and RAM_utils modules before importing 
-ETABS and RAM specfiic modules. 
+These validation functions are used by the providers in api_providers the first time the ETABS
+or RAM specfiic modules are needed. The quick check_* functions only look at the paths and are
+cheap enough to run on the GUI thread.
 
 If paths are missing or not validated a window will appear prompting the user to provide paths.
 
 """
 
-import clr
 import json
 from pathlib import Path
 from tkinter import (
@@ -24,7 +24,6 @@ from tkinter import (
 )
 from tkinter import ttk
 import os
-import System
 import sys
 
 
@@ -109,9 +108,22 @@ def ensure_config_exists(path):
         path.touch()
 
 
+def check_ETABS_dll_path(path):
+    """
+    Quick check that path points to a .dll, without loading it
+    """
+    return (
+        path is not None
+        and Path(path).is_file()
+        and Path(path).suffix.lower() == ".dll"
+    )
+
+
 def validate_ETABS_dll_path(path):
     global ETABSv1
     try:
+        import clr
+
         clr.AddReference(path)
         import ETABSv1
 
@@ -129,19 +141,49 @@ def validate_ETABS_exe_path(path):
     return True
 
 
+def check_RAM_path(path):
+    """
+    Quick check that path contains the ram_concept package, without starting
+    RAM Concept
+    """
+    return path is not None and (Path(path) / "ram_concept").is_dir()
+
+
+validated_concept = None  # headless Concept started by validate_RAM_path
+
+
 def validate_RAM_path(path):
+    """
+    Starts and pings a headless RAM Concept. The running instance is kept for
+    take_validated_concept instead of being shut down.
+    """
+    global validated_concept
     try:
-        sys.path.insert(1, path)
+        if path not in sys.path:
+            sys.path.insert(1, path)
         from ram_concept.concept import Concept
 
         concept = Concept.start_concept(headless=True)
         if concept.ping() == "PONG":
-            concept.shut_down()
+            if validated_concept is not None:
+                validated_concept.shut_down()
+            validated_concept = concept
             return True
+        concept.shut_down()
+        return False
     except:
         return False
 
 
+def take_validated_concept():
+    """
+    Returns the Concept started by validate_RAM_path (once) or None
+    """
+    global validated_concept
+    concept, validated_concept = validated_concept, None
+    return concept
+
+
 def get_path_from_config(key, path):
     try:
         with open(path, "r") as f:
@@ -176,17 +218,26 @@ def add_or_replace_json_key(key, value, path):
             return True
 
 
-def validate_and_get_path(validation_func, key, config_path="config.json"):
+def validate_and_get_path(
+    validation_func, key, config_path="config.json", master=None, prompt=True
+):
+    """
+    Returns the path stored under key if it passes validation_func, otherwise
+    prompts the user for one (or returns None if prompt is False). Pass the
+    running app's root as master to prompt in a Toplevel window instead of
+    starting a new Tk.
+    """
     ensure_config_exists(config_path)
     path = get_path_from_config(key, config_path)
     if path is None or not validation_func(path):
+        if not prompt:
+            return None
         # GUI prompts user for path and writes to json
-        root = Tk()
-        PathSelectorGUI(
-            root,
-            validation_func,
-            key,
-        )
-        root.mainloop()
+        root = Tk() if master is None else Toplevel(master)
+        PathSelectorGUI(root, validation_func, key, config_path=config_path)
+        if master is None:
+            root.mainloop()
+        else:
+            master.wait_window(root)
         path = get_path_from_config(key, config_path)
     return path
@@ -0,0 +1,107 @@
+"""
+This module runs long ETABS and RAM Concept pipelines off the tkinter main thread.
+
+A BackgroundWorker runs jobs one at a time on its own thread, so every API call
+of a session is made from the same thread. Jobs report log messages, progress
+(with throughput and ETA) and their result through a queue that the GUI polls
+with root.after. A job is cancelled by raising Cancelled at the next
+ProgressReporter.update call, i.e. between batches of work.
+"""
+
+import queue
+import threading
+import time
+import traceback
+
+
+class Cancelled(Exception):
+    pass
+
+
+class ProgressReporter:
+    def __init__(self, events, cancel_event, name=""):
+        self.events = events
+        self.cancel_event = cancel_event
+        self.name = name  # prefixes progress labels when workers share a queue
+        self.start_time = time.perf_counter()
+
+    def log(self, msg):
+        self.events.put(("log", msg))
+
+    def check_cancelled(self):
+        if self.cancel_event.is_set():
+            raise Cancelled()
+
+    def start(self, label=""):
+        """
+        Restarts the clock used for throughput and ETA
+        """
+        self.start_time = time.perf_counter()
+        self.update(0, 0, label)
+
+    def update(self, done, total, label=""):
+        """
+        Posts a progress event and raises Cancelled if cancel was requested
+        """
+        self.check_cancelled()
+        elapsed = time.perf_counter() - self.start_time
+        rate = done / elapsed if elapsed > 0 else 0.0
+        eta = (total - done) / rate if rate > 0 else None
+        if self.name:
+            label = f"{self.name}: {label}"
+        self.events.put(("progress", done, total, label, rate, eta))
+
+
+class BackgroundWorker:
+    def __init__(self, events=None, name="worker"):
+        self.events = events if events is not None else queue.Queue()
+        self.name = name
+        self.cancel_event = threading.Event()
+        self.jobs = queue.Queue()
+        self.thread = threading.Thread(target=self.run, name=name, daemon=True)
+        self.thread.start()
+
+    def submit(self, func, *args, on_done=None, on_error=None, **kwargs):
+        """
+        Queues func(reporter, *args, **kwargs). on_done(result) or
+        on_error(exception) are posted back to the event queue for the GUI
+        thread to call.
+        """
+        self.jobs.put((func, args, kwargs, on_done, on_error))
+
+    def run(self):
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                break
+            func, args, kwargs, on_done, on_error = job
+            self.cancel_event.clear()
+            reporter = ProgressReporter(self.events, self.cancel_event, self.name)
+            try:
+                result = func(reporter, *args, **kwargs)
+            except Cancelled as e:
+                self.events.put(("cancelled", on_error, e))
+            except Exception as e:
+                self.events.put(("error", on_error, e, traceback.format_exc()))
+            else:
+                self.events.put(("done", on_done, result))
+
+    def cancel(self):
+        """
+        Cancels the running job at its next progress update and drops queued
+        jobs (their on_error still receives Cancelled)
+        """
+        self.cancel_event.set()
+        while True:
+            try:
+                job = self.jobs.get_nowait()
+            except queue.Empty:
+                break
+            if job is None:  # keep a pending stop
+                self.jobs.put(None)
+                break
+            func, args, kwargs, on_done, on_error = job
+            self.events.put(("cancelled", on_error, Cancelled()))
+
+    def stop(self):
+        self.jobs.put(None)